@@ -43,11 +43,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.profil.ProfilRequestMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.PasienMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -76,14 +78,48 @@ WSGI_APPLICATION = 'SPstunting.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Backend SQLite dengan profil produksi (WAL, busy timeout, BEGIN IMMEDIATE).
+# Lihat SPstunting/sqlite3/base.py untuk nilai bawaan PRAGMA.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'SPstunting.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'pragmas': {
+                'busy_timeout': 5000,
+                'journal_mode': 'WAL',
+                'synchronous': 'NORMAL',
+                'mmap_size': 268435456,
+                'cache_size': -65536,
+            },
+        },
     }
 }
 
 
+# Cache (per proses). Dipakai untuk profil pasien yang sedang login (core.middleware);
+# TTL pendek karena invalidasi lewat signal hanya menjangkau proses yang sama.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'spstunting',
+    }
+}
+
+PASIEN_CACHE_TIMEOUT = 60
+
+# Umur fragmen template basis pengetahuan (detik); fragmen lama tidak
+# terpakai lagi begitu versi naik
+FRAGMEN_KB_TIMEOUT = 24 * 60 * 60
+
+
+# Profil request (core.profil): waktu, jumlah SQL dan query berulang per request,
+# ditampilkan di /pakar/diagnostik/. Aktifkan dengan SPSTUNTING_PROFIL=1.
+PROFIL_REQUEST = os.environ.get('SPSTUNTING_PROFIL') == '1'
+PROFIL_KAPASITAS = 500
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
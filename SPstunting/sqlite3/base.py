@@ -0,0 +1,56 @@
+"""
+Backend SQLite untuk profil produksi SP Stunting.
+
+Turunan dari backend sqlite3 bawaan Django dengan dua tambahan:
+- PRAGMA (WAL, busy_timeout, synchronous, mmap_size, cache_size) dipasang
+  setiap kali koneksi baru dibuka.
+- Transaksi dimulai dengan BEGIN IMMEDIATE sehingga kunci tulis diambil di
+  awal transaksi. Dengan BEGIN biasa (DEFERRED), dua transaksi yang sama-sama
+  membaca lalu menulis akan saling menunggu dan salah satunya langsung gagal
+  dengan "database is locked" tanpa menghormati busy_timeout.
+
+Kedua perilaku dapat diatur lewat DATABASES['default']['OPTIONS']:
+    'pragmas': {'journal_mode': 'WAL', ...}
+    'transaction_mode': 'IMMEDIATE' | 'DEFERRED' | 'EXCLUSIVE'
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+# Nilai bawaan profil produksi
+# (busy_timeout dipasang lebih dulu agar PRAGMA berikutnya ikut menunggu kunci)
+DEFAULT_PRAGMAS = {
+    'busy_timeout': 5000,         # ms menunggu kunci sebelum menyerah
+    'journal_mode': 'WAL',        # pembaca tidak memblokir penulis
+    'synchronous': 'NORMAL',      # aman untuk WAL, fsync hanya saat checkpoint
+    'mmap_size': 268435456,       # 256 MB
+    'cache_size': -65536,         # nilai negatif = KiB, jadi 64 MB
+    'temp_store': 'MEMORY',
+}
+
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        # Opsi khusus backend ini tidak boleh diteruskan ke sqlite3.connect()
+        pragmas = dict(DEFAULT_PRAGMAS)
+        pragmas.update(kwargs.pop('pragmas', {}))
+        transaction_mode = kwargs.pop('transaction_mode', 'IMMEDIATE').upper()
+        if transaction_mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"transaction_mode harus salah satu dari {', '.join(TRANSACTION_MODES)}"
+            )
+        self.pragmas = pragmas
+        self.transaction_mode = transaction_mode
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for nama, nilai in self.pragmas.items():
+            conn.execute(f"PRAGMA {nama} = {nilai}")
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f"BEGIN {self.transaction_mode}")
@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.http import HttpResponseForbidden
 from .models import Pasien, Gejala, Kondisi, Aturan, Konsultasi, DetailKonsultasi, PengukuranFisik, Notifikasi
+from .pagination import PaginatorEstimasi
+from .pencarian import filter_pasien
+from .roles import is_pakar
 
 # Custom ModelAdmin classes with role-based access control
 class RestrictedModelAdmin(admin.ModelAdmin):
@@ -11,12 +14,8 @@ class RestrictedModelAdmin(admin.ModelAdmin):
     def has_module_permission(self, request):
         # Allow access only if user is staff and belongs to "Pakar Diagnosa" group
         # Superusers (Admin) are not allowed to access KB models
-        if request.user.is_authenticated and request.user.is_staff:
-            # Check if user is NOT a superuser (admins are superusers)
-            # Only non-superusers who are in Pakar Diagnosa group can access
-            if not request.user.is_superuser and request.user.groups.filter(name='Pakar Diagnosa').exists():
-                return True
-        return False
+        # Group membership is resolved once per request (core.roles), not once per model/permission
+        return is_pakar(request.user)
     
     def has_view_permission(self, request, obj=None):
         return self.has_module_permission(request)
@@ -58,31 +57,59 @@ class PasienAdmin(admin.ModelAdmin):
     search_fields = ('nama', 'namaPengguna', 'namaWali')
     ordering = ('nama',)
 
+    def get_search_results(self, request, queryset, search_term):
+        # Indeks FTS (core/pencarian.py) menggantikan LIKE '%x%' pada ketiga kolom
+        if not search_term.strip():
+            return queryset, False
+        return filter_pasien(queryset, search_term), False
+
+class TabelBesarAdmin(admin.ModelAdmin):
+    """
+    ModelAdmin untuk tabel yang tumbuh sampai jutaan baris
+
+    Jumlah baris tanpa filter diperkirakan (PaginatorEstimasi), COUNT(*) kedua
+    untuk "dari N total" dilewati, dan date_hierarchy tidak dipakai karena
+    mengambil semua tanggal unik dari seluruh tabel; filter tanggal memakai
+    rentang (hari ini, 7 hari, bulan, tahun) pada kolom berindeks. FK ke tabel
+    besar memakai autocomplete_fields, bukan <select> berisi seluruh baris.
+    """
+    paginator = PaginatorEstimasi
+    show_full_result_count = False
+
 @admin.register(Konsultasi)
-class KonsultasiAdmin(admin.ModelAdmin):
+class KonsultasiAdmin(TabelBesarAdmin):
     list_display = ('id', 'pasien', 'tanggalKonsultasi', 'hasilKondisi')
+    list_select_related = ('pasien', 'hasilKondisi')
     list_filter = ('tanggalKonsultasi', 'hasilKondisi')
     search_fields = ('pasien__nama', 'hasilKondisi__namaKondisi')
+    autocomplete_fields = ('pasien',)
+    # '-pk' sebagai pemecah seri sama dengan urutan indeks konsultasi_tgl_idx dibaca mundur
     ordering = ('-tanggalKonsultasi',)
-    date_hierarchy = 'tanggalKonsultasi'
 
 @admin.register(DetailKonsultasi)
-class DetailKonsultasiAdmin(admin.ModelAdmin):
+class DetailKonsultasiAdmin(TabelBesarAdmin):
     list_display = ('konsultasi', 'gejala')
+    # Konsultasi.__str__ memakai nama pasien
+    list_select_related = ('konsultasi__pasien', 'gejala')
     list_filter = ('gejala',)
     search_fields = ('konsultasi__pasien__nama', 'gejala__namaGejala')
+    autocomplete_fields = ('konsultasi',)
 
 @admin.register(PengukuranFisik)
-class PengukuranFisikAdmin(admin.ModelAdmin):
+class PengukuranFisikAdmin(TabelBesarAdmin):
     list_display = ('pasien', 'tanggalUkur', 'beratBadan', 'tinggiBadan', 'skor_Z_BB_U', 'skor_Z_TB_U')
-    list_filter = ('tanggalUkur', 'pasien__jenisKelamin')
+    list_select_related = ('pasien',)
+    list_filter = ('tanggalUkur',)
     search_fields = ('pasien__nama',)
-    ordering = ('-tanggalUkur',)
-    date_hierarchy = 'tanggalUkur'
+    autocomplete_fields = ('pasien',)
+    # Sama persis dengan indeks pengukuran_tgl_id_idx (tanpa sort sementara)
+    ordering = ('-tanggalUkur', 'id')
 
 @admin.register(Notifikasi)
 class NotifikasiAdmin(admin.ModelAdmin):
     list_display = ('pasien', 'judul', 'jadwalNotifikasi', 'sudahTerkirim', 'tipe')
+    list_select_related = ('pasien',)
+    autocomplete_fields = ('pasien',)
     list_filter = ('sudahTerkirim', 'tipe', 'jadwalNotifikasi')
     search_fields = ('pasien__nama', 'judul')
     ordering = ('-jadwalNotifikasi',)
\ No newline at end of file
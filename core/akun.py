@@ -0,0 +1,174 @@
+"""
+Penyediaan grup, izin, dan akun pakar/kader secara massal dan idempoten.
+
+Dipakai oleh `python manage.py create_default_users`. Izin setiap grup
+diambil dengan satu query (bukan Permission.objects.get per izin) lalu
+dipasang dengan satu groups.permissions.set(), yang hanya menulis selisihnya.
+Hash kata sandi (PBKDF2, sengaja lambat) untuk banyak akun dihitung paralel di
+process pool; akun baru dan keanggotaan grupnya ditulis dengan bulk_create.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User, Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Max, Q
+
+from .models import Pasien, Konsultasi, DetailKonsultasi, Gejala, Kondisi, Aturan, PengukuranFisik
+from .roles import GRUP_PAKAR
+
+GRUP_ADMIN = 'Admin System'
+
+# Pakar: lihat/tambah/ubah data pasien (tanpa hapus), kelola penuh basis pengetahuan
+IZIN_PAKAR = {
+    Pasien: ('view', 'add', 'change'),
+    Konsultasi: ('view', 'change', 'add'),
+    DetailKonsultasi: ('view', 'change', 'add'),
+    Gejala: ('view', 'change', 'add', 'delete'),
+    Kondisi: ('view', 'change', 'add', 'delete'),
+    Aturan: ('view', 'change', 'add', 'delete'),
+    PengukuranFisik: ('view', 'change', 'add'),
+}
+
+# Di bawah jumlah ini hash dihitung langsung (biaya membuat pool lebih besar)
+MIN_HASH_PARALEL = 8
+
+
+def izin_model(spesifikasi):
+    """
+    Ambil objek Permission untuk {Model: (aksi, ...)} dengan satu query
+
+    Args:
+        spesifikasi: Dict model -> tuple aksi ('view', 'add', 'change', 'delete')
+
+    Returns:
+        List Permission
+    """
+    content_types = ContentType.objects.get_for_models(*spesifikasi)
+    kondisi = Q()
+    for model, aksi in spesifikasi.items():
+        kondisi |= Q(
+            content_type=content_types[model],
+            codename__in=[f'{a}_{model._meta.model_name}' for a in aksi],
+        )
+    return list(Permission.objects.filter(kondisi))
+
+
+def siapkan_grup():
+    """
+    Buat grup Admin System dan Pakar Diagnosa beserta izinnya
+
+    Returns:
+        Dict nama grup -> (Group, dibuat)
+    """
+    grup = {
+        nama: Group.objects.get_or_create(name=nama)
+        for nama in (GRUP_ADMIN, GRUP_PAKAR)
+    }
+    grup[GRUP_ADMIN][0].permissions.set(Permission.objects.values_list('id', flat=True))
+    grup[GRUP_PAKAR][0].permissions.set(izin_model(IZIN_PAKAR))
+    return grup
+
+
+def _konteks_proses():
+    """
+    Konteks multiprocessing untuk process pool hash
+
+    Bukan fork: hash_kata_sandi juga dipanggil dari thread request (impor pasien
+    pakar) di server multithread, dan proses hasil fork mewarisi lock yang
+    sedang dipegang thread lain (logging, koneksi SQLite) sehingga bisa macet.
+    Proses baru memuat settings lewat initializer django.setup; fungsi yang
+    dikirim ke worker (make_password) tidak boleh berasal dari modul yang
+    mengimpor model, karena modul itu diimpor sebelum setup selesai.
+    """
+    metode = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(metode)
+
+
+def hash_kata_sandi(kata_sandi, proses=None):
+    """
+    Hash banyak kata sandi, paralel di process pool bila jumlahnya cukup besar
+
+    Args:
+        kata_sandi: List kata sandi mentah
+        proses: Jumlah proses (bawaan: jumlah CPU)
+
+    Returns:
+        List hash dengan urutan yang sama
+    """
+    proses = proses or os.cpu_count() or 1
+    if proses == 1 or len(kata_sandi) < MIN_HASH_PARALEL:
+        return [make_password(k) for k in kata_sandi]
+    with ProcessPoolExecutor(
+        max_workers=proses, mp_context=_konteks_proses(), initializer=django.setup
+    ) as pool:
+        return list(pool.map(make_password, kata_sandi, chunksize=max(1, len(kata_sandi) // (proses * 4))))
+
+
+def siapkan_akun_pakar(data_akun, proses=None):
+    """
+    Siapkan objek User (belum disimpan) untuk akun pakar/kader yang belum ada
+
+    Akun yang namanya sudah terdaftar dilewati (kata sandinya tidak diubah),
+    sehingga berkas yang sama aman dijalankan ulang setiap deploy. Hash
+    dihitung di sini, di luar transaksi, agar kunci tulis database tidak
+    ditahan selama hashing.
+
+    Args:
+        data_akun: Iterable dict {'username', 'password', 'first_name'?, 'last_name'?, 'email'?}
+        proses: Jumlah proses untuk hash kata sandi
+
+    Returns:
+        Tuple (list User baru, jumlah dilewati)
+    """
+    data_akun = {a['username']: a for a in data_akun}
+    sudah_ada = set(User.objects.filter(username__in=data_akun).values_list('username', flat=True))
+    baru = [a for nama, a in data_akun.items() if nama not in sudah_ada]
+    hashes = hash_kata_sandi([a['password'] for a in baru], proses)
+    pengguna = [
+        User(
+            username=a['username'],
+            password=hash_,
+            first_name=a.get('first_name') or '',
+            last_name=a.get('last_name') or '',
+            email=a.get('email') or '',
+            is_staff=True,
+            is_superuser=False,
+        )
+        for a, hash_ in zip(baru, hashes)
+    ]
+    return pengguna, len(sudah_ada)
+
+
+def simpan_akun_pakar(pengguna, grup):
+    """
+    Simpan akun hasil siapkan_akun_pakar dan masukkan ke grup (bulk)
+
+    Hanya akun yang benar-benar dibuat panggilan ini yang dimasukkan ke grup:
+    nama pengguna yang sudah dibuat proses lain di antaranya dilewati
+    ignore_conflicts dan tidak ikut diberi akses pakar.
+
+    Args:
+        pengguna: List User belum disimpan
+        grup: Group tujuan
+
+    Returns:
+        Jumlah akun dibuat
+    """
+    with transaction.atomic():
+        id_terakhir = User.objects.aggregate(id_maks=Max('id'))['id_maks'] or 0
+        User.objects.bulk_create(pengguna, batch_size=500, ignore_conflicts=True)
+        # pk hasil bulk_create dengan ignore_conflicts tidak terisi: ambil ulang id baris baru
+        ids = list(User.objects.filter(
+            id__gt=id_terakhir, username__in=[u.username for u in pengguna]
+        ).values_list('id', flat=True))
+        User.groups.through.objects.bulk_create(
+            [User.groups.through(user_id=user_id, group_id=grup.id) for user_id in ids],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+    return len(ids)
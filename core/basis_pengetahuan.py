@@ -0,0 +1,345 @@
+"""
+Memuat basis pengetahuan (Gejala, Kondisi, Aturan) dari berkas data berversi.
+
+Berkas JSON (bawaan core/data/basis_pengetahuan.json):
+    {
+      "versi": "2025.1",
+      "gejala":  [{"kode": "G01", "nama": "..."}],
+      "kondisi": [{"kode": "K01", "nama": "...", "deskripsi": "...", "solusi": "..."}],
+      "aturan":  [{"kelompok": "R01", "kondisi": "K01", "gejala": ["G01", ...], "keterangan": "..."}]
+    }
+
+Pemuatan memakai strategi diff-dan-upsert dalam satu transaksi: isi database
+dibaca sekali, dibandingkan dengan berkas, lalu hanya selisihnya yang ditulis
+dengan bulk_create/bulk_update. Gejala dan Kondisi yang tidak ada di berkas
+TIDAK dihapus secara bawaan, karena penghapusan Gejala meng-cascade
+DetailKonsultasi (riwayat konsultasi pasien); dengan hapus_tidak_terpakai=True
+hanya yang belum pernah dipakai konsultasi yang dihapus. Aturan disinkronkan
+penuh (aturan yang tidak ada di berkas dihapus) karena tidak dirujuk riwayat.
+Memuat berkas yang sama dua kali tidak mengubah apa pun.
+
+Editor aturan pakar (edit_rule_pakar, create_rule_group) memakai
+sinkron_aturan_kondisi/tambah_kelompok_aturan dengan pola yang sama: hitung
+selisih, lalu hanya INSERT/DELETE baris yang berubah.
+"""
+import json
+from collections import Counter
+from pathlib import Path
+
+from .models import Gejala, Kondisi, Aturan, Konsultasi, DetailKonsultasi, StatistikTotal
+from .statistik import hitung_ulang_total, tunda_total, ubah_total
+from .versi_kb import naikkan_versi_kb, perubahan_kb
+
+BERKAS_BAWAAN = Path(__file__).resolve().parent / 'data' / 'basis_pengetahuan.json'
+
+UKURAN_BATCH = 1000
+
+FIELD_GEJALA = {'nama': 'namaGejala'}
+FIELD_KONDISI = {'nama': 'namaKondisi', 'deskripsi': 'deskripsi', 'solusi': 'solusi'}
+
+
+class KesalahanBasisPengetahuan(ValueError):
+    """Isi berkas basis pengetahuan tidak valid"""
+
+
+def baca_berkas(path=BERKAS_BAWAAN):
+    """Baca dan validasi berkas basis pengetahuan, kembalikan dict data"""
+    with open(path, encoding='utf-8') as berkas:
+        try:
+            data = json.load(berkas)
+        except json.JSONDecodeError as e:
+            raise KesalahanBasisPengetahuan(f'{path}: JSON tidak valid ({e})')
+    validasi(data)
+    return data
+
+
+def _periksa_entri(data, nama, wajib, opsional=(), boleh_null=False):
+    """Pastikan data[nama] berupa list objek dengan kunci teks yang diperlukan"""
+    if not isinstance(data[nama], list):
+        raise KesalahanBasisPengetahuan(f'"{nama}" harus berupa list')
+    for i, entri in enumerate(data[nama], start=1):
+        if not isinstance(entri, dict):
+            raise KesalahanBasisPengetahuan(f'{nama} ke-{i}: entri harus berupa objek')
+        for kunci in wajib:
+            if not isinstance(entri.get(kunci), str) or not entri[kunci]:
+                raise KesalahanBasisPengetahuan(f'{nama} ke-{i}: "{kunci}" wajib diisi teks')
+        for kunci in opsional:
+            if kunci in entri and not isinstance(entri[kunci], str) and not (boleh_null and entri[kunci] is None):
+                raise KesalahanBasisPengetahuan(f'{nama} ke-{i}: "{kunci}" harus berupa teks')
+
+
+def validasi(data):
+    """
+    Periksa struktur dan referensi antar entitas sebelum ada yang ditulis
+
+    Kunci yang hilang atau bertipe salah dilaporkan bersama nomor entrinya,
+    bukan sebagai KeyError/TypeError di tengah pemuatan.
+
+    Raises:
+        KesalahanBasisPengetahuan
+    """
+    if not isinstance(data, dict):
+        raise KesalahanBasisPengetahuan('Isi berkas harus berupa objek JSON')
+    for kunci in ('versi', 'gejala', 'kondisi', 'aturan'):
+        if kunci not in data:
+            raise KesalahanBasisPengetahuan(f'Kunci "{kunci}" tidak ada')
+    _periksa_entri(data, 'gejala', ('kode', 'nama'))
+    _periksa_entri(data, 'kondisi', ('kode', 'nama'), ('deskripsi', 'solusi'))
+    _periksa_entri(data, 'aturan', ('kelompok', 'kondisi'), ('keterangan',), boleh_null=True)
+    for i, aturan in enumerate(data['aturan'], start=1):
+        gejala = aturan.get('gejala')
+        if not isinstance(gejala, list) or not gejala or not all(isinstance(g, str) for g in gejala):
+            raise KesalahanBasisPengetahuan(f'aturan ke-{i}: "gejala" harus berupa list kode gejala')
+
+    for nama in ('gejala', 'kondisi'):
+        ganda = [kode for kode, n in Counter(e['kode'] for e in data[nama]).items() if n > 1]
+        if ganda:
+            raise KesalahanBasisPengetahuan(f'Kode {nama} ganda: {", ".join(sorted(ganda))}')
+    kode_gejala = {g['kode'] for g in data['gejala']}
+    kode_kondisi = {k['kode'] for k in data['kondisi']}
+    for aturan in data['aturan']:
+        if aturan['kondisi'] not in kode_kondisi:
+            raise KesalahanBasisPengetahuan(
+                f'Aturan {aturan["kelompok"]}: kondisi {aturan["kondisi"]} tidak didefinisikan'
+            )
+        tidak_dikenal = set(aturan['gejala']) - kode_gejala
+        if tidak_dikenal:
+            raise KesalahanBasisPengetahuan(
+                f'Aturan {aturan["kelompok"]}: gejala {", ".join(sorted(tidak_dikenal))} tidak didefinisikan'
+            )
+
+
+def _upsert(model, pk, peta_field, entri):
+    """
+    bulk_create untuk kode baru, bulk_update hanya untuk baris yang isinya berubah
+
+    Returns:
+        Tuple (jumlah dibuat, jumlah diubah)
+    """
+    fields = list(peta_field.values())
+    ada = {obj.pk: obj for obj in model.objects.only(pk, *fields)}
+    baru, berubah = [], []
+    for e in entri:
+        nilai = {field: e.get(kunci, '') for kunci, field in peta_field.items()}
+        obj = ada.get(e['kode'])
+        if obj is None:
+            baru.append(model(**{pk: e['kode']}, **nilai))
+        elif any(getattr(obj, field) != v for field, v in nilai.items()):
+            for field, v in nilai.items():
+                setattr(obj, field, v)
+            berubah.append(obj)
+    model.objects.bulk_create(baru, batch_size=UKURAN_BATCH)
+    model.objects.bulk_update(berubah, fields, batch_size=UKURAN_BATCH)
+    return len(baru), len(berubah)
+
+
+def _sinkron_aturan(entri):
+    """
+    Returns:
+        Tuple (jumlah dibuat, jumlah diubah, jumlah dihapus)
+    """
+    diinginkan = {}
+    for aturan in entri:
+        for gejala in aturan['gejala']:
+            kunci = (aturan['kondisi'], gejala, aturan['kelompok'])
+            diinginkan[kunci] = aturan.get('keterangan') or None
+
+    ada = {
+        (a.kondisi_id, a.gejala_id, a.kodeKelompokAturan): a
+        for a in Aturan.objects.only('id', 'kondisi_id', 'gejala_id', 'kodeKelompokAturan', 'keterangan')
+    }
+    baru = [
+        Aturan(kondisi_id=k, gejala_id=g, kodeKelompokAturan=kel, keterangan=ket)
+        for (k, g, kel), ket in diinginkan.items() if (k, g, kel) not in ada
+    ]
+    berubah = []
+    for kunci, aturan in ada.items():
+        if kunci in diinginkan and aturan.keterangan != diinginkan[kunci]:
+            aturan.keterangan = diinginkan[kunci]
+            berubah.append(aturan)
+    hapus = [aturan.id for kunci, aturan in ada.items() if kunci not in diinginkan]
+
+    Aturan.objects.bulk_create(baru, batch_size=UKURAN_BATCH)
+    Aturan.objects.bulk_update(berubah, ['keterangan'], batch_size=UKURAN_BATCH)
+    for i in range(0, len(hapus), UKURAN_BATCH):
+        Aturan.objects.filter(id__in=hapus[i:i + UKURAN_BATCH]).delete()
+    return len(baru), len(berubah), len(hapus)
+
+
+def _hapus_tidak_terpakai(data):
+    """
+    Hapus Gejala/Kondisi yang tidak ada di berkas DAN tidak dirujuk riwayat konsultasi
+
+    Returns:
+        Dict {'gejala': (dihapus, dipertahankan), 'kondisi': (dihapus, dipertahankan)}
+    """
+    hasil = {}
+    gejala_lama = Gejala.objects.exclude(kodeGejala__in=[g['kode'] for g in data['gejala']])
+    terpakai = gejala_lama.filter(kodeGejala__in=DetailKonsultasi.objects.values('gejala_id'))
+    jumlah_terpakai = terpakai.count()
+    _, per_model = gejala_lama.exclude(pk__in=terpakai.values('pk')).delete()
+    hasil['gejala'] = (per_model.get(Gejala._meta.label, 0), jumlah_terpakai)
+
+    kondisi_lama = Kondisi.objects.exclude(kodeKondisi__in=[k['kode'] for k in data['kondisi']])
+    terpakai = kondisi_lama.filter(kodeKondisi__in=Konsultasi.objects.values('hasilKondisi_id'))
+    jumlah_terpakai = terpakai.count()
+    dihapus = 0
+    for kondisi in kondisi_lama.exclude(pk__in=terpakai.values('pk')):
+        # Per objek agar signal pre_delete Kondisi memindahkan rollup statistik
+        kondisi.delete()
+        dihapus += 1
+    hasil['kondisi'] = (dihapus, jumlah_terpakai)
+    return hasil
+
+
+def muat_basis_pengetahuan(data, hapus_tidak_terpakai=False):
+    """
+    Sinkronkan basis pengetahuan di database dengan isi berkas
+
+    Args:
+        data: Dict hasil baca_berkas()
+        hapus_tidak_terpakai: Hapus Gejala/Kondisi yang tidak ada di berkas
+            dan belum pernah dipakai konsultasi
+
+    Returns:
+        Dict ringkasan perubahan per entitas
+    """
+    validasi(data)
+    with perubahan_kb():
+        ringkasan = {
+            'versi': data['versi'],
+            'gejala': dict(zip(('dibuat', 'diubah'), _upsert(Gejala, 'kodeGejala', FIELD_GEJALA, data['gejala']))),
+            'kondisi': dict(zip(('dibuat', 'diubah'), _upsert(Kondisi, 'kodeKondisi', FIELD_KONDISI, data['kondisi']))),
+            'aturan': dict(zip(('dibuat', 'diubah', 'dihapus'), _sinkron_aturan(data['aturan']))),
+        }
+        if hapus_tidak_terpakai:
+            for nama, (dihapus, dipertahankan) in _hapus_tidak_terpakai(data).items():
+                ringkasan[nama].update(dihapus=dihapus, dipertahankan=dipertahankan)
+
+        # bulk_create/bulk_update melewati signal: setel ulang counter dan naikkan versi bila ada perubahan
+        hitung_ulang_total(StatistikTotal.GEJALA, StatistikTotal.KONDISI, StatistikTotal.ATURAN)
+        if any(n for entitas in ('gejala', 'kondisi', 'aturan') for n in ringkasan[entitas].values()):
+            naikkan_versi_kb()
+    return ringkasan
+
+
+def _kode_gejala_valid(kode_gejala):
+    """
+    Pastikan semua kode gejala ada (satu query in_bulk)
+
+    Raises:
+        KesalahanBasisPengetahuan
+    """
+    ada = Gejala.objects.in_bulk(kode_gejala)
+    tidak_dikenal = set(kode_gejala) - ada.keys()
+    if tidak_dikenal:
+        raise KesalahanBasisPengetahuan(f'Gejala tidak ditemukan: {", ".join(sorted(tidak_dikenal))}')
+
+
+def _periksa_kode_kelompok(kode_kelompok, kondisi=None):
+    """
+    Satu kode kelompok aturan hanya milik satu kondisi
+
+    Args:
+        kode_kelompok: Iterable kodeKelompokAturan yang akan ditulis
+        kondisi: Kondisi pemilik kode yang boleh dipakai ulang (editor aturan);
+            None untuk kelompok baru, yang tidak boleh memakai kode yang sudah ada
+
+    Raises:
+        KesalahanBasisPengetahuan
+    """
+    terpakai = Aturan.objects.filter(kodeKelompokAturan__in=set(kode_kelompok))
+    if kondisi is not None:
+        terpakai = terpakai.exclude(kondisi=kondisi)
+    terpakai = sorted(set(terpakai.values_list('kodeKelompokAturan', flat=True)))
+    if terpakai:
+        raise KesalahanBasisPengetahuan(f'Kode kelompok {", ".join(terpakai)} sudah digunakan')
+
+
+def kode_kelompok_berikutnya():
+    """Kode kelompok aturan R<nn> berikutnya yang belum dipakai kondisi mana pun"""
+    nomor = [
+        int(kode[1:]) for kode in Aturan.objects.values_list('kodeKelompokAturan', flat=True).distinct()
+        if kode[:1] == 'R' and kode[1:].isdigit()
+    ]
+    return f'R{max(nomor, default=0) + 1:02d}'
+
+
+def sinkron_aturan_kondisi(kondisi, kelompok):
+    """
+    Samakan seluruh aturan satu kondisi dengan isi form editor aturan
+
+    Hanya aturan yang hilang dihapus dan yang baru dibuat; aturan yang tidak
+    berubah dibiarkan (id tetap). Atomik dengan satu kenaikan versi. Kode
+    kelompok yang sudah dipakai kondisi lain ditolak.
+
+    Args:
+        kondisi: Objek Kondisi
+        kelompok: Dict kodeKelompokAturan -> iterable kode gejala
+
+    Returns:
+        Tuple (jumlah dibuat, jumlah dihapus)
+
+    Raises:
+        KesalahanBasisPengetahuan
+    """
+    diinginkan = {(gejala, kode) for kode, gejala_list in kelompok.items() for gejala in gejala_list if gejala}
+
+    # tunda_total: post_delete per aturan yang dihapus tidak menulis counter per baris
+    with perubahan_kb(), tunda_total():
+        # Diperiksa di transaksi yang sama dengan penulisannya
+        _kode_gejala_valid({gejala for gejala, _ in diinginkan})
+        _periksa_kode_kelompok({kode for _, kode in diinginkan}, kondisi)
+        ada = {
+            (gejala_id, kode): id
+            for id, gejala_id, kode in Aturan.objects.filter(kondisi=kondisi)
+            .values_list('id', 'gejala_id', 'kodeKelompokAturan')
+        }
+        hapus = [id for kunci, id in ada.items() if kunci not in diinginkan]
+        baru = [
+            Aturan(kondisi=kondisi, gejala_id=gejala, kodeKelompokAturan=kode)
+            for gejala, kode in sorted(diinginkan - ada.keys())
+        ]
+        if hapus:
+            Aturan.objects.filter(id__in=hapus).delete()
+        if baru:
+            Aturan.objects.bulk_create(baru, batch_size=UKURAN_BATCH)
+            ubah_total(StatistikTotal.ATURAN, len(baru))
+            naikkan_versi_kb()
+    return len(baru), len(hapus)
+
+
+def tambah_kelompok_aturan(kondisi_id, kode_kelompok, kode_gejala):
+    """
+    Tambah satu kelompok aturan (AND) baru untuk sebuah kondisi
+
+    Kode kelompok yang sudah dipakai ditolak (lihat _periksa_kode_kelompok):
+    menambahkan gejala ke kelompok yang ada akan mengubah syarat AND aturan
+    lama (gunakan sinkron_aturan_kondisi).
+
+    Args:
+        kondisi_id: Kode kondisi
+        kode_kelompok: kodeKelompokAturan, mis. 'R07'
+        kode_gejala: Iterable kode gejala
+
+    Returns:
+        Jumlah aturan yang dibuat
+
+    Raises:
+        Kondisi.DoesNotExist, KesalahanBasisPengetahuan
+    """
+    kondisi = Kondisi.objects.get(kodeKondisi=kondisi_id)
+    kode_gejala = {kode for kode in kode_gejala if kode}
+
+    with perubahan_kb():
+        _kode_gejala_valid(kode_gejala)
+        _periksa_kode_kelompok([kode_kelompok])
+        baru = [
+            Aturan(kondisi=kondisi, gejala_id=kode, kodeKelompokAturan=kode_kelompok)
+            for kode in sorted(kode_gejala)
+        ]
+        if baru:
+            Aturan.objects.bulk_create(baru)
+            ubah_total(StatistikTotal.ATURAN, len(baru))
+            naikkan_versi_kb()
+    return len(baru)
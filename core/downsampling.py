@@ -0,0 +1,92 @@
+"""
+Downsampling seri grafik dengan Largest-Triangle-Three-Buckets (LTTB).
+
+LTTB (Steinarsson, 2013) membagi titik di antara titik pertama dan terakhir
+ke dalam ember (bucket) berurutan dan dari setiap ember memilih titik yang
+membentuk segitiga terbesar dengan titik terpilih sebelumnya dan rata-rata
+ember berikutnya. Bentuk kurva tetap terjaga walau jumlah titik jauh
+berkurang. Perhitungan luas dalam satu ember dilakukan vektor dengan NumPy,
+sehingga loop Python hanya sebanyak jumlah ember (= target titik).
+
+Titik pertama, terakhir, dan titik yang secara klinis ditandai (|Z| >= 2,
+yaitu risiko stunting/gizi) selalu dipertahankan.
+"""
+import numpy as np
+
+# Batas |Z-Score| yang dianggap titik klinis penting (lihat PasienRingkasan.status_dari_zscore)
+AMBANG_Z_KLINIS = 2.0
+
+
+def lttb(x, y, target):
+    """
+    Indeks titik terpilih menurut LTTB
+
+    Args:
+        x: Array nilai sumbu-x, urut naik
+        y: Array nilai sumbu-y (tanpa NaN)
+        target: Jumlah titik yang diinginkan (>= 3)
+
+    Returns:
+        np.ndarray indeks terpilih (urut naik), termasuk titik pertama dan terakhir
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if target >= n or n <= 2:
+        return np.arange(n)
+    target = max(int(target), 3)
+
+    # Batas ember untuk titik interior (indeks 1 .. n-2), sebanyak target-2 ember
+    batas = np.linspace(1, n - 1, target - 1).astype(int)
+    terpilih = np.empty(target, dtype=int)
+    terpilih[0] = 0
+    terpilih[-1] = n - 1
+
+    a = 0
+    for i in range(target - 2):
+        awal, akhir = batas[i], batas[i + 1]
+        # Rata-rata ember berikutnya (ember terakhir memakai titik terakhir)
+        awal_berikut, akhir_berikut = batas[i + 1], (batas[i + 2] if i + 2 < len(batas) else n)
+        rata_x = x[awal_berikut:akhir_berikut].mean()
+        rata_y = y[awal_berikut:akhir_berikut].mean()
+
+        # Luas (x2) segitiga titik-a, kandidat, rata-rata ember berikutnya
+        luas = np.abs(
+            (x[a] - rata_x) * (y[awal:akhir] - y[a])
+            - (x[a] - x[awal:akhir]) * (rata_y - y[a])
+        )
+        a = awal + int(np.argmax(luas))
+        terpilih[i + 1] = a
+    return terpilih
+
+
+def pilih_titik_grafik(seri, target, ambang_z=AMBANG_Z_KLINIS):
+    """
+    Kurangi seri grafik Z-Score menjadi paling banyak `target` titik
+
+    Titik dengan score None dibuang. Titik pertama, terakhir dan titik
+    dengan |score| >= ambang_z selalu dipertahankan; sisa kuota dipilih
+    dengan LTTB. Bila titik klinis saja sudah melebihi target, semua titik
+    klinis tetap dikirim (tidak ada yang disembunyikan dari pakar/orang tua).
+
+    Args:
+        seri: List dict {'tgl': 'YYYY-MM-DD', 'score': float|None}, urut tanggal
+        target: Jumlah titik maksimum yang diinginkan
+        ambang_z: Batas |Z| titik klinis
+
+    Returns:
+        List dict dengan format yang sama
+    """
+    seri = [titik for titik in seri if titik['score'] is not None]
+    if target is None or len(seri) <= target:
+        return seri
+
+    x = np.array([np.datetime64(titik['tgl'], 'D') for titik in seri]).astype('int64').astype(float)
+    y = np.array([titik['score'] for titik in seri], dtype=float)
+
+    klinis = np.flatnonzero(np.abs(y) >= ambang_z)
+    klinis_interior = klinis[(klinis > 0) & (klinis < len(seri) - 1)]
+    kuota = max(target - len(klinis_interior), 3)
+
+    indeks = np.union1d(lttb(x, y, kuota), klinis)
+    return [seri[i] for i in indeks]
@@ -0,0 +1,223 @@
+"""
+Ekspor data pengukuran dan konsultasi (CSV/JSONL) untuk dinas kesehatan.
+
+Semua fungsi di sini adalah generator: baris dibaca dengan proyeksi
+values_list dan .iterator(chunk_size=...), lalu diserialisasi dan dikirim
+per kelompok baris. Memori tetap konstan berapa pun jumlah barisnya dan
+byte pertama (header) langsung dikirim, sehingga cocok untuk
+StreamingHttpResponse maupun perintah `python manage.py ekspor_data`.
+
+Konsultasi dan gejalanya diekspor tanpa prefetch: dua stream yang sama-sama
+urut konsultasi_id (Konsultasi dan DetailKonsultasi) digabung seperti merge
+join, jadi tidak ada query per konsultasi dan tidak ada daftar id di memori.
+"""
+import csv
+import io
+import json
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from itertools import groupby
+
+from django.utils import timezone
+
+from .models import Konsultasi, DetailKonsultasi, PengukuranFisik
+
+JENIS_EKSPOR = ('pengukuran', 'konsultasi')
+FORMAT_EKSPOR = ('csv', 'jsonl')
+
+# Jumlah baris per fetch dari database dan per potongan yang dikirim
+UKURAN_CHUNK_EKSPOR = 2000
+
+KOLOM_PENGUKURAN = (
+    ('id', 'id'),
+    ('nama_pengguna', 'pasien__namaPengguna'),
+    ('nama_pasien', 'pasien__nama'),
+    ('jenis_kelamin', 'pasien__jenisKelamin'),
+    ('tanggal_lahir', 'pasien__tanggalLahir'),
+    ('tanggal_ukur', 'tanggalUkur'),
+    ('berat_badan', 'beratBadan'),
+    ('tinggi_badan', 'tinggiBadan'),
+    ('lingkar_kepala', 'lingkarKepala'),
+    ('lingkar_lengan', 'lingkarLengan'),
+    ('imunisasi', 'imunisasi'),
+    ('zscore_bb_u', 'skor_Z_BB_U'),
+    ('zscore_tb_u', 'skor_Z_TB_U'),
+)
+
+KOLOM_KONSULTASI = (
+    ('id', 'id'),
+    ('nama_pengguna', 'pasien__namaPengguna'),
+    ('nama_pasien', 'pasien__nama'),
+    ('tanggal_konsultasi', 'tanggalKonsultasi'),
+    ('kode_kondisi', 'hasilKondisi_id'),
+    ('nama_kondisi', 'hasilKondisi__namaKondisi'),
+)
+
+
+def queryset_pengukuran(dari=None, sampai=None, kondisi=None):
+    """
+    Pengukuran yang diekspor, urut (-tanggalUkur, id) sesuai indeks pengukuran_tgl_id_idx
+
+    Args:
+        dari, sampai: Rentang tanggal ukur (inklusif), boleh None
+        kondisi: Kode kondisi diagnosa terakhir pasien (PasienRingkasan), boleh None
+    """
+    qs = PengukuranFisik.objects.all()
+    if dari:
+        qs = qs.filter(tanggalUkur__gte=dari)
+    if sampai:
+        qs = qs.filter(tanggalUkur__lte=sampai)
+    if kondisi:
+        qs = qs.filter(pasien__ringkasan__hasilKondisiTerakhir_id=kondisi)
+    return qs.order_by('-tanggalUkur', 'id')
+
+
+def _awal_hari(tanggal):
+    return timezone.make_aware(datetime.combine(tanggal, time.min))
+
+
+def _filter_konsultasi(qs, prefix, dari, sampai, kondisi):
+    # Batas datetime aware (zona waktu lokal), bukan __date: __date membungkus kolom
+    # dengan fungsi konversi zona waktu sehingga indeks tanggalKonsultasi tidak terpakai
+    if dari:
+        qs = qs.filter(**{f'{prefix}tanggalKonsultasi__gte': _awal_hari(dari)})
+    if sampai:
+        qs = qs.filter(**{f'{prefix}tanggalKonsultasi__lt': _awal_hari(sampai + timedelta(days=1))})
+    if kondisi:
+        qs = qs.filter(**{f'{prefix}hasilKondisi_id': kondisi})
+    return qs
+
+
+def queryset_konsultasi(dari=None, sampai=None, kondisi=None):
+    """
+    Konsultasi dan detail gejalanya dengan filter yang sama, keduanya urut konsultasi id
+
+    Args:
+        dari, sampai: Rentang tanggal konsultasi (inklusif), boleh None
+        kondisi: Kode kondisi hasil diagnosa, boleh None
+
+    Returns:
+        Tuple (queryset Konsultasi, queryset DetailKonsultasi)
+    """
+    konsultasi = _filter_konsultasi(Konsultasi.objects.all(), '', dari, sampai, kondisi).order_by('id')
+    detail = _filter_konsultasi(
+        DetailKonsultasi.objects.all(), 'konsultasi__', dari, sampai, kondisi
+    ).order_by('konsultasi_id', 'gejala_id')
+    return konsultasi, detail
+
+
+def _nilai_json(nilai):
+    if isinstance(nilai, Decimal):
+        return float(nilai)
+    if hasattr(nilai, 'isoformat'):
+        if getattr(nilai, 'tzinfo', None) is not None:
+            nilai = timezone.localtime(nilai)
+        return nilai.isoformat()
+    return nilai
+
+
+def baris_pengukuran(dari=None, sampai=None, kondisi=None, chunk_size=UKURAN_CHUNK_EKSPOR):
+    """Generator dict baris pengukuran (kunci = nama kolom ekspor)"""
+    nama = [kolom for kolom, _ in KOLOM_PENGUKURAN]
+    qs = queryset_pengukuran(dari, sampai, kondisi).values_list(*[field for _, field in KOLOM_PENGUKURAN])
+    for baris in qs.iterator(chunk_size=chunk_size):
+        yield dict(zip(nama, map(_nilai_json, baris)))
+
+
+def baris_konsultasi(dari=None, sampai=None, kondisi=None, chunk_size=UKURAN_CHUNK_EKSPOR):
+    """
+    Generator dict baris konsultasi dengan daftar kode gejala ('gejala')
+
+    Stream detail dimajukan bersamaan dengan stream konsultasi (merge join
+    pada konsultasi_id), jadi hanya gejala satu konsultasi yang ditahan.
+    """
+    nama = [kolom for kolom, _ in KOLOM_KONSULTASI]
+    konsultasi, detail = queryset_konsultasi(dari, sampai, kondisi)
+    konsultasi = konsultasi.values_list(*[field for _, field in KOLOM_KONSULTASI])
+    detail = detail.values_list('konsultasi_id', 'gejala_id')
+
+    kelompok_gejala = groupby(detail.iterator(chunk_size=chunk_size), key=lambda d: d[0])
+    berikutnya = next(kelompok_gejala, None)
+    for baris in konsultasi.iterator(chunk_size=chunk_size):
+        konsultasi_id = baris[0]
+        # Lewati detail milik konsultasi yang tidak ada di stream (mis. dihapus di tengah ekspor)
+        while berikutnya is not None and berikutnya[0] < konsultasi_id:
+            berikutnya = next(kelompok_gejala, None)
+        gejala = []
+        if berikutnya is not None and berikutnya[0] == konsultasi_id:
+            gejala = [kode for _, kode in berikutnya[1]]
+            berikutnya = next(kelompok_gejala, None)
+        hasil = dict(zip(nama, map(_nilai_json, baris)))
+        hasil['gejala'] = gejala
+        yield hasil
+
+
+def kolom_ekspor(jenis):
+    if jenis == 'pengukuran':
+        return [kolom for kolom, _ in KOLOM_PENGUKURAN]
+    return [kolom for kolom, _ in KOLOM_KONSULTASI] + ['gejala']
+
+
+def _sumber_baris(jenis, dari, sampai, kondisi, chunk_size):
+    if jenis == 'pengukuran':
+        return baris_pengukuran(dari, sampai, kondisi, chunk_size)
+    return baris_konsultasi(dari, sampai, kondisi, chunk_size)
+
+
+def stream_ekspor(jenis, format='csv', dari=None, sampai=None, kondisi=None, chunk_size=UKURAN_CHUNK_EKSPOR):
+    """
+    Generator potongan teks hasil ekspor
+
+    Header CSV dikirim sebagai potongan pertama sebelum query dijalankan;
+    sesudahnya satu potongan berisi paling banyak chunk_size baris.
+
+    Args:
+        jenis: 'pengukuran' atau 'konsultasi'
+        format: 'csv' atau 'jsonl'
+        dari, sampai: Rentang tanggal (inklusif), boleh None
+        kondisi: Kode kondisi (lihat queryset_pengukuran/queryset_konsultasi)
+        chunk_size: Baris per fetch database dan per potongan
+
+    Yields:
+        str
+    """
+    if jenis not in JENIS_EKSPOR:
+        raise ValueError(f'Jenis ekspor tidak dikenal: {jenis}')
+    if format not in FORMAT_EKSPOR:
+        raise ValueError(f'Format ekspor tidak dikenal: {format}')
+
+    kolom = kolom_ekspor(jenis)
+    buffer = io.StringIO()
+    writer = None
+    if format == 'csv':
+        writer = csv.writer(buffer)
+        writer.writerow(kolom)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    jumlah = 0
+    for baris in _sumber_baris(jenis, dari, sampai, kondisi, chunk_size):
+        if writer is not None:
+            if 'gejala' in baris:
+                baris['gejala'] = ';'.join(baris['gejala'])
+            writer.writerow(['' if baris[k] is None else baris[k] for k in kolom])
+        else:
+            buffer.write(json.dumps(baris, ensure_ascii=False))
+            buffer.write('\n')
+        jumlah += 1
+        if jumlah % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def nama_berkas_ekspor(jenis, format, dari=None, sampai=None):
+    bagian = [jenis]
+    if dari:
+        bagian.append(f'dari-{dari.isoformat()}')
+    if sampai:
+        bagian.append(f'sampai-{sampai.isoformat()}')
+    return '_'.join(bagian) + f'.{format}'
@@ -0,0 +1,561 @@
+"""
+Impor massal pengukuran dan pasien dari lembar CSV posyandu.
+
+Alur per chunk (bawaan 1000 baris):
+1. CSV dibaca secara streaming (csv.DictReader), tidak dimuat utuh ke memori.
+2. Pasien di-resolve sekaligus dengan satu query namaPengguna__in (di-cache antar chunk).
+3. Validasi tanggal (masa depan, sebelum tanggalLahir, usia > 20 tahun) dan
+   perhitungan Z-Score dilakukan vektor dengan NumPy (core/referensi.py).
+4. Baris valid ditulis dengan bulk_create dalam satu transaksi per chunk,
+   bersama pemeliharaan data turunan yang biasanya dilakukan signal
+   (ringkasan pasien dan rollup statistik harian).
+
+Jadwal notifikasi pengukuran ulang dibuat sekali per pasien setelah semua
+chunk selesai (berdasarkan tanggal ukur terakhir yang diimpor).
+
+Format kolom CSV (header wajib, nama tidak peka huruf besar/kecil):
+    nama_pengguna, tanggal_ukur (YYYY-MM-DD), berat_badan, tinggi_badan,
+    lingkar_kepala (opsional), lingkar_lengan (opsional), imunisasi (opsional)
+
+Impor pasien (pendaftaran satu desa sekaligus) lihat impor_pasien_csv():
+keunikan namaPengguna dicek sekaligus per chunk, kredensial yang kosong
+dibuat otomatis, hash kata sandi dihitung paralel di process pool
+(core.akun.hash_kata_sandi), lalu pasien ditulis dengan bulk_create. Nama
+pengguna yang terpakai pendaftaran lain di antara pengecekan dan penulisan
+dilaporkan gagal per baris, bukan menggagalkan seluruh impor.
+"""
+import csv
+import re
+import secrets
+import string
+import time
+from collections import Counter
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+import numpy as np
+from django.db import IntegrityError, transaction
+
+from .akun import hash_kata_sandi
+from .models import Pasien, PasienRingkasan, PengukuranFisik, Notifikasi, StatistikHarian, StatistikTotal
+from .referensi import zscore_vektor
+from .ringkasan import hitung_ulang_ringkasan
+from .statistik import ubah_harian, ubah_total
+
+KOLOM_WAJIB = ('nama_pengguna', 'tanggal_ukur', 'berat_badan', 'tinggi_badan')
+KOLOM_OPSIONAL = ('lingkar_kepala', 'lingkar_lengan', 'imunisasi')
+
+UKURAN_CHUNK = 1000
+
+# Batas usia seperti di hitung_dan_simpan_zscore (20 tahun)
+UMUR_MAKS_BULAN = 240
+
+
+class KesalahanFormatImpor(ValueError):
+    """Header CSV tidak memuat kolom wajib"""
+
+
+def _baca_header(berkas_teks, delimiter, kolom_wajib):
+    """DictReader dengan nama kolom dinormalisasi; raise KesalahanFormatImpor bila kolom wajib kurang"""
+    reader = csv.DictReader(berkas_teks, delimiter=delimiter)
+    if reader.fieldnames is None:
+        raise KesalahanFormatImpor('Berkas CSV kosong')
+    reader.fieldnames = [(nama or '').strip().lower().lstrip('\ufeff') for nama in reader.fieldnames]
+    kurang = [kolom for kolom in kolom_wajib if kolom not in reader.fieldnames]
+    if kurang:
+        raise KesalahanFormatImpor(f'Kolom wajib tidak ada: {", ".join(kurang)}')
+    return reader
+
+
+def _chunk(iterable, ukuran):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, ukuran))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _desimal(nilai, wajib=True):
+    nilai = (nilai or '').strip().replace(',', '.')
+    if not nilai:
+        if wajib:
+            raise ValueError('wajib diisi')
+        return None
+    try:
+        angka = Decimal(nilai)
+    except InvalidOperation:
+        raise ValueError(f'"{nilai}" bukan angka')
+    if angka <= 0:
+        raise ValueError('harus lebih dari 0')
+    # DecimalField(max_digits=5, decimal_places=2)
+    if angka >= 1000:
+        raise ValueError('terlalu besar')
+    return angka.quantize(Decimal('0.01'))
+
+
+def _parse_baris(nomor, baris):
+    """
+    Parse satu baris CSV menjadi dict nilai, atau raise ValueError dengan pesan untuk laporan
+    """
+    nama_pengguna = (baris.get('nama_pengguna') or '').strip()
+    if not nama_pengguna:
+        raise ValueError('nama_pengguna wajib diisi')
+    try:
+        tanggal = date.fromisoformat((baris.get('tanggal_ukur') or '').strip())
+    except ValueError:
+        raise ValueError(f'tanggal_ukur "{baris.get("tanggal_ukur")}" bukan format YYYY-MM-DD')
+    hasil = {'baris': nomor, 'nama_pengguna': nama_pengguna, 'tanggalUkur': tanggal}
+    for kolom, field, wajib in (
+        ('berat_badan', 'beratBadan', True),
+        ('tinggi_badan', 'tinggiBadan', True),
+        ('lingkar_kepala', 'lingkarKepala', False),
+        ('lingkar_lengan', 'lingkarLengan', False),
+    ):
+        try:
+            hasil[field] = _desimal(baris.get(kolom), wajib)
+        except ValueError as e:
+            raise ValueError(f'{kolom} {e}')
+    hasil['imunisasi'] = (baris.get('imunisasi') or '').strip() or None
+    return hasil
+
+
+class ImporPengukuran:
+    """
+    Menjalankan impor satu berkas CSV dan mengumpulkan laporan per baris
+
+    Atribut hasil: berhasil (jumlah baris tersimpan), gagal (list dict
+    {'baris', 'nama_pengguna', 'pesan'}), durasi_detik, serta berhenti_di_baris
+    dan pesan_berhenti bila pembacaan berkas terhenti di tengah jalan.
+    """
+
+    def __init__(self, ukuran_chunk=UKURAN_CHUNK, buat_notifikasi=True):
+        self.ukuran_chunk = ukuran_chunk
+        self.buat_notifikasi = buat_notifikasi
+        self.berhasil = 0
+        self.gagal = []
+        self.durasi_detik = 0.0
+        self.berhenti_di_baris = None
+        self.pesan_berhenti = None
+        self._pasien = {}
+        self._ukur_terakhir = {}
+
+    def laporan(self):
+        return {
+            'berhasil': self.berhasil,
+            'gagal': self.gagal,
+            'durasi_detik': round(self.durasi_detik, 3),
+            'baris_per_detik': round((self.berhasil + len(self.gagal)) / self.durasi_detik, 1)
+            if self.durasi_detik else 0.0,
+            'berhenti_di_baris': self.berhenti_di_baris,
+            'pesan_berhenti': self.pesan_berhenti,
+        }
+
+    def _catat_gagal(self, nomor, nama_pengguna, pesan):
+        self.gagal.append({'baris': nomor, 'nama_pengguna': nama_pengguna, 'pesan': pesan})
+
+    def jalankan(self, berkas_teks, delimiter=','):
+        """
+        Args:
+            berkas_teks: Objek file teks (dibuka dengan newline='')
+            delimiter: Pemisah kolom CSV
+
+        Returns:
+            Dict laporan (lihat laporan()). Berkas yang tidak dapat didekode di
+            tengah jalan tidak menggagalkan impor: chunk sebelumnya sudah
+            tersimpan, jadi laporan memuat jumlah yang tersimpan beserta
+            berhenti_di_baris dan pesan_berhenti.
+
+        Raises:
+            KesalahanFormatImpor: Header tidak valid
+            UnicodeDecodeError: Header tidak dapat didekode (belum ada yang tersimpan)
+        """
+        mulai = time.perf_counter()
+        reader = _baca_header(berkas_teks, delimiter, KOLOM_WAJIB)
+
+        for chunk in _chunk(self._baris_bernomor(reader), self.ukuran_chunk):
+            self._proses_chunk(chunk)
+
+        # Kesalahan dicatat per tahap validasi; laporan diurutkan menurut baris berkas
+        self.gagal.sort(key=lambda g: g['baris'])
+        if self.buat_notifikasi and self._ukur_terakhir:
+            self._buat_notifikasi()
+        self.durasi_detik = time.perf_counter() - mulai
+        return self.laporan()
+
+    def _baris_bernomor(self, reader):
+        """
+        Baris CSV beserta nomornya; berhenti dan mencatat posisinya bila berkas gagal didekode
+
+        Baris yang sudah terbaca sebelum kesalahan tetap diproses. Berkas
+        didekode per blok, jadi byte yang rusak bisa berada beberapa baris
+        setelah berhenti_di_baris (baris pertama yang tidak terbaca).
+        """
+        # Nomor baris mengikuti baris berkas (baris 1 = header)
+        nomor = 1
+        try:
+            for nomor, baris in enumerate(reader, start=2):
+                yield nomor, baris
+        except UnicodeDecodeError as e:
+            self.berhenti_di_baris = nomor + 1
+            self.pesan_berhenti = f'berkas bukan teks UTF-8 yang valid ({e.reason})'
+
+    def _resolve_pasien(self, nama_pengguna):
+        baru = set(nama_pengguna) - self._pasien.keys()
+        if baru:
+            for p in Pasien.objects.filter(namaPengguna__in=baru).values(
+                'id', 'namaPengguna', 'tanggalLahir'
+            ):
+                self._pasien[p['namaPengguna']] = p
+
+    def _proses_chunk(self, chunk):
+        valid = []
+        for nomor, baris in chunk:
+            try:
+                valid.append(_parse_baris(nomor, baris))
+            except ValueError as e:
+                self._catat_gagal(nomor, (baris.get('nama_pengguna') or '').strip(), str(e))
+        if not valid:
+            return
+
+        self._resolve_pasien({v['nama_pengguna'] for v in valid})
+        dikenal = []
+        for v in valid:
+            pasien = self._pasien.get(v['nama_pengguna'])
+            if pasien is None:
+                self._catat_gagal(v['baris'], v['nama_pengguna'], 'pasien tidak ditemukan')
+            else:
+                v['pasien'] = pasien
+                dikenal.append(v)
+        if not dikenal:
+            return
+
+        # Validasi tanggal & Z-Score secara vektor
+        ukur = np.array([v['tanggalUkur'] for v in dikenal], dtype='datetime64[D]')
+        lahir = np.array([v['pasien']['tanggalLahir'] for v in dikenal], dtype='datetime64[D]')
+        umur = (ukur.astype('datetime64[M]') - lahir.astype('datetime64[M]')).astype(int)
+        salah = np.full(len(dikenal), '', dtype=object)
+        salah[umur > UMUR_MAKS_BULAN] = 'usia anak terlalu besar (lebih dari 20 tahun)'
+        salah[ukur < lahir] = 'tanggal_ukur sebelum tanggal lahir pasien'
+        salah[ukur > np.datetime64(date.today(), 'D')] = 'tanggal_ukur di masa depan'
+
+        z_bb_u = zscore_vektor(umur, [float(v['beratBadan']) for v in dikenal], 'bb_u')
+        z_tb_u = zscore_vektor(umur, [float(v['tinggiBadan']) for v in dikenal], 'tb_u')
+
+        # Lewati pengukuran yang sudah ada (impor ulang berkas yang sama)
+        sudah_ada = set(
+            PengukuranFisik.objects.filter(
+                pasien_id__in={v['pasien']['id'] for v in dikenal},
+                tanggalUkur__in={v['tanggalUkur'] for v in dikenal},
+            ).values_list('pasien_id', 'tanggalUkur')
+        )
+
+        objek = []
+        for i, v in enumerate(dikenal):
+            kunci = (v['pasien']['id'], v['tanggalUkur'])
+            if salah[i]:
+                self._catat_gagal(v['baris'], v['nama_pengguna'], salah[i])
+                continue
+            if kunci in sudah_ada:
+                self._catat_gagal(v['baris'], v['nama_pengguna'], 'pengukuran pada tanggal ini sudah ada')
+                continue
+            sudah_ada.add(kunci)
+            objek.append(PengukuranFisik(
+                pasien_id=v['pasien']['id'],
+                tanggalUkur=v['tanggalUkur'],
+                beratBadan=v['beratBadan'],
+                tinggiBadan=v['tinggiBadan'],
+                lingkarKepala=v['lingkarKepala'],
+                lingkarLengan=v['lingkarLengan'],
+                imunisasi=v['imunisasi'],
+                skor_Z_BB_U=Decimal(str(z_bb_u[i])),
+                skor_Z_TB_U=Decimal(str(z_tb_u[i])),
+            ))
+        if objek:
+            self._simpan(objek)
+
+    def _simpan(self, objek):
+        # bulk_create tidak memicu signal: data turunan dipelihara di transaksi yang sama
+        with transaction.atomic():
+            PengukuranFisik.objects.bulk_create(objek)
+            hitung_ulang_ringkasan({o.pasien_id for o in objek})
+            for tanggal, jumlah in Counter(o.tanggalUkur for o in objek).items():
+                ubah_harian(StatistikHarian.JENIS_PENGUKURAN, tanggal, jumlah)
+        self.berhasil += len(objek)
+        for o in objek:
+            if o.tanggalUkur > self._ukur_terakhir.get(o.pasien_id, date.min):
+                self._ukur_terakhir[o.pasien_id] = o.tanggalUkur
+
+    def _buat_notifikasi(self):
+        # Sama seperti buat_jadwal_notifikasi: pengukuran ulang 30 hari setelah pengukuran terakhir
+        with transaction.atomic():
+            Notifikasi.objects.bulk_create([
+                Notifikasi(
+                    pasien_id=pasien_id,
+                    judul="Jadwal Pengukuran Ulang",
+                    pesan="Saatnya melakukan pengukuran ulang pertumbuhan anak Anda.",
+                    jadwalNotifikasi=tanggal + timedelta(days=30),
+                    tipe='pengukuran_ulang',
+                )
+                for pasien_id, tanggal in self._ukur_terakhir.items()
+            ], batch_size=1000)
+
+
+def impor_pengukuran_csv(berkas_teks, ukuran_chunk=UKURAN_CHUNK, delimiter=',', buat_notifikasi=True):
+    """
+    Impor pengukuran dari berkas CSV
+
+    Args:
+        berkas_teks: Objek file teks (dibuka dengan newline='')
+        ukuran_chunk: Jumlah baris per transaksi
+        delimiter: Pemisah kolom
+        buat_notifikasi: Buat jadwal pengukuran ulang per pasien
+
+    Returns:
+        Dict {'berhasil', 'gagal': [{'baris', 'nama_pengguna', 'pesan'}], 'durasi_detik', 'baris_per_detik',
+        'berhenti_di_baris', 'pesan_berhenti'}
+
+    Raises:
+        KesalahanFormatImpor: Header tidak valid
+        UnicodeDecodeError: Header tidak dapat didekode
+    """
+    return ImporPengukuran(ukuran_chunk, buat_notifikasi).jalankan(berkas_teks, delimiter)
+
+
+## Impor pasien
+
+KOLOM_PASIEN_WAJIB = ('nama', 'jenis_kelamin', 'tanggal_lahir')
+KOLOM_PASIEN_OPSIONAL = ('nama_pengguna', 'kata_sandi', 'nama_wali', 'nomor_telepon')
+
+PANJANG_SANDI_OTOMATIS = 8
+# Tanpa huruf/angka yang mudah tertukar saat dibacakan ke orang tua (0/O, 1/l/I)
+ALFABET_SANDI = ''.join(c for c in string.ascii_lowercase + string.digits if c not in '0o1li')
+
+_JENIS_KELAMIN = {'l': 'L', 'laki-laki': 'L', 'p': 'P', 'perempuan': 'P'}
+
+
+def _parse_pasien(nomor, baris):
+    """Parse satu baris CSV pasien menjadi dict field Pasien, atau raise ValueError"""
+    nama = (baris.get('nama') or '').strip()
+    if not nama:
+        raise ValueError('nama wajib diisi')
+    if len(nama) > Pasien._meta.get_field('nama').max_length:
+        raise ValueError('nama terlalu panjang')
+    jenis_kelamin = _JENIS_KELAMIN.get((baris.get('jenis_kelamin') or '').strip().lower())
+    if jenis_kelamin is None:
+        raise ValueError(f'jenis_kelamin "{baris.get("jenis_kelamin")}" harus L atau P')
+    try:
+        tanggal_lahir = date.fromisoformat((baris.get('tanggal_lahir') or '').strip())
+    except ValueError:
+        raise ValueError(f'tanggal_lahir "{baris.get("tanggal_lahir")}" bukan format YYYY-MM-DD')
+    if tanggal_lahir > date.today():
+        raise ValueError('tanggal_lahir di masa depan')
+    nama_pengguna = (baris.get('nama_pengguna') or '').strip()
+    if len(nama_pengguna) > Pasien._meta.get_field('namaPengguna').max_length:
+        raise ValueError('nama_pengguna terlalu panjang')
+    nama_wali = (baris.get('nama_wali') or '').strip() or None
+    if nama_wali and len(nama_wali) > Pasien._meta.get_field('namaWali').max_length:
+        raise ValueError('nama_wali terlalu panjang')
+    nomor_telepon = (baris.get('nomor_telepon') or '').strip() or None
+    if nomor_telepon and len(nomor_telepon) > Pasien._meta.get_field('nomorTelepon').max_length:
+        raise ValueError('nomor_telepon terlalu panjang')
+    return {
+        'baris': nomor,
+        'namaPengguna': nama_pengguna,
+        'kataSandi': (baris.get('kata_sandi') or '').strip(),
+        'nama': nama,
+        'jenisKelamin': jenis_kelamin,
+        'tanggalLahir': tanggal_lahir,
+        'namaWali': nama_wali,
+        'nomorTelepon': nomor_telepon,
+    }
+
+
+def _dasar_nama_pengguna(pasien):
+    # Kata pertama nama (huruf/angka saja) + tanggal lahir, mis. "budi200115"
+    kata = re.sub(r'[^a-z0-9]', '', pasien['nama'].lower().split()[0]) or 'anak'
+    return f"{kata[:20]}{pasien['tanggalLahir']:%y%m%d}"
+
+
+def sandi_acak(panjang=PANJANG_SANDI_OTOMATIS):
+    return ''.join(secrets.choice(ALFABET_SANDI) for _ in range(panjang))
+
+
+class ImporPasien:
+    """
+    Menjalankan impor pasien dari satu berkas CSV
+
+    Kredensial yang dibuat otomatis dikumpulkan di atribut kredensial
+    ({'baris', 'nama', 'nama_pengguna', 'kata_sandi'}) agar dapat dicetak
+    dan dibagikan ke orang tua; kata sandi tidak disimpan dalam bentuk asli.
+    """
+
+    def __init__(self, ukuran_chunk=UKURAN_CHUNK, proses=None):
+        self.ukuran_chunk = ukuran_chunk
+        self.proses = proses
+        self.berhasil = 0
+        self.gagal = []
+        self.kredensial = []
+        self.durasi_detik = 0.0
+
+    def laporan(self):
+        return {
+            'berhasil': self.berhasil,
+            'gagal': self.gagal,
+            'kredensial': self.kredensial,
+            'durasi_detik': round(self.durasi_detik, 3),
+        }
+
+    def _catat_gagal(self, nomor, nama_pengguna, pesan):
+        self.gagal.append({'baris': nomor, 'nama_pengguna': nama_pengguna, 'pesan': pesan})
+
+    def jalankan(self, berkas_teks, delimiter=','):
+        """
+        Args:
+            berkas_teks: Objek file teks (dibuka dengan newline='')
+            delimiter: Pemisah kolom CSV
+
+        Returns:
+            Dict laporan (lihat laporan())
+        """
+        mulai = time.perf_counter()
+        reader = _baca_header(berkas_teks, delimiter, KOLOM_PASIEN_WAJIB)
+
+        valid = []
+        for nomor, baris in enumerate(reader, start=2):
+            try:
+                valid.append(_parse_pasien(nomor, baris))
+            except ValueError as e:
+                self._catat_gagal(nomor, (baris.get('nama_pengguna') or '').strip(), str(e))
+
+        valid = self._nama_pengguna_unik(valid)
+        # Semua hash dihitung sekaligus agar process pool dibuat sekali
+        otomatis = [not v['kataSandi'] for v in valid]
+        for v, acak in zip(valid, otomatis):
+            if acak:
+                v['kataSandi'] = sandi_acak()
+        hashes = hash_kata_sandi([v['kataSandi'] for v in valid], self.proses)
+
+        for v, acak in zip(valid, otomatis):
+            if acak or v.pop('namaPenggunaOtomatis', False):
+                self.kredensial.append({
+                    'baris': v['baris'], 'nama': v['nama'],
+                    'nama_pengguna': v['namaPengguna'], 'kata_sandi': v['kataSandi'],
+                })
+        for chunk in _chunk(zip(valid, hashes), self.ukuran_chunk):
+            self._simpan(chunk)
+
+        self.gagal.sort(key=lambda g: g['baris'])
+        self.durasi_detik = time.perf_counter() - mulai
+        return self.laporan()
+
+    def _nama_pengguna_unik(self, valid):
+        """
+        Tolak nama pengguna eksplisit yang sudah terpakai dan buat yang kosong
+
+        Keunikan dicek dengan query namaPengguna__in per chunk, bukan exists() per baris.
+        """
+        eksplisit = [v['namaPengguna'] for v in valid if v['namaPengguna']]
+        terpakai = set()
+        for chunk in _chunk(eksplisit, self.ukuran_chunk):
+            terpakai.update(Pasien.objects.filter(namaPengguna__in=chunk).values_list('namaPengguna', flat=True))
+
+        hasil = []
+        for v in valid:
+            if not v['namaPengguna']:
+                hasil.append(v)
+                continue
+            if v['namaPengguna'] in terpakai:
+                self._catat_gagal(v['baris'], v['namaPengguna'], 'nama pengguna sudah digunakan')
+                continue
+            terpakai.add(v['namaPengguna'])
+            hasil.append(v)
+
+        # Nama pengguna otomatis: dasar + akhiran angka bila bentrok (satu query per putaran)
+        tanpa_nama = [v for v in hasil if not v['namaPengguna']]
+        akhiran = 1
+        while tanpa_nama:
+            kandidat = {}
+            for v in tanpa_nama:
+                nama = _dasar_nama_pengguna(v) + (str(akhiran) if akhiran > 1 else '')
+                if nama not in terpakai and nama not in kandidat:
+                    kandidat[nama] = v
+            ada = set()
+            for chunk in _chunk(kandidat, self.ukuran_chunk):
+                ada.update(Pasien.objects.filter(namaPengguna__in=chunk).values_list('namaPengguna', flat=True))
+            for nama, v in kandidat.items():
+                if nama in ada:
+                    terpakai.add(nama)
+                    continue
+                v['namaPengguna'] = nama
+                v['namaPenggunaOtomatis'] = True
+                terpakai.add(nama)
+            tanpa_nama = [v for v in tanpa_nama if not v['namaPengguna']]
+            akhiran += 1
+        return hasil
+
+    def _simpan(self, chunk):
+        """
+        Tulis satu chunk pasien; nama pengguna yang terpakai sejak pengecekan dilaporkan gagal
+
+        Nama pengguna dicek sebelum hash dihitung, jadi pendaftaran lain dapat
+        memakai nama yang sama di antaranya. IntegrityError membatalkan seluruh
+        chunk; baris yang bentrok dikeluarkan lalu sisanya ditulis ulang.
+        """
+        while chunk:
+            try:
+                self._tulis(chunk)
+                return
+            except IntegrityError:
+                terpakai = set(Pasien.objects.filter(
+                    namaPengguna__in=[v['namaPengguna'] for v, _ in chunk]
+                ).values_list('namaPengguna', flat=True))
+                if not terpakai:
+                    raise
+            for v, _ in chunk:
+                if v['namaPengguna'] in terpakai:
+                    self._catat_gagal(v['baris'], v['namaPengguna'], 'nama pengguna sudah digunakan')
+            self.kredensial = [k for k in self.kredensial if k['nama_pengguna'] not in terpakai]
+            chunk = [(v, hash_) for v, hash_ in chunk if v['namaPengguna'] not in terpakai]
+
+    def _tulis(self, chunk):
+        # bulk_create tidak memicu signal: ringkasan & counter pasien diisi di transaksi yang sama
+        with transaction.atomic():
+            Pasien.objects.bulk_create([
+                Pasien(
+                    namaPengguna=v['namaPengguna'],
+                    kataSandi=hash_,
+                    nama=v['nama'],
+                    jenisKelamin=v['jenisKelamin'],
+                    tanggalLahir=v['tanggalLahir'],
+                    namaWali=v['namaWali'],
+                    nomorTelepon=v['nomorTelepon'],
+                )
+                for v, hash_ in chunk
+            ])
+            ids = Pasien.objects.filter(
+                namaPengguna__in=[v['namaPengguna'] for v, _ in chunk]
+            ).values_list('id', flat=True)
+            PasienRingkasan.objects.bulk_create([PasienRingkasan(pasien_id=i) for i in ids], ignore_conflicts=True)
+            ubah_total(StatistikTotal.PASIEN, len(chunk))
+        self.berhasil += len(chunk)
+
+
+def impor_pasien_csv(berkas_teks, delimiter=',', proses=None, ukuran_chunk=UKURAN_CHUNK):
+    """
+    Daftarkan pasien dari berkas CSV
+
+    Args:
+        berkas_teks: Objek file teks (dibuka dengan newline='')
+        delimiter: Pemisah kolom
+        proses: Jumlah proses untuk hash kata sandi (bawaan: jumlah CPU)
+        ukuran_chunk: Jumlah pasien per transaksi
+
+    Returns:
+        Dict {'berhasil', 'gagal', 'kredensial', 'durasi_detik'}
+
+    Raises:
+        KesalahanFormatImpor: Header tidak valid
+    """
+    return ImporPasien(ukuran_chunk, proses).jalankan(berkas_teks, delimiter)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from core.referensi import bangun_kurva_referensi
+
+
+class Command(BaseCommand):
+    help = 'Bangun aset statis grafik: kurva referensi SD berversi (JSON)'
+
+    def handle(self, *args, **options):
+        for path in bangun_kurva_referensi():
+            self.stdout.write(f'Kurva referensi: {path}')
+
+        self.stdout.write(self.style.SUCCESS('Aset grafik selesai dibangun'))
@@ -0,0 +1,147 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from SPstunting.sqlite3.base import DEFAULT_PRAGMAS
+
+# Profil yang dibandingkan: bawaan Django vs profil produksi (SPstunting.sqlite3)
+PROFIL = {
+    'bawaan': {
+        'pragmas': {'busy_timeout': 5000, 'journal_mode': 'DELETE'},
+        'transaction_mode': 'DEFERRED',
+        'retry': 1,
+    },
+    'produksi': {
+        'pragmas': DEFAULT_PRAGMAS,
+        'transaction_mode': 'IMMEDIATE',
+        'retry': 3,
+    },
+}
+
+
+def _siapkan_database(path, journal_mode):
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+    conn.executescript("""
+        CREATE TABLE pengukuran (
+            id INTEGER PRIMARY KEY,
+            pasien_id INTEGER NOT NULL,
+            tanggalUkur TEXT NOT NULL,
+            beratBadan REAL NOT NULL,
+            tinggiBadan REAL NOT NULL
+        );
+        CREATE INDEX pengukuran_pasien_tgl ON pengukuran (pasien_id, tanggalUkur);
+        CREATE TABLE notifikasi (
+            id INTEGER PRIMARY KEY,
+            pasien_id INTEGER NOT NULL,
+            jadwal TEXT NOT NULL
+        );
+    """)
+    conn.close()
+
+
+def jalankan_stress(profil, jumlah_thread=8, transaksi_per_thread=100):
+    """
+    Menjalankan beban tulis bersamaan yang meniru input_pengukuran
+    (baca riwayat, tulis pengukuran, tulis notifikasi) terhadap database
+    SQLite sementara dengan profil koneksi tertentu.
+
+    Returns:
+        Dict berisi jumlah transaksi berhasil/gagal, tingkat error dan throughput
+    """
+    konfigurasi = PROFIL[profil]
+    direktori = tempfile.mkdtemp(prefix='spstunting-stress-')
+    path = os.path.join(direktori, 'stress.sqlite3')
+    _siapkan_database(path, konfigurasi['pragmas']['journal_mode'])
+
+    hasil = {'berhasil': 0, 'gagal': 0, 'retry': 0}
+    kunci_hasil = threading.Lock()
+
+    def pekerja(nomor):
+        # isolation_level=None: BEGIN/COMMIT dikendalikan sendiri seperti backend Django
+        conn = sqlite3.connect(path, isolation_level=None)
+        for nama, nilai in konfigurasi['pragmas'].items():
+            conn.execute(f"PRAGMA {nama} = {nilai}")
+        berhasil = gagal = retry = 0
+        for i in range(transaksi_per_thread):
+            pasien_id = nomor * transaksi_per_thread + i
+            for percobaan in range(1, konfigurasi['retry'] + 1):
+                try:
+                    conn.execute(f"BEGIN {konfigurasi['transaction_mode']}")
+                    conn.execute(
+                        "SELECT COUNT(*) FROM pengukuran WHERE pasien_id = ?", (pasien_id,)
+                    ).fetchone()
+                    conn.execute(
+                        "INSERT INTO pengukuran (pasien_id, tanggalUkur, beratBadan, tinggiBadan) "
+                        "VALUES (?, date('now'), 12.5, 85.0)", (pasien_id,)
+                    )
+                    conn.execute(
+                        "INSERT INTO notifikasi (pasien_id, jadwal) VALUES (?, date('now', '+30 day'))",
+                        (pasien_id,)
+                    )
+                    conn.execute("COMMIT")
+                    berhasil += 1
+                    break
+                except sqlite3.OperationalError:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    if percobaan == konfigurasi['retry']:
+                        gagal += 1
+                    else:
+                        retry += 1
+                        time.sleep(0.05 * percobaan)
+        conn.close()
+        with kunci_hasil:
+            hasil['berhasil'] += berhasil
+            hasil['gagal'] += gagal
+            hasil['retry'] += retry
+
+    threads = [threading.Thread(target=pekerja, args=(n,)) for n in range(jumlah_thread)]
+    mulai = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    durasi = time.perf_counter() - mulai
+
+    for akhiran in ('', '-wal', '-shm', '-journal'):
+        if os.path.exists(path + akhiran):
+            os.remove(path + akhiran)
+    os.rmdir(direktori)
+
+    total = hasil['berhasil'] + hasil['gagal']
+    return {
+        'profil': profil,
+        'thread': jumlah_thread,
+        'transaksi': total,
+        'berhasil': hasil['berhasil'],
+        'gagal': hasil['gagal'],
+        'retry': hasil['retry'],
+        'tingkat_error': round(hasil['gagal'] / total, 4) if total else 0.0,
+        'durasi_detik': round(durasi, 3),
+        'throughput_per_detik': round(hasil['berhasil'] / durasi, 1) if durasi else 0.0,
+    }
+
+
+class Command(BaseCommand):
+    help = 'Stress test tulis SQLite bersamaan: bandingkan profil bawaan dengan profil produksi'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Jumlah thread penulis')
+        parser.add_argument('--transaksi', type=int, default=100, help='Transaksi per thread')
+        parser.add_argument(
+            '--profil', choices=sorted(PROFIL), action='append',
+            help='Profil yang dijalankan (bisa diulang, bawaan: semua)'
+        )
+
+    def handle(self, *args, **options):
+        laporan = [
+            jalankan_stress(profil, options['threads'], options['transaksi'])
+            for profil in (options['profil'] or ['bawaan', 'produksi'])
+        ]
+        self.stdout.write(json.dumps(laporan, indent=2))
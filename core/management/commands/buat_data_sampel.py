@@ -0,0 +1,28 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.sample_data import UKURAN_CHUNK_PASIEN, buat_populasi
+
+
+class Command(BaseCommand):
+    help = 'Bangkitkan populasi sintetis (pasien, pengukuran, konsultasi, notifikasi) untuk uji beban'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pasien', type=int, default=1000, help='Jumlah pasien yang dibuat')
+        parser.add_argument('--seed', type=int, help='Seed acak agar populasi dapat direproduksi')
+        parser.add_argument('--chunk', type=int, default=UKURAN_CHUNK_PASIEN, help='Jumlah pasien per transaksi')
+        parser.add_argument('--tanpa-konsultasi', action='store_true', help='Jangan buat konsultasi')
+        parser.add_argument('--tanpa-notifikasi', action='store_true', help='Jangan buat notifikasi')
+
+    def handle(self, *args, **options):
+        if options['pasien'] < 1 or options['chunk'] < 1:
+            raise CommandError('--pasien dan --chunk harus lebih dari 0')
+        hasil = buat_populasi(
+            options['pasien'],
+            seed=options['seed'],
+            chunk_size=options['chunk'],
+            konsultasi=not options['tanpa_konsultasi'],
+            notifikasi=not options['tanpa_notifikasi'],
+        )
+        self.stdout.write(json.dumps(hasil, indent=2))
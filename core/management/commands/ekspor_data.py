@@ -0,0 +1,43 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.ekspor import FORMAT_EKSPOR, JENIS_EKSPOR, UKURAN_CHUNK_EKSPOR, stream_ekspor
+
+
+def _tanggal(nilai):
+    try:
+        return date.fromisoformat(nilai)
+    except ValueError:
+        raise CommandError(f'Tanggal "{nilai}" bukan format YYYY-MM-DD')
+
+
+class Command(BaseCommand):
+    help = 'Ekspor pengukuran atau konsultasi ke CSV/JSONL secara streaming (memori konstan)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('jenis', choices=JENIS_EKSPOR)
+        parser.add_argument('--format', choices=FORMAT_EKSPOR, default='csv')
+        parser.add_argument('--dari', type=_tanggal, help='Tanggal awal (YYYY-MM-DD)')
+        parser.add_argument('--sampai', type=_tanggal, help='Tanggal akhir (YYYY-MM-DD)')
+        parser.add_argument('--kondisi', help='Kode kondisi diagnosa, mis. K01')
+        parser.add_argument('--output', '-o', help='Path berkas keluaran (bawaan: stdout)')
+        parser.add_argument('--chunk', type=int, default=UKURAN_CHUNK_EKSPOR, help='Baris per fetch database')
+
+    def handle(self, *args, **options):
+        potongan = stream_ekspor(
+            options['jenis'],
+            options['format'],
+            dari=options['dari'],
+            sampai=options['sampai'],
+            kondisi=options['kondisi'],
+            chunk_size=options['chunk'],
+        )
+        if not options['output']:
+            for teks in potongan:
+                self.stdout.write(teks, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8', newline='') as keluaran:
+            for teks in potongan:
+                keluaran.write(teks)
+        self.stderr.write(f"Ekspor {options['jenis']} ditulis ke {options['output']}")
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.ringkasan import hitung_ulang_ringkasan
+from core.statistik import hitung_ulang_statistik
+
+
+class Command(BaseCommand):
+    help = 'Hitung ulang statistik dashboard dan ringkasan pasien dari tabel sumber (setelah operasi massal)'
+
+    def handle(self, *args, **options):
+        totals = hitung_ulang_statistik()
+        jumlah_ringkasan = hitung_ulang_ringkasan()
+        for nama, jumlah in totals.items():
+            self.stdout.write(f'{nama}: {jumlah}')
+        self.stdout.write(self.style.SUCCESS(f'Ringkasan diperbarui untuk {jumlah_ringkasan} pasien'))
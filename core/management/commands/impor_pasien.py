@@ -0,0 +1,45 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.impor import KesalahanFormatImpor, impor_pasien_csv
+
+
+class Command(BaseCommand):
+    help = 'Daftarkan pasien dari berkas CSV (hash kata sandi paralel, bulk insert)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('berkas', help='Path berkas CSV')
+        parser.add_argument('--delimiter', default=',', help='Pemisah kolom (mis. ";" untuk ekspor Excel)')
+        parser.add_argument('--proses', type=int, help='Jumlah proses untuk hash kata sandi (bawaan: jumlah CPU)')
+        parser.add_argument('--kredensial', help='Tulis kredensial yang dibuat otomatis ke berkas CSV ini')
+        parser.add_argument('--laporan', help='Tulis laporan baris gagal ke berkas CSV ini')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['berkas'], encoding='utf-8-sig', newline='') as berkas:
+                laporan = impor_pasien_csv(berkas, delimiter=options['delimiter'], proses=options['proses'])
+        except (OSError, KesalahanFormatImpor) as e:
+            raise CommandError(str(e))
+
+        for opsi, kolom, isi in (
+            ('kredensial', ['baris', 'nama', 'nama_pengguna', 'kata_sandi'], laporan['kredensial']),
+            ('laporan', ['baris', 'nama_pengguna', 'pesan'], laporan['gagal']),
+        ):
+            if options[opsi]:
+                with open(options[opsi], 'w', encoding='utf-8', newline='') as keluaran:
+                    writer = csv.DictWriter(keluaran, fieldnames=kolom)
+                    writer.writeheader()
+                    writer.writerows(isi)
+
+        self.stdout.write(json.dumps({
+            'berhasil': laporan['berhasil'],
+            'gagal': len(laporan['gagal']),
+            'kredensial_otomatis': len(laporan['kredensial']),
+            'durasi_detik': laporan['durasi_detik'],
+        }, indent=2))
+        for gagal in laporan['gagal'][:20]:
+            self.stderr.write(f"Baris {gagal['baris']} ({gagal['nama_pengguna']}): {gagal['pesan']}")
+        if laporan['kredensial'] and not options['kredensial']:
+            self.stderr.write('Kredensial otomatis tidak disimpan; gunakan --kredensial untuk menuliskannya.')
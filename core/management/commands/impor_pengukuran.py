@@ -0,0 +1,45 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.impor import KesalahanFormatImpor, UKURAN_CHUNK, impor_pengukuran_csv
+
+
+class Command(BaseCommand):
+    help = 'Impor pengukuran dari berkas CSV posyandu (streaming, bulk, satu transaksi per chunk)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('berkas', help='Path berkas CSV')
+        parser.add_argument('--chunk', type=int, default=UKURAN_CHUNK, help='Jumlah baris per transaksi')
+        parser.add_argument('--delimiter', default=',', help='Pemisah kolom (mis. ";" untuk ekspor Excel)')
+        parser.add_argument('--laporan', help='Tulis laporan baris gagal ke berkas CSV ini')
+        parser.add_argument('--tanpa-notifikasi', action='store_true', help='Jangan buat jadwal pengukuran ulang')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['berkas'], encoding='utf-8-sig', newline='') as berkas:
+                laporan = impor_pengukuran_csv(
+                    berkas,
+                    ukuran_chunk=options['chunk'],
+                    delimiter=options['delimiter'],
+                    buat_notifikasi=not options['tanpa_notifikasi'],
+                )
+        except (OSError, KesalahanFormatImpor, UnicodeDecodeError) as e:
+            raise CommandError(str(e))
+
+        if options['laporan']:
+            with open(options['laporan'], 'w', encoding='utf-8', newline='') as keluaran:
+                writer = csv.DictWriter(keluaran, fieldnames=['baris', 'nama_pengguna', 'pesan'])
+                writer.writeheader()
+                writer.writerows(laporan['gagal'])
+
+        ringkas = {k: v for k, v in laporan.items() if k != 'gagal'}
+        ringkas['gagal'] = len(laporan['gagal'])
+        self.stdout.write(json.dumps(ringkas, indent=2))
+        for gagal in laporan['gagal'][:20]:
+            self.stderr.write(f"Baris {gagal['baris']} ({gagal['nama_pengguna']}): {gagal['pesan']}")
+        if laporan['berhenti_di_baris']:
+            self.stderr.write(
+                f"Pembacaan berhenti di baris {laporan['berhenti_di_baris']}: {laporan['pesan_berhenti']}"
+            )
@@ -0,0 +1,38 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.uji_beban import SKENARIO, KesalahanUjiBeban, jalankan_uji_beban
+
+
+class Command(BaseCommand):
+    help = 'Uji beban alur pasien/pakar dengan banyak pengguna virtual; laporan latensi per endpoint (JSON)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skenario', choices=sorted(SKENARIO), action='append',
+            help='Skenario yang dijalankan (bisa diulang, bawaan: skenario pasien)'
+        )
+        parser.add_argument('--pengguna', type=int, default=8, help='Jumlah pengguna virtual (thread)')
+        parser.add_argument('--iterasi', type=int, default=10, help='Pengulangan skenario per pengguna')
+        parser.add_argument('--pakar', help='Nama pengguna akun pakar (skenario pakar)')
+        parser.add_argument('--sandi-pakar', help='Kata sandi akun pakar')
+        parser.add_argument('--seed', type=int, help='Seed acak pemilihan pasien dan gejala')
+        parser.add_argument('--jeda', type=float, default=0.0, help='Jeda antar iterasi (detik)')
+
+    def handle(self, *args, **options):
+        if options['pengguna'] < 1 or options['iterasi'] < 1:
+            raise CommandError('--pengguna dan --iterasi harus lebih dari 0')
+        pakar = (options['pakar'], options['sandi_pakar'] or '') if options['pakar'] else None
+        try:
+            laporan = jalankan_uji_beban(
+                options['skenario'] or ['pasien_diagnosa', 'pasien_pengukuran'],
+                jumlah_pengguna=options['pengguna'],
+                iterasi=options['iterasi'],
+                pakar=pakar,
+                seed=options['seed'],
+                jeda=options['jeda'],
+            )
+        except KesalahanUjiBeban as e:
+            raise CommandError(str(e))
+        self.stdout.write(json.dumps(laporan, indent=2))
@@ -0,0 +1,86 @@
+"""
+Middleware pasien: memasang request.pasien yang dievaluasi secara malas.
+
+Pasien login lewat sesi (pasien_id), bukan django.contrib.auth, sehingga
+sebelumnya setiap view pasien mengulang Pasien.objects.get(id=...) beserta
+penanganan errornya. PasienMiddleware memasang:
+
+- request.pasien: objek Pasien yang baru diambil saat pertama kali dipakai,
+  paling banyak sekali per request, dan disimpan di cache dengan TTL pendek
+  (PASIEN_CACHE_TIMEOUT). Cache dibuang oleh signal saat Pasien disimpan
+  atau dihapus. Bernilai falsy bila belum login atau pasiennya sudah dihapus.
+
+Sesi baru dibaca saat request.pasien atau pasien_id_sesi() dipakai. Middleware
+sendiri tidak menyentuh sesi, sehingga respons yang tidak memakainya (API publik,
+kurva referensi) tidak mendapat header Vary: Cookie dan tetap dapat di-cache.
+
+Objek dari cache boleh dipakai untuk tampilan; untuk penulisan ambil ulang
+dari database agar tidak menimpa perubahan dari proses lain.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import redirect
+from django.utils.functional import SimpleLazyObject
+
+from .models import Pasien
+
+PASIEN_CACHE_TIMEOUT = getattr(settings, 'PASIEN_CACHE_TIMEOUT', 300)
+
+
+def kunci_cache_pasien(pasien_id):
+    return f'core:pasien:{pasien_id}'
+
+
+def hapus_cache_pasien(pasien_id):
+    cache.delete(kunci_cache_pasien(pasien_id))
+
+
+def pasien_id_sesi(request):
+    """ID pasien yang login menurut sesi (tanpa query), atau None"""
+    return request.session.get('pasien_id')
+
+
+def ambil_pasien_sesi(request):
+    """
+    Pasien yang sedang login berdasarkan sesi, lewat cache
+
+    Returns:
+        Objek Pasien, atau None bila belum login / pasien tidak ditemukan
+    """
+    pasien_id = pasien_id_sesi(request)
+    if pasien_id is None:
+        return None
+    kunci = kunci_cache_pasien(pasien_id)
+    pasien = cache.get(kunci)
+    if pasien is None:
+        pasien = Pasien.objects.filter(id=pasien_id).first()
+        if pasien is not None:
+            cache.set(kunci, pasien, PASIEN_CACHE_TIMEOUT)
+    return pasien
+
+
+class PasienMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.pasien = SimpleLazyObject(lambda: ambil_pasien_sesi(request))
+        return self.get_response(request)
+
+
+def pasien_required(view_func):
+    """
+    Decorator view pasien: arahkan ke login bila belum login, dan hapus sesi
+    bila pasien di sesi sudah tidak ada di database
+    """
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        if pasien_id_sesi(request) is None:
+            return redirect('login_pasien')
+        if not request.pasien:
+            request.session.flush()
+            return redirect('login_pasien')
+        return view_func(request, *args, **kwargs)
+    return _wrapped
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.27 on 2026-10-19 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_pengukuranfisik_imunisasi_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aturan',
+            index=models.Index(fields=['kodeKelompokAturan'], name='aturan_kelompok_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aturan',
+            index=models.Index(fields=['kondisi', 'kodeKelompokAturan'], name='aturan_kondisi_kelompok_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='konsultasi',
+            index=models.Index(fields=['pasien', '-tanggalKonsultasi'], name='konsultasi_pasien_tgl_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='konsultasi',
+            index=models.Index(fields=['tanggalKonsultasi'], name='konsultasi_tgl_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notifikasi',
+            index=models.Index(condition=models.Q(('sudahTerkirim', False)), fields=['jadwalNotifikasi'], name='notifikasi_jatuh_tempo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notifikasi',
+            index=models.Index(fields=['pasien', '-jadwalNotifikasi'], name='notifikasi_pasien_jadwal_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pasien',
+            index=models.Index(fields=['nama'], name='pasien_nama_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pengukuranfisik',
+            index=models.Index(fields=['pasien', 'tanggalUkur'], name='pengukuran_pasien_tgl_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pengukuranfisik',
+            index=models.Index(fields=['tanggalUkur'], name='pengukuran_tgl_idx'),
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 4.2.27 on 2026-10-19 11:05
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+UKURAN_BATCH = 1000
+
+
+def _status_pertumbuhan(z_tb_u):
+    # Salinan PasienRingkasan.status_dari_zscore (model historis tidak punya method)
+    if z_tb_u is None:
+        return 'belum_diukur'
+    if z_tb_u <= -3:
+        return 'stunting'
+    if z_tb_u <= -2:
+        return 'risiko'
+    return 'normal'
+
+
+def isi_ringkasan_awal(apps, schema_editor):
+    # Isi ringkasan untuk pasien yang sudah ada (model historis, bukan core.ringkasan).
+    # Seperti ringkasan.hitung_ulang_ringkasan: satu query beranotasi per batch pasien.
+    Pasien = apps.get_model('core', 'Pasien')
+    PasienRingkasan = apps.get_model('core', 'PasienRingkasan')
+    PengukuranFisik = apps.get_model('core', 'PengukuranFisik')
+    Konsultasi = apps.get_model('core', 'Konsultasi')
+
+    pengukuran_terakhir = PengukuranFisik.objects.filter(
+        pasien_id=OuterRef('pk')
+    ).order_by('-tanggalUkur', '-id')
+    konsultasi_terakhir = Konsultasi.objects.filter(
+        pasien_id=OuterRef('pk')
+    ).order_by('-tanggalKonsultasi')
+    jumlah_pengukuran = (
+        PengukuranFisik.objects.filter(pasien_id=OuterRef('pk'))
+        .order_by().values('pasien_id').annotate(n=Count('id')).values('n')
+    )
+
+    pasien_ids = Pasien.objects.order_by('id').values_list('id', flat=True)
+    batch = list(pasien_ids[:UKURAN_BATCH])
+    while batch:
+        baris = (
+            Pasien.objects.filter(id__in=batch)
+            .annotate(
+                jumlah=Coalesce(Subquery(jumlah_pengukuran, output_field=IntegerField()), 0),
+                tgl_ukur=Subquery(pengukuran_terakhir.values('tanggalUkur')[:1]),
+                z_bb_u=Subquery(pengukuran_terakhir.values('skor_Z_BB_U')[:1]),
+                z_tb_u=Subquery(pengukuran_terakhir.values('skor_Z_TB_U')[:1]),
+                tgl_konsultasi=Subquery(konsultasi_terakhir.values('tanggalKonsultasi')[:1]),
+                hasil_kondisi=Subquery(konsultasi_terakhir.values('hasilKondisi_id')[:1]),
+            )
+            .values('id', 'jumlah', 'tgl_ukur', 'z_bb_u', 'z_tb_u', 'tgl_konsultasi', 'hasil_kondisi')
+        )
+        PasienRingkasan.objects.bulk_create([
+            PasienRingkasan(
+                pasien_id=b['id'],
+                jumlahPengukuran=b['jumlah'],
+                tanggalUkurTerakhir=b['tgl_ukur'],
+                skor_Z_BB_U=b['z_bb_u'],
+                skor_Z_TB_U=b['z_tb_u'],
+                statusPertumbuhan=_status_pertumbuhan(b['z_tb_u']),
+                tanggalKonsultasiTerakhir=b['tgl_konsultasi'],
+                hasilKondisiTerakhir_id=b['hasil_kondisi'],
+            )
+            for b in baris
+        ])
+        # Keyset per id: batch berikutnya tidak bergantung pada OFFSET
+        batch = list(pasien_ids.filter(id__gt=batch[-1])[:UKURAN_BATCH])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_indeks_pola_query'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PasienRingkasan',
+            fields=[
+                ('pasien', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ringkasan', serialize=False, to='core.pasien')),
+                ('tanggalUkurTerakhir', models.DateField(blank=True, null=True, verbose_name='Tanggal Ukur Terakhir')),
+                ('skor_Z_BB_U', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name='Z-Score BB/U Terakhir')),
+                ('skor_Z_TB_U', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name='Z-Score TB/U Terakhir')),
+                ('jumlahPengukuran', models.PositiveIntegerField(default=0, verbose_name='Jumlah Pengukuran')),
+                ('statusPertumbuhan', models.CharField(choices=[('belum_diukur', 'Belum Diukur'), ('normal', 'Normal'), ('risiko', 'Risiko Stunting'), ('stunting', 'Stunting')], default='belum_diukur', max_length=20, verbose_name='Status Pertumbuhan')),
+                ('tanggalKonsultasiTerakhir', models.DateTimeField(blank=True, null=True, verbose_name='Konsultasi Terakhir')),
+                ('diperbarui', models.DateTimeField(auto_now=True)),
+                ('hasilKondisiTerakhir', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.kondisi', verbose_name='Diagnosa Terakhir')),
+            ],
+            options={
+                'verbose_name_plural': 'Ringkasan Pasien',
+                'indexes': [models.Index(fields=['statusPertumbuhan', 'skor_Z_TB_U'], name='ringkasan_status_ztbu_idx'), models.Index(fields=['statusPertumbuhan', '-tanggalUkurTerakhir'], name='ringkasan_status_tgl_idx'), models.Index(fields=['skor_Z_TB_U'], name='ringkasan_ztbu_idx'), models.Index(fields=['-tanggalUkurTerakhir'], name='ringkasan_tgl_idx')],
+            },
+        ),
+        migrations.RunPython(isi_ringkasan_awal, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.27 on 2026-10-19 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_pasien_ringkasan'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='pengukuranfisik',
+            name='pengukuran_tgl_idx',
+        ),
+        migrations.AddIndex(
+            model_name='pengukuranfisik',
+            index=models.Index(fields=['-tanggalUkur', 'id'], name='pengukuran_tgl_id_idx'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.27 on 2026-10-19 11:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def isi_statistik_awal(apps, schema_editor):
+    # Isi counter & rollup dari data yang sudah ada (model historis, bukan core.statistik)
+    StatistikTotal = apps.get_model('core', 'StatistikTotal')
+    StatistikHarian = apps.get_model('core', 'StatistikHarian')
+    Konsultasi = apps.get_model('core', 'Konsultasi')
+    PengukuranFisik = apps.get_model('core', 'PengukuranFisik')
+
+    StatistikTotal.objects.bulk_create([
+        StatistikTotal(nama=nama.lower(), jumlah=apps.get_model('core', nama).objects.count())
+        for nama in ('Pasien', 'Konsultasi', 'Gejala', 'Kondisi', 'Aturan')
+    ])
+    konsultasi = (
+        Konsultasi.objects.annotate(tanggal=TruncDate('tanggalKonsultasi'))
+        .values('tanggal', 'hasilKondisi_id').annotate(n=Count('id')).order_by()
+    )
+    pengukuran = PengukuranFisik.objects.values('tanggalUkur').annotate(n=Count('id')).order_by()
+    StatistikHarian.objects.bulk_create([
+        StatistikHarian(tanggal=k['tanggal'], jenis='konsultasi', kondisi_id=k['hasilKondisi_id'], jumlah=k['n'])
+        for k in konsultasi
+    ] + [
+        StatistikHarian(tanggal=p['tanggalUkur'], jenis='pengukuran', jumlah=p['n'])
+        for p in pengukuran
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_indeks_paginasi_keyset'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatistikTotal',
+            fields=[
+                ('nama', models.CharField(choices=[('pasien', 'Pasien'), ('konsultasi', 'Konsultasi'), ('gejala', 'Gejala'), ('kondisi', 'Kondisi'), ('aturan', 'Aturan')], max_length=20, primary_key=True, serialize=False)),
+                ('jumlah', models.BigIntegerField(default=0)),
+                ('diperbarui', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Statistik Total',
+            },
+        ),
+        migrations.CreateModel(
+            name='StatistikHarian',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tanggal', models.DateField()),
+                ('jenis', models.CharField(choices=[('konsultasi', 'Konsultasi'), ('pengukuran', 'Pengukuran')], max_length=20)),
+                ('jumlah', models.IntegerField(default=0)),
+                ('kondisi', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.kondisi')),
+            ],
+            options={
+                'verbose_name_plural': 'Statistik Harian',
+                'indexes': [models.Index(fields=['jenis', 'tanggal'], name='statistik_harian_jenis_tgl_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='statistikharian',
+            constraint=models.UniqueConstraint(condition=models.Q(('kondisi__isnull', False)), fields=('tanggal', 'jenis', 'kondisi'), name='statistik_harian_kondisi_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='statistikharian',
+            constraint=models.UniqueConstraint(condition=models.Q(('kondisi__isnull', True)), fields=('tanggal', 'jenis'), name='statistik_harian_tanpa_kondisi_uniq'),
+        ),
+        migrations.RunPython(isi_statistik_awal, migrations.RunPython.noop),
+    ]
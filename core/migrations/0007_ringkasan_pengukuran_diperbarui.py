@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-19 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_statistik_dashboard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pasienringkasan',
+            name='pengukuranDiperbarui',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.27 on 2026-10-19 11:29
+
+from django.db import migrations, models
+
+
+def buat_baris_versi(apps, schema_editor):
+    apps.get_model('core', 'VersiBasisPengetahuan').objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_ringkasan_pengukuran_diperbarui'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersiBasisPengetahuan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('versi', models.PositiveBigIntegerField(default=1)),
+                ('diperbarui', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Versi Basis Pengetahuan',
+            },
+        ),
+        migrations.RunPython(buat_baris_versi, migrations.RunPython.noop),
+    ]
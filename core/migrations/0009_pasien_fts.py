@@ -0,0 +1,66 @@
+# Tabel FTS5 pencarian pasien (lihat core/pencarian.py)
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+KOLOM = 'nama, namaPengguna, namaWali'
+
+BUAT = [
+    f"""CREATE VIRTUAL TABLE core_pasien_fts USING fts5(
+        {KOLOM}, content='core_pasien', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER core_pasien_fts_ai AFTER INSERT ON core_pasien BEGIN
+        INSERT INTO core_pasien_fts(rowid, {KOLOM}) VALUES (new.id, new.nama, new.namaPengguna, new.namaWali);
+    END""",
+    f"""CREATE TRIGGER core_pasien_fts_ad AFTER DELETE ON core_pasien BEGIN
+        INSERT INTO core_pasien_fts(core_pasien_fts, rowid, {KOLOM})
+        VALUES ('delete', old.id, old.nama, old.namaPengguna, old.namaWali);
+    END""",
+    f"""CREATE TRIGGER core_pasien_fts_au AFTER UPDATE OF {KOLOM} ON core_pasien BEGIN
+        INSERT INTO core_pasien_fts(core_pasien_fts, rowid, {KOLOM})
+        VALUES ('delete', old.id, old.nama, old.namaPengguna, old.namaWali);
+        INSERT INTO core_pasien_fts(rowid, {KOLOM}) VALUES (new.id, new.nama, new.namaPengguna, new.namaWali);
+    END""",
+    # Indeks awal dari baris pasien yang sudah ada
+    "INSERT INTO core_pasien_fts(core_pasien_fts) VALUES ('rebuild')",
+]
+
+HAPUS = [
+    'DROP TRIGGER IF EXISTS core_pasien_fts_au',
+    'DROP TRIGGER IF EXISTS core_pasien_fts_ad',
+    'DROP TRIGGER IF EXISTS core_pasien_fts_ai',
+    'DROP TABLE IF EXISTS core_pasien_fts',
+]
+
+
+def buat_fts(apps, schema_editor):
+    # Hanya SQLite; tanpa modul FTS5 pencarian memakai LIKE (core.pencarian)
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute(BUAT[0])
+        except OperationalError:
+            return
+        for sql in BUAT[1:]:
+            cursor.execute(sql)
+
+
+def hapus_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for sql in HAPUS:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_versi_basis_pengetahuan'),
+    ]
+
+    operations = [
+        migrations.RunPython(buat_fts, hapus_fts),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-19 12:41
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_pasien_fts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pasien',
+            index=models.Index(django.db.models.functions.comparison.Collate('nama', 'NOCASE'), name='pasien_nama_ci_idx'),
+        ),
+    ]
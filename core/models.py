@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User # Model Pengguna bawaan Django (untuk Admin/Pakar)
 from django.db.models.signals import post_save
+from django.db.models.functions import Collate
 from django.dispatch import receiver
 from django.contrib.auth.hashers import make_password, check_password
 
@@ -26,6 +27,13 @@ class Pasien(models.Model):
 
     class Meta:
         verbose_name_plural = "Pasien"
+        indexes = [
+            # Daftar pasien pakar diurutkan berdasarkan nama
+            models.Index(fields=['nama'], name='pasien_nama_idx'),
+            # Filter awalan nama (nama__istartswith = LIKE 'x%' tanpa beda huruf besar/kecil):
+            # optimasi LIKE SQLite hanya memakai indeks ber-collation NOCASE
+            models.Index(Collate('nama', 'NOCASE'), name='pasien_nama_ci_idx'),
+        ]
 
     def __str__(self):
         return f"Pasien: {self.nama} ({self.namaPengguna})"
@@ -80,9 +88,16 @@ class Aturan(models.Model):
         # Memastikan tidak ada duplikasi Gejala dalam satu KelompokAturan Kondisi tertentu
         unique_together = ('kondisi', 'gejala', 'kodeKelompokAturan')
         verbose_name_plural = "Aturan Basis Pengetahuan"
+        indexes = [
+            # Pengelompokan aturan (daftar aturan & mesin inferensi)
+            models.Index(fields=['kodeKelompokAturan'], name='aturan_kelompok_idx'),
+            # Detail/edit aturan per kondisi, diurutkan per kelompok
+            models.Index(fields=['kondisi', 'kodeKelompokAturan'], name='aturan_kondisi_kelompok_idx'),
+        ]
 
     def __str__(self):
-        return f"Aturan {self.kodeKelompokAturan}: JIKA {self.gejala.kodeGejala} MAKA {self.kondisi.kodeKondisi}"
+        # *_id berisi kode gejala/kondisi (primary key), tanpa query ke tabel terkait
+        return f"Aturan {self.kodeKelompokAturan}: JIKA {self.gejala_id} MAKA {self.kondisi_id}"
 
 ## =======================================================
 ## 3. PENCATATAN KONSULTASI (Input/Output Mesin Inferensi)
@@ -97,6 +112,11 @@ class Konsultasi(models.Model):
 
     class Meta:
         verbose_name_plural = "Konsultasi"
+        indexes = [
+            # Riwayat konsultasi per pasien, terbaru lebih dulu
+            models.Index(fields=['pasien', '-tanggalKonsultasi'], name='konsultasi_pasien_tgl_idx'),
+            models.Index(fields=['tanggalKonsultasi'], name='konsultasi_tgl_idx'),
+        ]
 
     def __str__(self):
         return f"Konsultasi {self.id} oleh {self.pasien.nama} ({self.tanggalKonsultasi.date()})"
@@ -111,7 +131,7 @@ class DetailKonsultasi(models.Model):
         verbose_name_plural = "Detail Konsultasi"
 
     def __str__(self):
-        return f"Konsultasi {self.konsultasi.id} - Gejala: {self.gejala.kodeGejala}"
+        return f"Konsultasi {self.konsultasi_id} - Gejala: {self.gejala_id}"
 
 ## =======================================================
 ## 4. PENGUKURAN FISIK & GRAFIK (Data Stunting)
@@ -136,6 +156,12 @@ class PengukuranFisik(models.Model):
     class Meta:
         ordering = ['tanggalUkur']
         verbose_name_plural = "Pengukuran Fisik"
+        indexes = [
+            # Riwayat pengukuran per pasien (grafik, input pengukuran, detail pasien)
+            models.Index(fields=['pasien', 'tanggalUkur'], name='pengukuran_pasien_tgl_idx'),
+            # Daftar pengukuran pakar (paginasi keyset pada -tanggalUkur, id)
+            models.Index(fields=['-tanggalUkur', 'id'], name='pengukuran_tgl_id_idx'),
+        ]
     
     def __str__(self):
         return f"Pengukuran {self.pasien.nama} pada {self.tanggalUkur}"
@@ -156,6 +182,159 @@ class Notifikasi(models.Model):
     class Meta:
         ordering = ['-jadwalNotifikasi']
         verbose_name_plural = "Notifikasi"
+        indexes = [
+            # Notifikasi yang jatuh tempo dan belum terkirim (indeks parsial)
+            models.Index(
+                fields=['jadwalNotifikasi'],
+                name='notifikasi_jatuh_tempo_idx',
+                condition=models.Q(sudahTerkirim=False),
+            ),
+            models.Index(fields=['pasien', '-jadwalNotifikasi'], name='notifikasi_pasien_jadwal_idx'),
+        ]
 
     def __str__(self):
-        return f"Notif untuk {self.pasien.nama}: {self.judul}"
\ No newline at end of file
+        return f"Notif untuk {self.pasien.nama}: {self.judul}"
+
+## =======================================================
+## 6. RINGKASAN PASIEN (Denormalisasi untuk daftar pasien)
+## =======================================================
+
+class PasienRingkasan(models.Model):
+    # Ringkasan pertumbuhan terakhir per pasien, dipelihara oleh signal (core/signals.py)
+    # saat PengukuranFisik / Konsultasi disimpan atau dihapus.
+    STATUS_BELUM_DIUKUR = 'belum_diukur'
+    STATUS_NORMAL = 'normal'
+    STATUS_RISIKO = 'risiko'
+    STATUS_STUNTING = 'stunting'
+    STATUS_CHOICES = [
+        (STATUS_BELUM_DIUKUR, 'Belum Diukur'),
+        (STATUS_NORMAL, 'Normal'),
+        (STATUS_RISIKO, 'Risiko Stunting'),
+        (STATUS_STUNTING, 'Stunting'),
+    ]
+
+    pasien = models.OneToOneField(Pasien, on_delete=models.CASCADE, primary_key=True, related_name='ringkasan')
+
+    # Pengukuran terakhir
+    tanggalUkurTerakhir = models.DateField(null=True, blank=True, verbose_name="Tanggal Ukur Terakhir")
+    skor_Z_BB_U = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, verbose_name="Z-Score BB/U Terakhir")
+    skor_Z_TB_U = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, verbose_name="Z-Score TB/U Terakhir")
+    jumlahPengukuran = models.PositiveIntegerField(default=0, verbose_name="Jumlah Pengukuran")
+    statusPertumbuhan = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_BELUM_DIUKUR, verbose_name="Status Pertumbuhan")
+
+    # Konsultasi terakhir
+    tanggalKonsultasiTerakhir = models.DateTimeField(null=True, blank=True, verbose_name="Konsultasi Terakhir")
+    hasilKondisiTerakhir = models.ForeignKey(Kondisi, on_delete=models.SET_NULL, null=True, blank=True, related_name='+', verbose_name="Diagnosa Terakhir")
+
+    diperbarui = models.DateTimeField(auto_now=True)
+    # Waktu terakhir data pengukuran pasien berubah; validator cache data grafik (ETag/Last-Modified)
+    pengukuranDiperbarui = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = "Ringkasan Pasien"
+        indexes = [
+            # Filter status lalu urutkan berdasarkan Z-Score / tanggal ukur terakhir
+            models.Index(fields=['statusPertumbuhan', 'skor_Z_TB_U'], name='ringkasan_status_ztbu_idx'),
+            models.Index(fields=['statusPertumbuhan', '-tanggalUkurTerakhir'], name='ringkasan_status_tgl_idx'),
+            models.Index(fields=['skor_Z_TB_U'], name='ringkasan_ztbu_idx'),
+            models.Index(fields=['-tanggalUkurTerakhir'], name='ringkasan_tgl_idx'),
+        ]
+
+    def __str__(self):
+        return f"Ringkasan pasien {self.pasien_id}: {self.get_statusPertumbuhan_display()}"
+
+    @classmethod
+    def status_dari_zscore(cls, skor_z_tb_u):
+        """Klasifikasi status berdasarkan Z-Score TB/U (sesuai keterangan grafik WHO)"""
+        if skor_z_tb_u is None:
+            return cls.STATUS_BELUM_DIUKUR
+        if skor_z_tb_u <= -3:
+            return cls.STATUS_STUNTING
+        if skor_z_tb_u <= -2:
+            return cls.STATUS_RISIKO
+        return cls.STATUS_NORMAL
+
+
+## =======================================================
+## 7. STATISTIK DASHBOARD (Counter & Rollup Harian)
+## =======================================================
+
+class StatistikTotal(models.Model):
+    # Satu baris per entitas yang dihitung di dashboard pakar, dipelihara oleh signal
+    # (core/signals.py) saat data dibuat/dihapus. Lihat core/statistik.py.
+    PASIEN = 'pasien'
+    KONSULTASI = 'konsultasi'
+    GEJALA = 'gejala'
+    KONDISI = 'kondisi'
+    ATURAN = 'aturan'
+    NAMA_CHOICES = [
+        (PASIEN, 'Pasien'),
+        (KONSULTASI, 'Konsultasi'),
+        (GEJALA, 'Gejala'),
+        (KONDISI, 'Kondisi'),
+        (ATURAN, 'Aturan'),
+    ]
+
+    nama = models.CharField(max_length=20, choices=NAMA_CHOICES, primary_key=True)
+    jumlah = models.BigIntegerField(default=0)
+    diperbarui = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Statistik Total"
+
+    def __str__(self):
+        return f"{self.get_nama_display()}: {self.jumlah}"
+
+
+class StatistikHarian(models.Model):
+    # Rollup harian: konsultasi per hasil diagnosa dan pengukuran baru per tanggal ukur.
+    # Konsultasi tanpa hasil diagnosa disimpan dengan kondisi NULL.
+    JENIS_KONSULTASI = 'konsultasi'
+    JENIS_PENGUKURAN = 'pengukuran'
+    JENIS_CHOICES = [
+        (JENIS_KONSULTASI, 'Konsultasi'),
+        (JENIS_PENGUKURAN, 'Pengukuran'),
+    ]
+
+    tanggal = models.DateField()
+    jenis = models.CharField(max_length=20, choices=JENIS_CHOICES)
+    kondisi = models.ForeignKey(Kondisi, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    jumlah = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "Statistik Harian"
+        constraints = [
+            # NULL tidak dianggap sama oleh UNIQUE, jadi baris tanpa kondisi diberi constraint sendiri
+            models.UniqueConstraint(
+                fields=['tanggal', 'jenis', 'kondisi'], condition=models.Q(kondisi__isnull=False),
+                name='statistik_harian_kondisi_uniq'
+            ),
+            models.UniqueConstraint(
+                fields=['tanggal', 'jenis'], condition=models.Q(kondisi__isnull=True),
+                name='statistik_harian_tanpa_kondisi_uniq'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['jenis', 'tanggal'], name='statistik_harian_jenis_tgl_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tanggal} {self.jenis} ({self.kondisi_id or '-'}): {self.jumlah}"
+
+
+## =======================================================
+## 8. VERSI BASIS PENGETAHUAN
+## =======================================================
+
+class VersiBasisPengetahuan(models.Model):
+    # Satu baris (pk=1). Versi dinaikkan sekali setiap perubahan Gejala/Kondisi/Aturan
+    # (lihat core/versi_kb.py), sehingga cache yang bergantung pada basis pengetahuan
+    # cukup memakai versi ini sebagai bagian kuncinya.
+    versi = models.PositiveBigIntegerField(default=1)
+    diperbarui = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Versi Basis Pengetahuan"
+
+    def __str__(self):
+        return f"Basis pengetahuan v{self.versi}"
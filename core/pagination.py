@@ -0,0 +1,220 @@
+"""
+Paginasi keyset (cursor) untuk daftar pakar, dan PaginatorEstimasi untuk
+changelist admin tabel besar.
+
+Berbeda dengan OFFSET/LIMIT, halaman berikutnya diambil dengan kondisi
+"setelah baris terakhir" pada kunci urut, misalnya untuk ('-tanggalUkur', 'id'):
+
+    WHERE tanggalUkur < :tgl OR (tanggalUkur = :tgl AND id > :id)
+    ORDER BY tanggalUkur DESC, id ASC LIMIT :n
+
+sehingga biaya satu halaman tetap sama di halaman berapa pun, selama ada
+indeks yang cocok dengan urutannya. Kunci urut terakhir harus unik (id/pk).
+
+Nilai NULL diperlakukan seperti SQLite: NULL lebih kecil dari nilai apa pun
+(muncul pertama pada urutan naik, terakhir pada urutan turun).
+"""
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.paginator import Paginator
+from django.db.models import Max, Q
+from django.utils.functional import cached_property
+
+DEFAULT_PER_PAGE = 50
+
+# Di bawah perkiraan ini PaginatorEstimasi tetap menghitung jumlah baris secara pasti
+BATAS_HITUNG_PASTI = 10000
+
+
+class KeysetPage:
+    """Satu halaman hasil paginasi keyset beserta cursor navigasinya"""
+
+    def __init__(self, object_list, next_cursor, previous_cursor, query_params):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self._query_params = query_params
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def _query_string(self, cursor):
+        params = self._query_params.copy()
+        params.pop('cursor', None)
+        if cursor is not None:
+            params['cursor'] = cursor
+        return '?' + params.urlencode()
+
+    @property
+    def next_query(self):
+        return self._query_string(self.next_cursor)
+
+    @property
+    def previous_query(self):
+        return self._query_string(self.previous_cursor)
+
+    @property
+    def first_query(self):
+        return self._query_string(None)
+
+
+def _encode_cursor(values, direction):
+    data = json.dumps({'v': values, 'd': direction}, default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor, fields):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values, direction = data['v'], data['d']
+        if direction not in ('n', 'p') or len(values) != len(fields):
+            return None, 'n'
+        return [None if v is None else field.to_python(v) for v, field in zip(values, fields)], direction
+    except (ValueError, KeyError, TypeError):
+        # Cursor rusak/kedaluwarsa: mulai dari halaman pertama
+        return None, 'n'
+
+
+def _resolve_field(model, path):
+    field = None
+    for part in path.split('__'):
+        field = model._meta.get_field(part)
+        model = field.related_model
+    return field
+
+
+def _row_value(obj, path):
+    for part in path.split('__'):
+        obj = getattr(obj, part, None) if obj is not None else None
+    return obj
+
+
+def _after(name, descending, value):
+    """Kondisi baris yang berada setelah `value` pada satu kunci urut"""
+    if descending:
+        if value is None:
+            return None  # NULL paling akhir pada urutan turun
+        return Q(**{f'{name}__lt': value}) | Q(**{f'{name}__isnull': True})
+    if value is None:
+        return Q(**{f'{name}__isnull': False})
+    return Q(**{f'{name}__gt': value})
+
+
+def _equal(name, value):
+    if value is None:
+        return Q(**{f'{name}__isnull': True})
+    return Q(**{name: value})
+
+
+def _keyset_filter(keys, values):
+    kondisi = []
+    for i, (name, descending) in enumerate(keys):
+        setelah = _after(name, descending, values[i])
+        if setelah is None:
+            continue
+        for j, (prev_name, _) in enumerate(keys[:i]):
+            setelah &= _equal(prev_name, values[j])
+        kondisi.append(setelah)
+    return reduce(or_, kondisi) if kondisi else Q(pk__in=[])
+
+
+def keyset_paginate(request, queryset, ordering, per_page=DEFAULT_PER_PAGE):
+    """
+    Ambil satu halaman `queryset` berdasarkan cursor di request.GET['cursor']
+
+    Args:
+        request: HttpRequest (cursor dan filter lain dibaca dari query string)
+        queryset: QuerySet yang sudah difilter
+        ordering: Tuple kunci urut, misalnya ('-tanggalUkur', 'id'); kunci terakhir harus unik
+        per_page: Jumlah baris per halaman
+
+    Returns:
+        KeysetPage
+    """
+    keys = [(o.lstrip('-'), o.startswith('-')) for o in ordering]
+    fields = [_resolve_field(queryset.model, name) for name, _ in keys]
+    values, direction = (None, 'n')
+    if request.GET.get('cursor'):
+        values, direction = _decode_cursor(request.GET['cursor'], fields)
+
+    if direction == 'p' and values is not None:
+        # Halaman sebelumnya: balik arah urutan, ambil lalu balik lagi hasilnya
+        mundur = [(name, not descending) for name, descending in keys]
+        qs = queryset.filter(_keyset_filter(mundur, values)).order_by(
+            *[('-' if d else '') + n for n, d in mundur]
+        )
+        rows = list(qs[:per_page + 1])
+        ada_sebelumnya = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        ada_berikutnya = True
+    else:
+        qs = queryset
+        if values is not None:
+            qs = qs.filter(_keyset_filter(keys, values))
+        rows = list(qs.order_by(*ordering)[:per_page + 1])
+        ada_berikutnya = len(rows) > per_page
+        rows = rows[:per_page]
+        ada_sebelumnya = values is not None
+
+    def cursor_untuk(obj, arah):
+        return _encode_cursor([_row_value(obj, name) for name, _ in keys], arah)
+
+    next_cursor = cursor_untuk(rows[-1], 'n') if rows and ada_berikutnya else None
+    previous_cursor = cursor_untuk(rows[0], 'p') if rows and ada_sebelumnya else None
+    return KeysetPage(rows, next_cursor, previous_cursor, request.GET)
+
+
+def perkiraan_jumlah_baris(queryset):
+    """
+    Perkiraan jumlah baris queryset tanpa filter dari id terbesar
+
+    MAX(id) diambil dari ujung indeks primary key (satu lookup), sedangkan
+    COUNT(*) di SQLite memindai seluruh tabel. Meleset ke atas sebanyak baris
+    yang sudah dihapus.
+
+    Returns:
+        Jumlah perkiraan, atau None bila queryset difilter / pk bukan integer
+    """
+    query = queryset.query
+    if query.where or query.distinct or query.is_sliced or query.combinator:
+        return None
+    if query.get_meta().pk.get_internal_type() not in ('AutoField', 'BigAutoField'):
+        return None
+    return queryset.order_by().aggregate(maks=Max('pk'))['maks'] or 0
+
+
+class PaginatorEstimasi(Paginator):
+    """
+    Paginator changelist admin yang tidak menghitung ulang tabel besar
+
+    Tanpa filter, jumlah baris (dan jumlah halaman) diperkirakan dengan
+    perkiraan_jumlah_baris; halaman terakhir bisa lebih pendek dari perkiraan.
+    Dengan filter, atau bila perkiraannya kecil, dihitung pasti seperti Paginator.
+    Pakai bersama show_full_result_count = False agar admin tidak menjalankan
+    COUNT(*) tambahan untuk teks "dari N total".
+    """
+
+    @cached_property
+    def count(self):
+        perkiraan = perkiraan_jumlah_baris(self.object_list) if hasattr(self.object_list, 'query') else None
+        if perkiraan is None or perkiraan < BATAS_HITUNG_PASTI:
+            return super().count
+        return perkiraan
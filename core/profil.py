@@ -0,0 +1,153 @@
+"""
+Profil request: waktu, jumlah & durasi SQL, dan query berulang per request.
+
+ProfilRequestMiddleware (opsional, aktif bila settings.PROFIL_REQUEST) memasang
+connection.execute_wrapper selama request berjalan sehingga setiap query
+dicatat tanpa DEBUG=True. Hasil per request disimpan di ring buffer
+in-memory berukuran tetap (settings.PROFIL_KAPASITAS) milik proses ini,
+lalu ditampilkan di halaman diagnostik pakar dan dapat diekspor sebagai JSON.
+
+Dua pola yang dilaporkan:
+- duplikat: SQL dan parameter identik dieksekusi lebih dari sekali
+  (hasil yang sama diambil ulang, kandidat cache per request)
+- serupa: SQL sama dengan parameter berbeda dieksekusi berulang
+  (pola N+1, kandidat select_related/prefetch_related/in_bulk)
+"""
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+
+PROFIL_KAPASITAS = getattr(settings, 'PROFIL_KAPASITAS', 500)
+
+# Jumlah pola query serupa teratas yang disimpan per request
+MAKS_POLA_SERUPA = 5
+# Panjang SQL yang disimpan per pola
+MAKS_PANJANG_SQL = 500
+
+URUTAN_PROFIL = ('durasi_ms', 'jumlah_query', 'durasi_sql_ms', 'query_duplikat', 'query_serupa')
+
+
+class BufferProfil:
+    """Ring buffer catatan profil yang aman dipakai banyak thread"""
+
+    def __init__(self, kapasitas=PROFIL_KAPASITAS):
+        self._catatan = deque(maxlen=kapasitas)
+        self._kunci = threading.Lock()
+
+    def tambah(self, catatan):
+        with self._kunci:
+            self._catatan.append(catatan)
+
+    def kosongkan(self):
+        with self._kunci:
+            self._catatan.clear()
+
+    def semua(self):
+        with self._kunci:
+            return list(self._catatan)
+
+    def terburuk(self, urut='durasi_ms', batas=None):
+        """Catatan terurut menurun berdasarkan metrik `urut` (lihat URUTAN_PROFIL)"""
+        if urut not in URUTAN_PROFIL:
+            urut = 'durasi_ms'
+        hasil = sorted(self.semua(), key=lambda c: c[urut], reverse=True)
+        return hasil[:batas] if batas else hasil
+
+    def per_view(self):
+        """Agregat per view: jumlah request, rata-rata/maks durasi dan query"""
+        kelompok = {}
+        for c in self.semua():
+            kelompok.setdefault(c['view'], []).append(c)
+        hasil = [
+            {
+                'view': view,
+                'request': len(daftar),
+                'durasi_rata_ms': round(sum(c['durasi_ms'] for c in daftar) / len(daftar), 1),
+                'durasi_maks_ms': max(c['durasi_ms'] for c in daftar),
+                'query_rata': round(sum(c['jumlah_query'] for c in daftar) / len(daftar), 1),
+                'query_maks': max(c['jumlah_query'] for c in daftar),
+                'query_serupa_maks': max(c['query_serupa'] for c in daftar),
+            }
+            for view, daftar in kelompok.items()
+        ]
+        return sorted(hasil, key=lambda v: v['durasi_maks_ms'], reverse=True)
+
+
+buffer_profil = BufferProfil()
+
+
+class PencatatQuery:
+    """execute_wrapper yang mencatat durasi setiap query dalam satu request"""
+
+    def __init__(self):
+        self.jumlah = 0
+        self.durasi = 0.0
+        self.identik = Counter()
+        self.pola = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        mulai = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.durasi += time.perf_counter() - mulai
+            self.jumlah += 1
+            self.pola[sql] += 1
+            if not many:
+                try:
+                    self.identik[(sql, tuple(params or ()))] += 1
+                except TypeError:  # parameter tidak hashable (mis. list di dalam params)
+                    pass
+
+    def ringkasan(self):
+        duplikat = sum(n - 1 for n in self.identik.values() if n > 1)
+        serupa = [(sql, n) for sql, n in self.pola.most_common(MAKS_POLA_SERUPA) if n > 1]
+        return {
+            'jumlah_query': self.jumlah,
+            'durasi_sql_ms': round(self.durasi * 1000, 2),
+            'query_duplikat': duplikat,
+            'query_serupa': sum(n - 1 for n in self.pola.values() if n > 1),
+            'pola_serupa': [{'sql': sql[:MAKS_PANJANG_SQL], 'jumlah': n} for sql, n in serupa],
+        }
+
+
+class ProfilRequestMiddleware:
+    """
+    Catat profil setiap request ke buffer_profil
+
+    Tidak dipasang (MiddlewareNotUsed) bila settings.PROFIL_REQUEST tidak aktif.
+    Respons streaming diukur sampai view mengembalikan respons, bukan sampai
+    seluruh isi terkirim.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFIL_REQUEST', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pencatat = PencatatQuery()
+        mulai = time.perf_counter()
+        with ExitStack() as stack:
+            for koneksi in connections.all():
+                stack.enter_context(koneksi.execute_wrapper(pencatat))
+            response = self.get_response(request)
+        durasi = time.perf_counter() - mulai
+
+        match = getattr(request, 'resolver_match', None)
+        buffer_profil.tambah({
+            'waktu': timezone.now().isoformat(),
+            'metode': request.method,
+            'path': request.get_full_path()[:300],
+            'view': match.view_name if match else '',
+            'status': response.status_code,
+            'durasi_ms': round(durasi * 1000, 2),
+            **pencatat.ringkasan(),
+        })
+        return response
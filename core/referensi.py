@@ -0,0 +1,125 @@
+"""
+Referensi pertumbuhan (median dan SD per umur) untuk Z-Score dan kurva grafik.
+
+parameter_referensi() dipakai oleh hitung_dan_simpan_zscore (core/utils.py).
+Kurva -3..+3 SD untuk grafik tidak dihitung per request: perintah
+`python manage.py bangun_aset_grafik` menulisnya sekali ke berkas JSON statis
+berversi (core/static/core/referensi/v<VERSI>/), yang dilayani dengan header
+cache jangka panjang. Naikkan VERSI_REFERENSI setiap kali tabel/rumus berubah
+agar browser mengambil berkas baru.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+
+VERSI_REFERENSI = '1'
+
+JENIS_KELAMIN = ('L', 'P')
+INDIKATOR = ('bb_u', 'tb_u')
+GARIS_SD = (-3, -2, -1, 0, 1, 2, 3)
+
+# Rentang umur kurva (bulan): balita 0-5 tahun
+UMUR_MAKS_KURVA = 60
+
+DIREKTORI_REFERENSI = Path(__file__).resolve().parent / 'static' / 'core' / 'referensi'
+
+
+def umur_bulan(tanggal_lahir, tanggal_ukur):
+    """Usia dalam bulan penuh kalender (sama dengan perhitungan Z-Score)"""
+    return (tanggal_ukur.year - tanggal_lahir.year) * 12 + (tanggal_ukur.month - tanggal_lahir.month)
+
+
+def median_sd(umur, indikator):
+    """
+    Median dan SD per umur, vektor NumPy (umur boleh skalar atau array).
+
+    Placeholder simulasi tabel WHO (lihat hitung_dan_simpan_zscore); dalam
+    implementasi nyata diganti lookup tabel LMS WHO per jenis kelamin.
+    """
+    umur = np.asarray(umur, dtype=float)
+    segmen = [umur <= 24, umur <= 60]
+    if indikator == 'bb_u':
+        median = np.select(segmen, [0.5 * umur + 3.0, 0.2 * umur + 7.0], 0.15 * umur + 10.0)
+        sd = np.select(segmen, [0.2 * umur + 0.5, 0.15 * umur + 0.8], 0.1 * umur + 1.0)
+    else:
+        median = np.select(segmen, [2.0 * umur + 45.0, 1.5 * umur + 65.0], 1.2 * umur + 80.0)
+        sd = np.select(segmen, [0.3 * umur + 1.0, 0.2 * umur + 1.2], 0.15 * umur + 1.5)
+    return median, sd
+
+
+def zscore_vektor(umur, nilai, indikator):
+    """
+    Z-Score untuk banyak pengukuran sekaligus, dengan pembulatan dan batas
+    -3..+3 yang sama seperti hitung_dan_simpan_zscore
+
+    Args:
+        umur: Array usia (bulan)
+        nilai: Array berat (kg) atau tinggi (cm)
+        indikator: 'bb_u' atau 'tb_u'
+
+    Returns:
+        np.ndarray Z-Score
+    """
+    median, sd = median_sd(umur, indikator)
+    return np.clip(np.round((np.asarray(nilai, dtype=float) - median) / sd, 2), -3.0, 3.0)
+
+
+def parameter_referensi(umur, jenis_kelamin):
+    """
+    Median dan SD berat & tinggi untuk satu umur
+
+    Args:
+        umur: Usia dalam bulan
+        jenis_kelamin: 'L' atau 'P' (placeholder saat ini belum membedakan)
+
+    Returns:
+        Dict {'bb_u': (median, sd), 'tb_u': (median, sd)} dalam float
+    """
+    return {
+        indikator: tuple(float(v) for v in median_sd(umur, indikator))
+        for indikator in INDIKATOR
+    }
+
+
+def hitung_kurva(jenis_kelamin, indikator, umur_maks=UMUR_MAKS_KURVA):
+    """
+    Kurva -3..+3 SD per bulan umur
+
+    Returns:
+        Dict {'versi', 'jenis_kelamin', 'indikator', 'umur': [...], 'sd': {'-3': [...], ...}}
+    """
+    umur = np.arange(umur_maks + 1)
+    median, sd = median_sd(umur, indikator)
+    return {
+        'versi': VERSI_REFERENSI,
+        'jenis_kelamin': jenis_kelamin,
+        'indikator': indikator,
+        'umur': umur.tolist(),
+        'sd': {str(k): np.round(median + k * sd, 2).tolist() for k in GARIS_SD},
+    }
+
+
+def nama_berkas_kurva(jenis_kelamin, indikator):
+    return f'{jenis_kelamin}-{indikator}.json'
+
+
+def path_berkas_kurva(jenis_kelamin, indikator, versi=VERSI_REFERENSI):
+    return DIREKTORI_REFERENSI / f'v{versi}' / nama_berkas_kurva(jenis_kelamin, indikator)
+
+
+def bangun_kurva_referensi():
+    """
+    Tulis seluruh kurva referensi (per jenis kelamin & indikator) ke berkas JSON berversi
+
+    Returns:
+        List Path berkas yang ditulis
+    """
+    berkas = []
+    for jenis_kelamin in JENIS_KELAMIN:
+        for indikator in INDIKATOR:
+            path = path_berkas_kurva(jenis_kelamin, indikator)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(hitung_kurva(jenis_kelamin, indikator), separators=(',', ':')))
+            berkas.append(path)
+    return berkas
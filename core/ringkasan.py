@@ -0,0 +1,149 @@
+"""
+Pemeliharaan tabel PasienRingkasan (ringkasan pertumbuhan per pasien).
+
+Fungsi perbarui_* dipanggil oleh signal di core/signals.py setiap kali
+PengukuranFisik atau Konsultasi disimpan/dihapus. Jumlah pengukuran diubah
+secara inkremental (F() +/- 1), sedangkan data terakhir dibaca ulang dengan
+satu query yang memakai indeks (pasien, tanggal).
+
+hitung_ulang_ringkasan() dipakai untuk operasi massal yang melewati signal
+(bulk_create, impor CSV, data contoh).
+"""
+from django.db.models import Count, OuterRef, Subquery, F, IntegerField
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Pasien, PasienRingkasan, PengukuranFisik, Konsultasi
+
+
+def perbarui_ringkasan_pengukuran(pasien_id, selisih_jumlah=0, buat_bila_belum_ada=True):
+    """
+    Perbarui data pengukuran terakhir dan jumlah pengukuran seorang pasien
+
+    Args:
+        pasien_id: ID pasien
+        selisih_jumlah: Perubahan jumlah pengukuran (+1 simpan baru, -1 hapus)
+        buat_bila_belum_ada: Hitung ulang penuh bila baris ringkasan belum ada
+            (False saat penghapusan, agar tidak membuat baris untuk pasien yang sedang dihapus)
+    """
+    sekarang = timezone.now()
+    terakhir = (
+        PengukuranFisik.objects.filter(pasien_id=pasien_id)
+        .order_by('-tanggalUkur', '-id')
+        .values('tanggalUkur', 'skor_Z_BB_U', 'skor_Z_TB_U')
+        .first()
+    ) or {}
+    nilai = {
+        'tanggalUkurTerakhir': terakhir.get('tanggalUkur'),
+        'skor_Z_BB_U': terakhir.get('skor_Z_BB_U'),
+        'skor_Z_TB_U': terakhir.get('skor_Z_TB_U'),
+        'statusPertumbuhan': PasienRingkasan.status_dari_zscore(terakhir.get('skor_Z_TB_U')),
+        'diperbarui': sekarang,
+        'pengukuranDiperbarui': sekarang,
+    }
+    if selisih_jumlah:
+        nilai['jumlahPengukuran'] = F('jumlahPengukuran') + selisih_jumlah
+
+    diperbarui = PasienRingkasan.objects.filter(pasien_id=pasien_id).update(**nilai)
+    if not diperbarui and buat_bila_belum_ada:
+        hitung_ulang_ringkasan([pasien_id])
+
+
+def perbarui_ringkasan_konsultasi(pasien_id, buat_bila_belum_ada=True):
+    """
+    Perbarui diagnosa dan tanggal konsultasi terakhir seorang pasien
+    """
+    terakhir = (
+        Konsultasi.objects.filter(pasien_id=pasien_id)
+        .order_by('-tanggalKonsultasi')
+        .values('tanggalKonsultasi', 'hasilKondisi_id')
+        .first()
+    ) or {}
+    diperbarui = PasienRingkasan.objects.filter(pasien_id=pasien_id).update(
+        tanggalKonsultasiTerakhir=terakhir.get('tanggalKonsultasi'),
+        hasilKondisiTerakhir_id=terakhir.get('hasilKondisi_id'),
+        diperbarui=timezone.now(),
+    )
+    if not diperbarui and buat_bila_belum_ada:
+        hitung_ulang_ringkasan([pasien_id])
+
+
+def hitung_ulang_ringkasan(pasien_ids=None, batch_size=1000):
+    """
+    Hitung ulang ringkasan secara penuh dan simpan dengan upsert massal
+
+    Args:
+        pasien_ids: Daftar ID pasien, atau None untuk semua pasien
+        batch_size: Jumlah pasien per batch
+
+    Returns:
+        Jumlah baris ringkasan yang ditulis
+    """
+    pengukuran_terakhir = PengukuranFisik.objects.filter(
+        pasien_id=OuterRef('pk')
+    ).order_by('-tanggalUkur', '-id')
+    konsultasi_terakhir = Konsultasi.objects.filter(
+        pasien_id=OuterRef('pk')
+    ).order_by('-tanggalKonsultasi')
+    jumlah_pengukuran = (
+        PengukuranFisik.objects.filter(pasien_id=OuterRef('pk'))
+        .order_by().values('pasien_id').annotate(n=Count('id')).values('n')
+    )
+
+    if pasien_ids is None:
+        pasien_ids = Pasien.objects.order_by('id').values_list('id', flat=True).iterator(chunk_size=batch_size)
+    else:
+        pasien_ids = list(pasien_ids)
+
+    total = 0
+    batch = []
+    for pasien_id in pasien_ids:
+        batch.append(pasien_id)
+        if len(batch) >= batch_size:
+            total += _tulis_ringkasan(batch, pengukuran_terakhir, konsultasi_terakhir, jumlah_pengukuran)
+            batch = []
+    if batch:
+        total += _tulis_ringkasan(batch, pengukuran_terakhir, konsultasi_terakhir, jumlah_pengukuran)
+    return total
+
+
+def _tulis_ringkasan(pasien_ids, pengukuran_terakhir, konsultasi_terakhir, jumlah_pengukuran):
+    baris = (
+        Pasien.objects.filter(id__in=pasien_ids)
+        .annotate(
+            jumlah=Coalesce(Subquery(jumlah_pengukuran, output_field=IntegerField()), 0),
+            tgl_ukur=Subquery(pengukuran_terakhir.values('tanggalUkur')[:1]),
+            z_bb_u=Subquery(pengukuran_terakhir.values('skor_Z_BB_U')[:1]),
+            z_tb_u=Subquery(pengukuran_terakhir.values('skor_Z_TB_U')[:1]),
+            tgl_konsultasi=Subquery(konsultasi_terakhir.values('tanggalKonsultasi')[:1]),
+            hasil_kondisi=Subquery(konsultasi_terakhir.values('hasilKondisi_id')[:1]),
+        )
+        .values('id', 'jumlah', 'tgl_ukur', 'z_bb_u', 'z_tb_u', 'tgl_konsultasi', 'hasil_kondisi')
+    )
+    sekarang = timezone.now()
+    ringkasan = [
+        PasienRingkasan(
+            pasien_id=b['id'],
+            jumlahPengukuran=b['jumlah'],
+            tanggalUkurTerakhir=b['tgl_ukur'],
+            skor_Z_BB_U=b['z_bb_u'],
+            skor_Z_TB_U=b['z_tb_u'],
+            statusPertumbuhan=PasienRingkasan.status_dari_zscore(b['z_tb_u']),
+            tanggalKonsultasiTerakhir=b['tgl_konsultasi'],
+            hasilKondisiTerakhir_id=b['hasil_kondisi'],
+            diperbarui=sekarang,
+            pengukuranDiperbarui=sekarang,
+        )
+        for b in baris
+    ]
+    PasienRingkasan.objects.bulk_create(
+        ringkasan,
+        update_conflicts=True,
+        unique_fields=['pasien'],
+        update_fields=[
+            'jumlahPengukuran', 'tanggalUkurTerakhir', 'skor_Z_BB_U', 'skor_Z_TB_U',
+            'statusPertumbuhan', 'tanggalKonsultasiTerakhir', 'hasilKondisiTerakhir', 'diperbarui',
+            'pengukuranDiperbarui',
+        ],
+    )
+    return len(ringkasan)
@@ -0,0 +1,46 @@
+"""
+Resolusi peran (grup) pengguna yang dimemo per request.
+
+Sebelumnya setiap pengecekan peran menjalankan
+user.groups.filter(name='Pakar Diagnosa').exists(); di halaman admin
+pengecekan ini dipanggil untuk setiap model dan setiap jenis izin.
+peran_pengguna() mengambil nama grup sekali lalu menyimpannya pada objek
+user. request.user dibuat ulang di setiap request, sehingga cache ini
+otomatis berumur satu request. Perubahan keanggotaan grup pada objek yang
+sama langsung menghapus cache-nya (signal m2m_changed di core/signals.py).
+"""
+ATRIBUT_CACHE = '_core_peran_cache'
+
+GRUP_PAKAR = 'Pakar Diagnosa'
+
+
+def peran_pengguna(user):
+    """
+    Nama grup milik pengguna, diambil dari database paling banyak sekali per objek user
+
+    Args:
+        user: User (atau request.user)
+
+    Returns:
+        frozenset nama grup; kosong untuk pengguna anonim
+    """
+    if not user.is_authenticated:
+        return frozenset()
+    peran = getattr(user, ATRIBUT_CACHE, None)
+    if peran is None:
+        peran = frozenset(user.groups.values_list('name', flat=True))
+        setattr(user, ATRIBUT_CACHE, peran)
+    return peran
+
+
+def hapus_cache_peran(user):
+    """Buang cache peran pada objek user (setelah keanggotaan grup berubah)"""
+    user.__dict__.pop(ATRIBUT_CACHE, None)
+
+
+def is_pakar(user):
+    """Staf non-superuser yang tergabung dalam grup Pakar Diagnosa"""
+    return (
+        user.is_authenticated and user.is_staff and not user.is_superuser
+        and GRUP_PAKAR in peran_pengguna(user)
+    )
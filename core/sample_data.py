@@ -0,0 +1,321 @@
+"""
+Generator populasi sintetis untuk uji beban dan benchmark view.
+
+buat_populasi() membuat N pasien balita beserta riwayat pengukuran bulanan,
+konsultasi (dengan gejala sesuai aturan basis pengetahuan) dan notifikasi
+pengukuran ulang. Distribusi dibuat menyerupai data posyandu:
+
+- Jenis kelamin ~51% laki-laki, umur 0-59 bulan merata.
+- Setiap anak punya lintasan Z-Score TB/U sendiri: nilai dasar ~N(-1.0, 1.1)
+  (sekitar seperlima anak di bawah -2 SD, mendekati prevalensi stunting
+  nasional), tren per tahun ~N(0, 0.3) dan derau per kunjungan; Z-Score
+  BB/U berkorelasi dengan TB/U. Berat/tinggi diturunkan dari median dan SD
+  referensi (core/referensi.py), lalu Z-Score yang disimpan dihitung ulang
+  dari nilai terbulatkan sehingga konsisten dengan hitung_dan_simpan_zscore.
+- Pengukuran bulanan sejak 0-6 bulan, ~15% kunjungan terlewat.
+
+Semua baris dibangkitkan vektor dengan NumPy per chunk pasien dan ditulis
+dengan bulk_create; kata sandi di-hash SEKALI dan hash yang sama dipakai semua
+pasien sampel. Data turunan (ringkasan pasien, statistik dashboard) dihitung
+ulang sekali di akhir karena bulk_create tidak memicu signal.
+"""
+import re
+import time
+from contextlib import contextmanager
+from datetime import timezone as dt_timezone
+
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from .models import (
+    Pasien, PengukuranFisik, Konsultasi, DetailKonsultasi, Notifikasi, Aturan, Kondisi,
+)
+from .referensi import median_sd, zscore_vektor
+from .ringkasan import hitung_ulang_ringkasan
+from .statistik import hitung_ulang_statistik
+
+KATA_SANDI_SAMPEL = 'sampel123'
+PREFIX_NAMA_PENGGUNA = 'sampel'
+
+UKURAN_CHUNK_PASIEN = 2000
+UMUR_MAKS_BULAN = 59
+PELUANG_KUNJUNGAN_TERLEWAT = 0.15
+RATA_KONSULTASI_PER_PASIEN = 1.5
+
+NAMA_DEPAN = {
+    'L': ('Budi', 'Agus', 'Rizki', 'Dimas', 'Fajar', 'Yohanes', 'Made', 'Andi', 'Putu', 'Hendra', 'Kevin', 'Yosef'),
+    'P': ('Siti', 'Ani', 'Dewi', 'Putri', 'Maria', 'Ayu', 'Nur', 'Kadek', 'Lestari', 'Fransiska', 'Intan', 'Rina'),
+}
+NAMA_BELAKANG = ('Saputra', 'Wijaya', 'Lestari', 'Pratama', 'Ndun', 'Fanggidae', 'Manafe', 'Nenabu', 'Lake', 'Tefa')
+
+
+@contextmanager
+def _tanpa_auto_now_add(model, nama_field):
+    # auto_now_add menimpa tanggal sintetis saat bulk_create; dimatikan sementara
+    field = model._meta.get_field(nama_field)
+    semula = field.auto_now_add
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = semula
+
+
+def _id_baru(model, id_sebelum):
+    # Id baris yang baru ditulis, urut sesuai urutan bulk_create (satu penulis)
+    return list(model.objects.filter(id__gt=id_sebelum).order_by('id').values_list('id', flat=True))
+
+
+def _id_terakhir(model):
+    return model.objects.aggregate(m=Max('id'))['m'] or 0
+
+
+def _kelompok_aturan_per_kondisi():
+    """Kondisi -> list kode gejala dari kelompok aturan pertamanya (untuk DetailKonsultasi)"""
+    kelompok = {}
+    for kondisi_id, kode_kelompok, gejala_id in (
+        Aturan.objects.order_by('kondisi_id', 'kodeKelompokAturan', 'gejala_id')
+        .values_list('kondisi_id', 'kodeKelompokAturan', 'gejala_id')
+    ):
+        kelompok.setdefault(kondisi_id, (kode_kelompok, []))
+        if kelompok[kondisi_id][0] == kode_kelompok:
+            kelompok[kondisi_id][1].append(gejala_id)
+    return {kondisi_id: gejala for kondisi_id, (_, gejala) in kelompok.items()}
+
+
+def _kondisi_dari_zscore(z_tb, z_bb, kondisi_ada, rng):
+    """
+    Pilih hasil diagnosa yang masuk akal dari Z-Score terakhir
+
+    Memakai kode basis pengetahuan bawaan (K01 Stunting, K02 Gizi Buruk,
+    K03 Risiko Stunting, K06 Normal); sebagian kecil diberi kondisi acak
+    lain agar semua kondisi muncul di data.
+    """
+    kode = np.where(z_bb < -3, 'K02', np.where(z_tb < -2, 'K01', np.where(z_tb < -1, 'K03', 'K06')))
+    kode = kode.astype(object)
+    acak = rng.random(len(kode)) < 0.1
+    if kondisi_ada:
+        kode[acak] = rng.choice(kondisi_ada, size=int(acak.sum()))
+    tidak_dikenal = ~np.isin(kode, kondisi_ada) if kondisi_ada else np.ones(len(kode), dtype=bool)
+    kode[tidak_dikenal] = None
+    return kode
+
+
+def _nomor_berikutnya(prefix):
+    """
+    Nomor urut pasien sampel berikutnya: akhiran angka terbesar yang ada + 1
+
+    Tidak memakai count(): bila sebagian pasien sampel dihapus, jumlahnya
+    lebih kecil dari nomor terbesar dan nama pengguna baru akan bentrok.
+    """
+    terakhir = (
+        Pasien.objects.filter(namaPengguna__regex=rf'^{re.escape(prefix)}[0-9]+$')
+        # Akhiran diisi nol hingga 7 digit: urut panjang lalu teks = urut angka
+        .order_by(Length('namaPengguna').desc(), '-namaPengguna')
+        .values_list('namaPengguna', flat=True)
+        .first()
+    )
+    return int(terakhir[len(prefix):]) + 1 if terakhir else 0
+
+
+class GeneratorPopulasi:
+    """
+    Membangkitkan dan menulis populasi sintetis per chunk pasien
+
+    Atribut jumlah berisi jumlah baris yang ditulis per tabel.
+    """
+
+    def __init__(self, seed=None, chunk_size=UKURAN_CHUNK_PASIEN, konsultasi=True, notifikasi=True,
+                 kata_sandi=KATA_SANDI_SAMPEL, prefix=PREFIX_NAMA_PENGGUNA):
+        self.rng = np.random.default_rng(seed)
+        self.chunk_size = chunk_size
+        self.konsultasi = konsultasi
+        self.notifikasi = notifikasi
+        self.prefix = prefix
+        # Satu hash untuk semua pasien sampel (PBKDF2 per pasien butuh ratusan ms)
+        self.hash_sandi = make_password(kata_sandi)
+        self.hari_ini = timezone.localdate()
+        self.jumlah = {'pasien': 0, 'pengukuran': 0, 'konsultasi': 0, 'detail_konsultasi': 0, 'notifikasi': 0}
+        self.pasien_ids = []
+
+        self.kondisi_ada = sorted(Kondisi.objects.values_list('kodeKondisi', flat=True))
+        self.gejala_kondisi = _kelompok_aturan_per_kondisi() if konsultasi else {}
+        self._nomor = _nomor_berikutnya(prefix)
+
+    def jalankan(self, jumlah_pasien):
+        sisa = jumlah_pasien
+        while sisa > 0:
+            n = min(sisa, self.chunk_size)
+            with transaction.atomic():
+                self._chunk(n)
+            sisa -= n
+        return self.jumlah
+
+    def _chunk(self, n):
+        rng = self.rng
+        hari_ini = np.datetime64(self.hari_ini, 'D')
+
+        # Pasien
+        jenis_kelamin = np.where(rng.random(n) < 0.51, 'L', 'P')
+        umur_hari = rng.integers(0, int((UMUR_MAKS_BULAN + 1) * 30.44), n)
+        lahir = hari_ini - umur_hari.astype('timedelta64[D]')
+        nama = [
+            f"{rng.choice(NAMA_DEPAN[jk])} {rng.choice(NAMA_BELAKANG)}"
+            for jk in jenis_kelamin
+        ]
+        id_sebelum = _id_terakhir(Pasien)
+        Pasien.objects.bulk_create([
+            Pasien(
+                namaPengguna=f"{self.prefix}{self._nomor + i:07d}",
+                kataSandi=self.hash_sandi,
+                nama=nama[i],
+                jenisKelamin=jenis_kelamin[i],
+                tanggalLahir=lahir[i].item(),
+                namaWali=f"Orang tua {nama[i].split()[0]}",
+            )
+            for i in range(n)
+        ], batch_size=500)
+        self._nomor += n
+        pasien_ids = np.array(_id_baru(Pasien, id_sebelum))
+        self.pasien_ids.extend(pasien_ids.tolist())
+        self.jumlah['pasien'] += n
+
+        # Lintasan pertumbuhan per anak
+        z_dasar = rng.normal(-1.0, 1.1, n)
+        tren = rng.normal(0.0, 0.3, n)
+        korelasi_bb = rng.normal(-0.3, 0.7, n)
+
+        umur_bulan = (hari_ini.astype('datetime64[M]') - lahir.astype('datetime64[M]')).astype(int)
+        mulai = np.minimum(rng.integers(0, 7, n), umur_bulan)
+        kunjungan = umur_bulan - mulai + 1
+        total = int(kunjungan.sum())
+        anak = np.repeat(np.arange(n), kunjungan)
+        offset = np.repeat(np.cumsum(kunjungan) - kunjungan, kunjungan)
+        bulan_ke = mulai[anak] + (np.arange(total) - offset)
+
+        tanggal = lahir[anak] + np.round(bulan_ke * 30.44).astype('timedelta64[D]') \
+            + rng.integers(0, 8, total).astype('timedelta64[D]')
+        tetap = (rng.random(total) >= PELUANG_KUNJUNGAN_TERLEWAT) & (tanggal <= hari_ini)
+        anak, tanggal, bulan_ke = anak[tetap], tanggal[tetap], bulan_ke[tetap]
+        umur = (tanggal.astype('datetime64[M]') - lahir[anak].astype('datetime64[M]')).astype(int)
+
+        z_tb = z_dasar[anak] + tren[anak] * bulan_ke / 12 + rng.normal(0, 0.2, len(anak))
+        z_bb = 0.6 * z_tb + korelasi_bb[anak] + rng.normal(0, 0.3, len(anak))
+        median_tb, sd_tb = median_sd(umur, 'tb_u')
+        median_bb, sd_bb = median_sd(umur, 'bb_u')
+        tinggi = np.round(np.maximum(median_tb + z_tb * sd_tb, 40.0), 1)
+        berat = np.round(np.maximum(median_bb + z_bb * sd_bb, 1.5), 2)
+        skor_tb = zscore_vektor(umur, tinggi, 'tb_u')
+        skor_bb = zscore_vektor(umur, berat, 'bb_u')
+        lingkar_kepala = np.where(rng.random(len(anak)) < 0.5, np.round(34 + 12 * (1 - np.exp(-umur / 12)), 1), np.nan)
+
+        PengukuranFisik.objects.bulk_create((
+            PengukuranFisik(
+                pasien_id=int(pasien_ids[anak[j]]),
+                tanggalUkur=tanggal[j].item(),
+                beratBadan=float(berat[j]),
+                tinggiBadan=float(tinggi[j]),
+                lingkarKepala=None if np.isnan(lingkar_kepala[j]) else float(lingkar_kepala[j]),
+                skor_Z_BB_U=float(skor_bb[j]),
+                skor_Z_TB_U=float(skor_tb[j]),
+            )
+            for j in range(len(anak))
+        ), batch_size=1000)
+        self.jumlah['pengukuran'] += len(anak)
+
+        # Z-Score & tanggal pengukuran terakhir per anak (untuk konsultasi/notifikasi)
+        # (anak sudah urut, jadi indeks terakhir tiap anak = searchsorted kanan - 1)
+        terakhir = np.searchsorted(anak, np.arange(n), side='right') - 1
+        punya = np.zeros(n, dtype=bool)
+        z_tb_akhir, z_bb_akhir = z_dasar.copy(), z_dasar.copy()
+        if len(anak):
+            punya = (terakhir >= 0) & (anak[np.maximum(terakhir, 0)] == np.arange(n))
+            z_tb_akhir[punya] = skor_tb[terakhir[punya]]
+            z_bb_akhir[punya] = skor_bb[terakhir[punya]]
+
+        if self.konsultasi:
+            self._konsultasi(n, pasien_ids, lahir, z_tb_akhir, z_bb_akhir)
+        if self.notifikasi:
+            self._notifikasi(pasien_ids[punya], tanggal[terakhir[punya]])
+
+    def _konsultasi(self, n, pasien_ids, lahir, z_tb, z_bb):
+        rng = self.rng
+        jumlah = np.minimum(rng.poisson(RATA_KONSULTASI_PER_PASIEN, n), 6)
+        anak = np.repeat(np.arange(n), jumlah)
+        if not len(anak):
+            return
+        hari_ini = np.datetime64(self.hari_ini, 'D')
+        rentang = (hari_ini - lahir[anak]).astype(int) + 1
+        tanggal = lahir[anak] + (rng.random(len(anak)) * rentang).astype('timedelta64[D]')
+        # Jam praktik 08.00-16.00 (UTC, sesuai TIME_ZONE proyek)
+        waktu = tanggal.astype('datetime64[s]') + rng.integers(8 * 3600, 16 * 3600, len(anak)).astype('timedelta64[s]')
+        waktu = np.minimum(waktu, np.datetime64(timezone.now().replace(tzinfo=None), 's'))
+        kondisi = _kondisi_dari_zscore(z_tb[anak], z_bb[anak], self.kondisi_ada, rng)
+
+        id_sebelum = _id_terakhir(Konsultasi)
+        with _tanpa_auto_now_add(Konsultasi, 'tanggalKonsultasi'):
+            Konsultasi.objects.bulk_create((
+                Konsultasi(
+                    pasien_id=int(pasien_ids[anak[j]]),
+                    tanggalKonsultasi=waktu[j].item().replace(tzinfo=dt_timezone.utc),
+                    hasilKondisi_id=kondisi[j],
+                )
+                for j in range(len(anak))
+            ), batch_size=1000)
+        konsultasi_ids = _id_baru(Konsultasi, id_sebelum)
+        self.jumlah['konsultasi'] += len(konsultasi_ids)
+
+        detail = [
+            DetailKonsultasi(konsultasi_id=konsultasi_id, gejala_id=gejala)
+            for konsultasi_id, kode in zip(konsultasi_ids, kondisi)
+            for gejala in self.gejala_kondisi.get(kode, ())
+        ]
+        DetailKonsultasi.objects.bulk_create(detail, batch_size=1000)
+        self.jumlah['detail_konsultasi'] += len(detail)
+
+    def _notifikasi(self, pasien_ids, tanggal_terakhir):
+        sekarang = timezone.now()
+        jadwal = (tanggal_terakhir + np.timedelta64(30, 'D')).astype('datetime64[s]')
+        objek = []
+        for pasien_id, waktu in zip(pasien_ids, jadwal):
+            waktu = waktu.item().replace(tzinfo=dt_timezone.utc)
+            objek.append(Notifikasi(
+                pasien_id=int(pasien_id),
+                judul="Jadwal Pengukuran Ulang",
+                pesan="Saatnya melakukan pengukuran ulang pertumbuhan anak Anda.",
+                jadwalNotifikasi=waktu,
+                sudahTerkirim=waktu <= sekarang,
+                tipe='pengukuran_ulang',
+            ))
+        Notifikasi.objects.bulk_create(objek, batch_size=1000)
+        self.jumlah['notifikasi'] += len(objek)
+
+
+def buat_populasi(jumlah_pasien, seed=None, chunk_size=UKURAN_CHUNK_PASIEN, konsultasi=True, notifikasi=True,
+                  hitung_ulang=True):
+    """
+    Buat populasi sintetis
+
+    Args:
+        jumlah_pasien: Jumlah pasien yang dibuat
+        seed: Seed NumPy agar populasi dapat direproduksi
+        chunk_size: Jumlah pasien per transaksi
+        konsultasi: Buat konsultasi & detail gejala (butuh basis pengetahuan termuat)
+        notifikasi: Buat jadwal pengukuran ulang per pasien
+        hitung_ulang: Hitung ulang ringkasan pasien & statistik dashboard di akhir
+
+    Returns:
+        Dict jumlah baris per tabel dan durasi_detik
+    """
+    mulai = time.perf_counter()
+    generator = GeneratorPopulasi(seed, chunk_size, konsultasi, notifikasi)
+    jumlah = dict(generator.jalankan(jumlah_pasien))
+    if hitung_ulang:
+        hitung_ulang_ringkasan(generator.pasien_ids)
+        hitung_ulang_statistik()
+    jumlah['durasi_detik'] = round(time.perf_counter() - mulai, 2)
+    return jumlah
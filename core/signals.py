@@ -0,0 +1,188 @@
+"""
+Signal core: memelihara data turunan (ringkasan pasien, statistik dashboard,
+versi basis pengetahuan) agar tetap sinkron dengan tabel sumbernya. Didaftarkan di CoreConfig.ready().
+
+Catatan: bulk_create/queryset.update() tidak memicu signal; kode yang memakai
+operasi massal harus memanggil fungsi pemeliharaan secara eksplisit.
+
+Counter dan rollup statistik hanya ikut transaksi penulisan datanya bila
+pemanggil membungkus keduanya dengan atomic (jalankan_inferensi,
+simpan_pengukuran_pasien). Pada mode autocommit, save() dan UPDATE counter
+adalah dua transaksi terpisah: kegagalan di antaranya meninggalkan selisih yang
+diperbaiki hitung_ulang_statistik(). Signal post_save dilewati untuk loaddata
+(raw=True) karena fixture memuat tabel statistik apa adanya.
+"""
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, post_init, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from .models import (
+    Pasien, PasienRingkasan, PengukuranFisik, Konsultasi, Gejala, Kondisi, Aturan,
+    StatistikTotal, StatistikHarian,
+)
+from .middleware import hapus_cache_pasien
+from .roles import hapus_cache_peran
+from .ringkasan import perbarui_ringkasan_pengukuran, perbarui_ringkasan_konsultasi
+from .statistik import ubah_total, ubah_harian, tanggal_lokal, pindahkan_harian_kondisi
+from .versi_kb import naikkan_versi_kb
+
+
+@receiver(post_save, sender=Pasien)
+def buat_ringkasan_pasien(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        PasienRingkasan.objects.get_or_create(pasien=instance)
+
+
+@receiver(post_init, sender=PengukuranFisik)
+def catat_nilai_awal_pengukuran(sender, instance, **kwargs):
+    # Disimpan agar perpindahan pengukuran ke pasien/tanggal lain (edit pakar) terdeteksi
+    instance._pasien_id_awal = instance.pasien_id
+    instance._tanggalUkur_awal = instance.tanggalUkur
+
+
+@receiver(post_save, sender=PengukuranFisik)
+def ringkasan_pengukuran_disimpan(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    pasien_awal = getattr(instance, '_pasien_id_awal', None)
+    if created:
+        perbarui_ringkasan_pengukuran(instance.pasien_id, selisih_jumlah=1)
+    elif pasien_awal and pasien_awal != instance.pasien_id:
+        perbarui_ringkasan_pengukuran(pasien_awal, selisih_jumlah=-1)
+        perbarui_ringkasan_pengukuran(instance.pasien_id, selisih_jumlah=1)
+    else:
+        perbarui_ringkasan_pengukuran(instance.pasien_id)
+    instance._pasien_id_awal = instance.pasien_id
+
+
+@receiver(post_delete, sender=PengukuranFisik)
+def ringkasan_pengukuran_dihapus(sender, instance, **kwargs):
+    perbarui_ringkasan_pengukuran(instance.pasien_id, selisih_jumlah=-1, buat_bila_belum_ada=False)
+
+
+@receiver(post_save, sender=Konsultasi)
+def ringkasan_konsultasi_disimpan(sender, instance, raw=False, **kwargs):
+    if not raw:
+        perbarui_ringkasan_konsultasi(instance.pasien_id)
+
+
+@receiver(post_delete, sender=Konsultasi)
+def ringkasan_konsultasi_dihapus(sender, instance, **kwargs):
+    perbarui_ringkasan_konsultasi(instance.pasien_id, buat_bila_belum_ada=False)
+
+
+## Statistik dashboard
+
+COUNTER_MODEL = {
+    Pasien: StatistikTotal.PASIEN,
+    Konsultasi: StatistikTotal.KONSULTASI,
+    Gejala: StatistikTotal.GEJALA,
+    Kondisi: StatistikTotal.KONDISI,
+    Aturan: StatistikTotal.ATURAN,
+}
+
+
+def counter_dibuat(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        ubah_total(COUNTER_MODEL[sender], 1)
+
+
+def counter_dihapus(sender, instance, **kwargs):
+    ubah_total(COUNTER_MODEL[sender], -1)
+
+
+for _model in COUNTER_MODEL:
+    post_save.connect(counter_dibuat, sender=_model, dispatch_uid=f'statistik_total_simpan_{_model.__name__}')
+    post_delete.connect(counter_dihapus, sender=_model, dispatch_uid=f'statistik_total_hapus_{_model.__name__}')
+
+
+@receiver(post_init, sender=Konsultasi)
+def catat_hasil_awal_konsultasi(sender, instance, **kwargs):
+    # Hasil awal dicatat agar perubahan hasil diagnosa (mis. lewat admin) memindahkan rollup harian
+    instance._hasilKondisi_id_awal = instance.hasilKondisi_id
+
+
+@receiver(post_save, sender=Konsultasi)
+def statistik_konsultasi_disimpan(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    tanggal = tanggal_lokal(instance.tanggalKonsultasi)
+    hasil_awal = getattr(instance, '_hasilKondisi_id_awal', None)
+    jenis = StatistikHarian.JENIS_KONSULTASI
+    if created:
+        ubah_harian(jenis, tanggal, 1, instance.hasilKondisi_id)
+    elif hasil_awal != instance.hasilKondisi_id:
+        ubah_harian(jenis, tanggal, -1, hasil_awal)
+        ubah_harian(jenis, tanggal, 1, instance.hasilKondisi_id)
+    instance._hasilKondisi_id_awal = instance.hasilKondisi_id
+
+
+@receiver(post_delete, sender=Konsultasi)
+def statistik_konsultasi_dihapus(sender, instance, **kwargs):
+    ubah_harian(
+        StatistikHarian.JENIS_KONSULTASI, tanggal_lokal(instance.tanggalKonsultasi), -1,
+        getattr(instance, '_hasilKondisi_id_awal', instance.hasilKondisi_id)
+    )
+
+
+@receiver(pre_delete, sender=Kondisi)
+def statistik_pindahkan_hasil_kondisi(sender, instance, **kwargs):
+    # Konsultasi dengan hasil ini akan di-SET_NULL (tanpa signal) dan baris
+    # rollup-nya ikut terhapus (CASCADE); pindahkan jumlahnya ke "belum ada hasil"
+    pindahkan_harian_kondisi(instance.pk)
+
+
+@receiver(post_save, sender=PengukuranFisik)
+def statistik_pengukuran_disimpan(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    tanggal_awal = getattr(instance, '_tanggalUkur_awal', None)
+    jenis = StatistikHarian.JENIS_PENGUKURAN
+    if created:
+        ubah_harian(jenis, instance.tanggalUkur, 1)
+    elif tanggal_awal != instance.tanggalUkur:
+        ubah_harian(jenis, tanggal_awal, -1)
+        ubah_harian(jenis, instance.tanggalUkur, 1)
+    instance._tanggalUkur_awal = instance.tanggalUkur
+
+
+@receiver(post_delete, sender=PengukuranFisik)
+def statistik_pengukuran_dihapus(sender, instance, **kwargs):
+    ubah_harian(
+        StatistikHarian.JENIS_PENGUKURAN, getattr(instance, '_tanggalUkur_awal', instance.tanggalUkur), -1
+    )
+
+
+## Cache peran pengguna
+
+@receiver(m2m_changed, sender=User.groups.through)
+def peran_berubah(sender, instance, reverse, **kwargs):
+    # Dari sisi user (user.groups.add/remove/clear) cache pada objek itu dibuang.
+    # Dari sisi grup (group.user_set...) objek user lain tidak terjangkau, tetapi
+    # cache hanya hidup selama satu request sehingga request berikutnya sudah benar.
+    if not reverse:
+        hapus_cache_peran(instance)
+
+
+## Cache profil pasien (core.middleware)
+
+@receiver(post_save, sender=Pasien)
+@receiver(post_delete, sender=Pasien)
+def pasien_berubah(sender, instance, **kwargs):
+    # Dibuang sekarang dan sekali lagi setelah commit, agar request lain yang
+    # membaca sebelum commit tidak meninggalkan data lama di cache
+    hapus_cache_pasien(instance.pk)
+    transaction.on_commit(lambda: hapus_cache_pasien(instance.pk))
+
+
+## Versi basis pengetahuan
+
+def versi_kb_berubah(sender, instance, raw=False, **kwargs):
+    if not raw:
+        naikkan_versi_kb()
+
+
+for _model in (Gejala, Kondisi, Aturan):
+    post_save.connect(versi_kb_berubah, sender=_model, dispatch_uid=f'versi_kb_simpan_{_model.__name__}')
+    post_delete.connect(versi_kb_berubah, sender=_model, dispatch_uid=f'versi_kb_hapus_{_model.__name__}')
@@ -0,0 +1,240 @@
+"""
+Statistik dashboard pakar yang dipelihara secara inkremental.
+
+StatistikTotal menyimpan satu counter per entitas (pasien, konsultasi, gejala,
+kondisi, aturan) dan StatistikHarian menyimpan rollup harian konsultasi per
+hasil diagnosa serta jumlah pengukuran per tanggal ukur. Keduanya diubah oleh
+signal di core/signals.py dengan UPDATE ... SET jumlah = jumlah +/- n, di dalam
+transaksi yang sama dengan penulisan datanya bila pemanggil memakai atomic
+(jalankan_inferensi, simpan_pengukuran_pasien).
+
+Dashboard cukup membaca beberapa baris ini, tanpa COUNT(*) ke tabel mentah.
+hitung_ulang_statistik() dipakai setelah operasi massal yang melewati signal
+(bulk_create, queryset.update/delete, impor CSV) atau untuk memperbaiki selisih.
+Penghapusan yang memicu banyak signal (mis. kondisi beserta aturannya)
+dibungkus tunda_total() agar counter ditulis sekali, bukan sekali per baris.
+"""
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import (
+    Pasien, Konsultasi, Gejala, Kondisi, Aturan, PengukuranFisik,
+    StatistikTotal, StatistikHarian,
+)
+
+# Model sumber untuk setiap counter StatistikTotal
+MODEL_TOTAL = {
+    StatistikTotal.PASIEN: Pasien,
+    StatistikTotal.KONSULTASI: Konsultasi,
+    StatistikTotal.GEJALA: Gejala,
+    StatistikTotal.KONDISI: Kondisi,
+    StatistikTotal.ATURAN: Aturan,
+}
+
+# Rentang tren yang ditampilkan di dashboard
+HARI_TREN = 30
+
+_lokal = threading.local()
+
+
+def tanggal_lokal(waktu):
+    """Tanggal kalender (zona waktu proyek) dari sebuah datetime"""
+    if timezone.is_aware(waktu):
+        return timezone.localdate(waktu)
+    return waktu.date()
+
+
+def ubah_total(nama, selisih):
+    """
+    Tambah/kurangi counter StatistikTotal
+
+    Args:
+        nama: Nama counter (StatistikTotal.PASIEN, dst.)
+        selisih: +1 saat dibuat, -1 saat dihapus
+    """
+    tertunda = getattr(_lokal, 'tertunda', None)
+    if tertunda is not None:
+        tertunda[nama] += selisih
+        return
+    with transaction.atomic():
+        diperbarui = StatistikTotal.objects.filter(nama=nama).update(
+            jumlah=F('jumlah') + selisih, diperbarui=timezone.now()
+        )
+        if not diperbarui:
+            # Baris belum ada (database baru/di-flush): isi dari tabel sumber,
+            # yang pada titik ini sudah memuat perubahan yang memicu signal
+            StatistikTotal.objects.update_or_create(
+                nama=nama, defaults={'jumlah': MODEL_TOTAL[nama].objects.count()}
+            )
+
+
+@contextmanager
+def tunda_total():
+    """
+    Blok operasi massal: perubahan counter StatistikTotal dari signal dijumlahkan
+    dan ditulis sekali per counter di akhir blok, dalam satu transaksi
+
+    Contoh:
+        with tunda_total():
+            kondisi.delete()  # post_delete per aturan tidak lagi UPDATE per baris
+    """
+    if getattr(_lokal, 'tertunda', None) is not None:
+        # Bersarang: ikut blok terluar
+        yield
+        return
+    _lokal.tertunda = Counter()
+    try:
+        with transaction.atomic():
+            yield
+            tertunda, _lokal.tertunda = _lokal.tertunda, None
+            for nama, selisih in tertunda.items():
+                if selisih:
+                    ubah_total(nama, selisih)
+    finally:
+        _lokal.tertunda = None
+
+
+def ubah_harian(jenis, tanggal, selisih, kondisi_id=None):
+    """
+    Tambah/kurangi rollup StatistikHarian untuk satu tanggal
+
+    Args:
+        jenis: StatistikHarian.JENIS_KONSULTASI atau JENIS_PENGUKURAN
+        tanggal: Tanggal rollup
+        selisih: Perubahan jumlah
+        kondisi_id: Hasil diagnosa (hanya untuk konsultasi), None bila belum ada
+    """
+    if tanggal is None or not selisih:
+        return
+    with transaction.atomic():
+        diperbarui = StatistikHarian.objects.filter(
+            tanggal=tanggal, jenis=jenis, kondisi_id=kondisi_id
+        ).update(jumlah=F('jumlah') + selisih)
+        if not diperbarui and selisih > 0:
+            StatistikHarian.objects.create(
+                tanggal=tanggal, jenis=jenis, kondisi_id=kondisi_id, jumlah=selisih
+            )
+
+
+def pindahkan_harian_kondisi(kondisi_id):
+    """
+    Pindahkan rollup konsultasi satu hasil diagnosa ke "belum ada hasil" (kondisi NULL)
+
+    Dipanggil sebelum Kondisi dihapus: konsultasinya di-SET_NULL tanpa signal
+    dan baris rollup kondisi itu ikut terhapus (CASCADE). Jumlah query tetap
+    berapa pun banyaknya tanggal.
+    """
+    jenis = StatistikHarian.JENIS_KONSULTASI
+    asal = StatistikHarian.objects.filter(jenis=jenis, kondisi_id=kondisi_id)
+    jumlah_per_tanggal = dict(asal.values_list('tanggal', 'jumlah'))
+    if not jumlah_per_tanggal:
+        return
+    tujuan = StatistikHarian.objects.filter(jenis=jenis, kondisi=None, tanggal__in=jumlah_per_tanggal)
+    with transaction.atomic():
+        sudah_ada = set(tujuan.values_list('tanggal', flat=True))
+        tujuan.update(jumlah=F('jumlah') + Subquery(asal.filter(tanggal=OuterRef('tanggal')).values('jumlah')[:1]))
+        StatistikHarian.objects.bulk_create([
+            StatistikHarian(tanggal=tanggal, jenis=jenis, kondisi=None, jumlah=jumlah)
+            for tanggal, jumlah in jumlah_per_tanggal.items() if tanggal not in sudah_ada
+        ])
+
+
+def hitung_ulang_total(*nama):
+    """
+    Setel ulang counter StatistikTotal dari COUNT(*) tabel sumber
+
+    Args:
+        *nama: Counter yang dihitung ulang (kosong = semua)
+
+    Returns:
+        Dict nama counter -> jumlah
+    """
+    totals = {n: MODEL_TOTAL[n].objects.count() for n in (nama or MODEL_TOTAL)}
+    StatistikTotal.objects.bulk_create(
+        [StatistikTotal(nama=n, jumlah=jumlah) for n, jumlah in totals.items()],
+        update_conflicts=True,
+        unique_fields=['nama'],
+        update_fields=['jumlah', 'diperbarui'],
+    )
+    return totals
+
+
+@transaction.atomic
+def hitung_ulang_statistik():
+    """
+    Hitung ulang seluruh counter dan rollup harian dari tabel sumber
+
+    Returns:
+        Dict nama counter -> jumlah
+    """
+    totals = hitung_ulang_total()
+
+    StatistikHarian.objects.all().delete()
+    konsultasi = (
+        Konsultasi.objects.annotate(tanggal=TruncDate('tanggalKonsultasi'))
+        .values('tanggal', 'hasilKondisi_id').annotate(n=Count('id')).order_by()
+    )
+    pengukuran = PengukuranFisik.objects.values('tanggalUkur').annotate(n=Count('id')).order_by()
+    rollup = [
+        StatistikHarian(
+            tanggal=k['tanggal'], jenis=StatistikHarian.JENIS_KONSULTASI,
+            kondisi_id=k['hasilKondisi_id'], jumlah=k['n']
+        )
+        for k in konsultasi
+    ] + [
+        StatistikHarian(tanggal=p['tanggalUkur'], jenis=StatistikHarian.JENIS_PENGUKURAN, jumlah=p['n'])
+        for p in pengukuran
+    ]
+    StatistikHarian.objects.bulk_create(rollup, batch_size=1000)
+    return totals
+
+
+def statistik_dashboard(hari=HARI_TREN):
+    """
+    Data dashboard pakar dari tabel statistik (dua query, tidak bergantung ukuran data)
+
+    Args:
+        hari: Jumlah hari terakhir untuk grafik tren
+
+    Returns:
+        Dict berisi 'total' (nama -> jumlah) dan 'tren' (label tanggal,
+        seri konsultasi per kondisi, seri pengukuran) untuk Chart.js
+    """
+    total = dict.fromkeys(MODEL_TOTAL, 0)
+    total.update(StatistikTotal.objects.values_list('nama', 'jumlah'))
+
+    akhir = timezone.localdate()
+    awal = akhir - timedelta(days=hari - 1)
+    tanggal = [awal + timedelta(days=i) for i in range(hari)]
+    posisi = {t: i for i, t in enumerate(tanggal)}
+
+    pengukuran = [0] * hari
+    konsultasi = {}
+    baris = (
+        StatistikHarian.objects.filter(tanggal__range=(awal, akhir))
+        .select_related('kondisi')
+        .order_by('jenis', 'tanggal')
+    )
+    for b in baris:
+        i = posisi[b.tanggal]
+        if b.jenis == StatistikHarian.JENIS_PENGUKURAN:
+            pengukuran[i] += b.jumlah
+            continue
+        label = f"{b.kondisi.kodeKondisi} - {b.kondisi.namaKondisi}" if b.kondisi else 'Belum ada hasil'
+        konsultasi.setdefault(label, [0] * hari)[i] += b.jumlah
+
+    return {
+        'total': total,
+        'tren': {
+            'label': [t.isoformat() for t in tanggal],
+            'konsultasi': [{'label': label, 'data': data} for label, data in sorted(konsultasi.items())],
+            'pengukuran': pengukuran,
+        },
+    }
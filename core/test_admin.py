@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Pasien, PengukuranFisik, Gejala, Kondisi, Aturan, Konsultasi, DetailKonsultasi
+from .pagination import PaginatorEstimasi
+
+
+class AdminTabelBesarTest(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser(username='admin', password='password123')
+        self.client = Client()
+        self.client.force_login(admin)
+        self.gejala = Gejala.objects.create(kodeGejala='G01', namaGejala='Gejala 1')
+        self.kondisi = Kondisi.objects.create(kodeKondisi='K01', namaKondisi='Stunting', deskripsi='-', solusi='-')
+        self.nomor = 0
+        self.tambah_data(3)
+
+    def tambah_data(self, jumlah):
+        for _ in range(jumlah):
+            self.nomor += 1
+            pasien = Pasien.objects.create(
+                nama=f'Anak {self.nomor}', namaPengguna=f'anak{self.nomor}', kataSandi='x',
+                jenisKelamin='L', tanggalLahir='2022-01-01',
+            )
+            PengukuranFisik.objects.create(pasien=pasien, tanggalUkur=date(2024, 1, 1), beratBadan=10, tinggiBadan=80)
+            konsultasi = Konsultasi.objects.create(pasien=pasien, hasilKondisi=self.kondisi)
+            DetailKonsultasi.objects.create(konsultasi=konsultasi, gejala=self.gejala)
+
+    def hitung_query(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_changelist_tidak_query_per_baris(self):
+        urls = [reverse(f'admin:core_{m}_changelist') for m in ('pengukuranfisik', 'konsultasi', 'detailkonsultasi')]
+        sedikit = [self.hitung_query(url) for url in urls]
+        self.tambah_data(10)
+        self.assertEqual([self.hitung_query(url) for url in urls], sedikit)
+
+    def test_form_tambah_tidak_memuat_semua_pasien(self):
+        for model in ('pengukuranfisik', 'konsultasi'):
+            with self.subTest(model=model):
+                response = self.client.get(reverse(f'admin:core_{model}_add'))
+                self.assertNotContains(response, 'Anak 1')
+                self.assertContains(response, 'admin-autocomplete')
+
+    def test_str_tanpa_query(self):
+        aturan = Aturan.objects.create(kondisi=self.kondisi, gejala=self.gejala, kodeKelompokAturan='R01')
+        aturan = Aturan.objects.get(pk=aturan.pk)
+        detail = DetailKonsultasi.objects.first()
+        with self.assertNumQueries(0):
+            self.assertEqual(str(aturan), 'Aturan R01: JIKA G01 MAKA K01')
+            self.assertEqual(str(detail), f'Konsultasi {detail.konsultasi_id} - Gejala: G01')
+
+
+class PaginatorEstimasiTest(TestCase):
+    def setUp(self):
+        pasien = Pasien.objects.create(nama='Anak', namaPengguna='anak', jenisKelamin='L', tanggalLahir='2022-01-01')
+        for i in range(8):
+            PengukuranFisik.objects.create(
+                pasien=pasien, tanggalUkur=date(2024, 1, 1) + timedelta(days=i), beratBadan=10, tinggiBadan=80
+            )
+        # Baris terhapus: perkiraan dari id terbesar tidak ikut berkurang
+        PengukuranFisik.objects.order_by('id').first().delete()
+        self.id_maks = PengukuranFisik.objects.order_by('-id').values_list('id', flat=True).first()
+
+    def test_jumlah_pasti_di_bawah_batas(self):
+        self.assertEqual(PaginatorEstimasi(PengukuranFisik.objects.order_by('id'), 3).count, 7)
+
+    def test_perkiraan_tanpa_filter(self):
+        with mock.patch('core.pagination.BATAS_HITUNG_PASTI', 5):
+            paginator = PaginatorEstimasi(PengukuranFisik.objects.order_by('id'), 3)
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(paginator.count, self.id_maks)
+            self.assertNotIn('COUNT(', ctx.captured_queries[0]['sql'].upper())
+
+    def test_pasti_dengan_filter(self):
+        with mock.patch('core.pagination.BATAS_HITUNG_PASTI', 5):
+            qs = PengukuranFisik.objects.filter(tanggalUkur__gte=date(2024, 1, 5)).order_by('id')
+            self.assertEqual(PaginatorEstimasi(qs, 3).count, 4)
@@ -0,0 +1,77 @@
+import csv
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.hashers import check_password
+from django.contrib.auth.models import User, Group
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.test import TestCase
+
+from .akun import GRUP_ADMIN, hash_kata_sandi, izin_model, IZIN_PAKAR, siapkan_akun_pakar, siapkan_grup, simpan_akun_pakar
+from .roles import GRUP_PAKAR, is_pakar
+
+
+class ProvisiAkunTest(TestCase):
+    def jalankan(self, *args):
+        call_command('create_default_users', *args, stdout=StringIO())
+
+    def test_izin_satu_query(self):
+        ContentType.objects.clear_cache()
+        with self.assertNumQueries(2):  # semua content type sekaligus + semua izin
+            izin = izin_model(IZIN_PAKAR)
+        codename = {p.codename for p in izin}
+        self.assertIn('change_pasien', codename)
+        self.assertNotIn('delete_pasien', codename)
+        self.assertIn('delete_aturan', codename)
+        self.assertEqual(len(izin), sum(len(a) for a in IZIN_PAKAR.values()))
+
+    def test_idempoten(self):
+        self.jalankan()
+        self.jalankan()
+        self.assertEqual(Group.objects.filter(name__in=[GRUP_ADMIN, GRUP_PAKAR]).count(), 2)
+        pakar = User.objects.get(username='pakar')
+        self.assertTrue(is_pakar(pakar))
+        self.assertTrue(pakar.has_perm('core.add_aturan'))
+        self.assertFalse(pakar.has_perm('core.delete_pasien'))
+        # Izin grup tidak berubah pada jalankan berikutnya
+        grup = siapkan_grup()
+        self.assertFalse(grup[GRUP_PAKAR][1])
+
+    def test_hash_paralel(self):
+        hashes = hash_kata_sandi([f'rahasia{i}' for i in range(10)], proses=2)
+        self.assertTrue(all(check_password(f'rahasia{i}', h) for i, h in enumerate(hashes)))
+        self.assertEqual(len(set(hashes)), 10)
+
+    def test_provisi_dari_berkas(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, newline='') as berkas:
+            writer = csv.writer(berkas)
+            writer.writerow(['username', 'password', 'first_name'])
+            for i in range(10):
+                writer.writerow([f'kader{i}', f'sandi{i}', f'Kader {i}'])
+        self.addCleanup(os.unlink, berkas.name)
+
+        self.jalankan('--berkas', berkas.name, '--proses', '2')
+        self.jalankan('--berkas', berkas.name, '--proses', '2')
+
+        kader = User.objects.filter(username__startswith='kader')
+        self.assertEqual(kader.count(), 10)
+        k3 = kader.get(username='kader3')
+        self.assertTrue(k3.check_password('sandi3'))
+        self.assertEqual(k3.first_name, 'Kader 3')
+        self.assertTrue(is_pakar(k3))
+
+    def test_akun_yang_dibuat_proses_lain_tidak_masuk_grup(self):
+        grup = Group.objects.create(name=GRUP_PAKAR)
+        akun, _ = siapkan_akun_pakar([
+            {'username': 'kader1', 'password': 'sandi1'},
+            {'username': 'kader2', 'password': 'sandi2'},
+        ], proses=1)
+        # Pendaftaran lain membuat kader1 setelah siapkan_akun_pakar
+        lain = User.objects.create_user(username='kader1', password='lain')
+
+        self.assertEqual(simpan_akun_pakar(akun, grup), 1)
+        self.assertFalse(is_pakar(User.objects.get(pk=lain.pk)))
+        self.assertTrue(lain.check_password('lain'))
+        self.assertTrue(is_pakar(User.objects.get(username='kader2')))
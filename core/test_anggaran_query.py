@@ -0,0 +1,263 @@
+"""
+Anggaran query per view untuk setiap route di core/urls.py.
+
+Setiap route dipanggil dengan peran yang benar pada dataset kecil, lalu lagi
+setelah dataset diperbesar (lebih banyak pasien, pengukuran, konsultasi dan
+gejala per konsultasi). Jumlah query harus sama di kedua ukuran (tidak
+tumbuh mengikuti jumlah baris) dan tidak melebihi anggaran di ANGGARAN.
+Route baru di core/urls.py wajib didaftarkan di ANGGARAN.
+"""
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.models import User, Group
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import urls as core_urls
+from .basis_pengetahuan import baca_berkas, muat_basis_pengetahuan, tambah_kelompok_aturan
+from .models import Pasien, PengukuranFisik, Konsultasi, DetailKonsultasi, Gejala, Kondisi, Aturan
+from .pencarian import fts_tersedia
+from .sample_data import buat_populasi
+from .statistik import hitung_ulang_statistik
+from .views import jalankan_inferensi
+
+PUBLIK, PASIEN, PAKAR = 'publik', 'pasien', 'pakar'
+
+# nama route -> (peran, metode, anggaran query maksimum)
+# delete_gejala_pakar/delete_kondisi_pakar menghapus langsung (cascade aturan & konsultasi),
+# diukur terhadap objek sekali pakai yang ikut membesar bersama dataset
+ANGGARAN = {
+    'home': (PUBLIK, 'get', 0),
+    'registrasi_pasien': (PUBLIK, 'get', 0),
+    'login_pasien': (PUBLIK, 'get', 0),
+    'login_pakar': (PUBLIK, 'get', 0),
+    'kurva_referensi': (PUBLIK, 'get', 0),
+    'logout_pakar': (PAKAR, 'get', 4),
+    'logout_pasien': (PASIEN, 'get', 3),
+    'dashboard_pasien': (PASIEN, 'get', 6),
+    'edit_akun_pasien': (PASIEN, 'get', 3),
+    'input_pengukuran': (PASIEN, 'get', 4),
+    'form_diagnosa': (PASIEN, 'get', 3),
+    'tampilkan_hasil_diagnosa': (PASIEN, 'get', 3),
+    'tampilkan_grafik_riwayat': (PASIEN, 'get', 2),
+    'data_grafik_riwayat': (PASIEN, 'get', 5),
+    'dashboard_pakar': (PAKAR, 'get', 8),
+    'pakar_help': (PAKAR, 'get', 4),
+    'create_rule_group': (PAKAR, 'get', 6),
+    'list_patients_pakar': (PAKAR, 'get', 6),
+    'cari_pasien_pakar': (PAKAR, 'get', 4),
+    'detail_pasien_pakar': (PAKAR, 'get', 9),
+    'fragmen_konsultasi_pakar': (PAKAR, 'get', 7),
+    'create_pasien_pakar': (PAKAR, 'get', 4),
+    'impor_pasien_pakar': (PAKAR, 'get', 4),
+    'edit_pasien_pakar': (PAKAR, 'get', 5),
+    'delete_pasien_pakar': (PAKAR, 'get', 5),
+    'ekspor_data_pakar': (PAKAR, 'get', 6),
+    'diagnostik_profil_pakar': (PAKAR, 'get', 4),
+    'diagnostik_profil_json': (PAKAR, 'get', 4),
+    'list_rules_pakar': (PAKAR, 'get', 6),
+    'show_rule_detail': (PAKAR, 'get', 6),
+    'edit_rule_pakar': (PAKAR, 'get', 7),
+    'delete_rule_pakar': (PAKAR, 'get', 6),
+    'list_pengukuran_pakar': (PAKAR, 'get', 6),
+    'create_pengukuran_pakar': (PAKAR, 'get', 3),
+    'impor_pengukuran_pakar': (PAKAR, 'get', 4),
+    'edit_pengukuran_pakar': (PAKAR, 'get', 4),
+    'delete_pengukuran_pakar': (PAKAR, 'get', 5),
+    'list_gejala_pakar': (PAKAR, 'get', 5),
+    'create_gejala_pakar': (PAKAR, 'get', 4),
+    'edit_gejala_pakar': (PAKAR, 'get', 5),
+    'delete_gejala_pakar': (PAKAR, 'get', 21),
+    'list_kondisi_pakar': (PAKAR, 'get', 5),
+    'create_kondisi_pakar': (PAKAR, 'get', 4),
+    'edit_kondisi_pakar': (PAKAR, 'get', 5),
+    'delete_kondisi_pakar': (PAKAR, 'get', 28),
+}
+
+
+class AnggaranQueryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        muat_basis_pengetahuan(baca_berkas())
+        buat_populasi(5, seed=11)
+        # Pemeriksaan tabel FTS sekali per proses, bukan bagian biaya per request
+        fts_tersedia()
+
+        cls.pakar = User.objects.create_user(username='pakar', password='rahasia123', is_staff=True)
+        cls.pakar.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+
+        cls.pasien = Pasien(namaPengguna='anakuji', nama='Anak Uji', jenisKelamin='P', tanggalLahir=date(2022, 1, 10))
+        cls.pasien.set_password('rahasia123')
+        cls.pasien.save()
+        cls.tambah_riwayat(cls.pasien, pengukuran=2, konsultasi=2, gejala_per_konsultasi=2)
+
+    @classmethod
+    def tambah_riwayat(cls, pasien, pengukuran, konsultasi, gejala_per_konsultasi):
+        awal = PengukuranFisik.objects.filter(pasien=pasien).count()
+        PengukuranFisik.objects.bulk_create([
+            PengukuranFisik(
+                pasien=pasien, tanggalUkur=pasien.tanggalLahir + timedelta(days=30 * (awal + i + 1)),
+                beratBadan=8 + (awal + i) * 0.2, tinggiBadan=70 + (awal + i) * 0.5,
+                skor_Z_BB_U=-1, skor_Z_TB_U=-1.5,
+            )
+            for i in range(pengukuran)
+        ])
+        kode_gejala = list(Gejala.objects.order_by('kodeGejala').values_list('kodeGejala', flat=True))
+        for i in range(konsultasi):
+            jalankan_inferensi(pasien.id, kode_gejala[i % 3:i % 3 + gejala_per_konsultasi])
+
+    ukuran = 2
+
+    def perbesar_data(self):
+        buat_populasi(80, seed=12)
+        self.tambah_riwayat(self.pasien, pengukuran=30, konsultasi=25, gejala_per_konsultasi=8)
+        # Basis pengetahuan ikut membesar: kelompok aturan tambahan untuk kondisi yang diukur
+        kondisi = Kondisi.objects.order_by('kodeKondisi').first()
+        kode_gejala = list(Gejala.objects.order_by('kodeGejala').values_list('kodeGejala', flat=True))
+        for i in range(10):
+            tambah_kelompok_aturan(kondisi.pk, f'RX{i:02d}', kode_gejala[i:i + 4])
+        self.ukuran = 20
+
+    def objek_sekali_pakai(self, nama):
+        """Gejala/Kondisi baru dengan self.ukuran aturan dan konsultasi di tanggal berbeda"""
+        kode = f'X{Gejala.objects.count() + Kondisi.objects.count()}'
+        kondisi_lain = list(Kondisi.objects.order_by('kodeKondisi').values_list('kodeKondisi', flat=True))
+        gejala_lain = list(Gejala.objects.order_by('kodeGejala').values_list('kodeGejala', flat=True))
+        if nama == 'delete_gejala_pakar':
+            objek = Gejala.objects.create(kodeGejala=kode, namaGejala='Gejala sekali pakai')
+            Aturan.objects.bulk_create([
+                Aturan(kondisi_id=kondisi_lain[i % len(kondisi_lain)], gejala=objek, kodeKelompokAturan=f'RH{i:02d}')
+                for i in range(self.ukuran)
+            ])
+        else:
+            objek = Kondisi.objects.create(kodeKondisi=kode, namaKondisi='Kondisi sekali pakai', deskripsi='-', solusi='-')
+            Aturan.objects.bulk_create([
+                Aturan(kondisi=objek, gejala_id=gejala_lain[i % len(gejala_lain)], kodeKelompokAturan=f'RH{i:02d}')
+                for i in range(self.ukuran)
+            ])
+        konsultasi = Konsultasi.objects.bulk_create([
+            Konsultasi(pasien=self.pasien, hasilKondisi=objek if isinstance(objek, Kondisi) else None)
+            for _ in range(self.ukuran)
+        ])
+        for i, k in enumerate(konsultasi):
+            Konsultasi.objects.filter(pk=k.pk).update(
+                tanggalKonsultasi=timezone.make_aware(datetime.combine(date(2024, 1, 1) + timedelta(days=i), time(9)))
+            )
+        if isinstance(objek, Gejala):
+            DetailKonsultasi.objects.bulk_create([DetailKonsultasi(konsultasi=k, gejala=objek) for k in konsultasi])
+        hitung_ulang_statistik()
+        return objek.pk
+
+    def argumen_route(self, nama):
+        konsultasi = Konsultasi.objects.filter(pasien=self.pasien).order_by('-id').first()
+        pengukuran = PengukuranFisik.objects.filter(pasien=self.pasien).order_by('-id').first()
+        kondisi = Kondisi.objects.order_by('kodeKondisi').first()
+        gejala = Gejala.objects.order_by('kodeGejala').first()
+        return {
+            'kurva_referensi': ['1', 'L', 'tb_u'],
+            'tampilkan_hasil_diagnosa': [konsultasi.id],
+            'tampilkan_grafik_riwayat': [self.pasien.id],
+            'data_grafik_riwayat': [self.pasien.id],
+            'detail_pasien_pakar': [self.pasien.id],
+            'fragmen_konsultasi_pakar': [self.pasien.id],
+            'edit_pasien_pakar': [self.pasien.id],
+            'delete_pasien_pakar': [self.pasien.id],
+            'ekspor_data_pakar': ['konsultasi', 'csv'],
+            'show_rule_detail': [kondisi.pk],
+            'edit_rule_pakar': [kondisi.pk],
+            'delete_rule_pakar': [kondisi.pk],
+            'edit_pengukuran_pakar': [pengukuran.pk],
+            'delete_pengukuran_pakar': [pengukuran.pk],
+            'edit_gejala_pakar': [gejala.pk],
+            'edit_kondisi_pakar': [kondisi.pk],
+        }.get(nama, [])
+
+    def parameter_route(self, nama):
+        return {
+            'cari_pasien_pakar': {'q': self.pasien.nama[:3]},
+        }.get(nama)
+
+    def klien(self, peran):
+        klien = Client()
+        if peran == PAKAR:
+            klien.force_login(self.pakar)
+        elif peran == PASIEN:
+            sesi = klien.session
+            sesi['pasien_id'] = self.pasien.id
+            sesi['pasien_nama'] = self.pasien.nama
+            sesi.save()
+        return klien
+
+    def hitung_query(self, nama):
+        peran, metode, _ = ANGGARAN[nama]
+        if nama in ('delete_gejala_pakar', 'delete_kondisi_pakar'):
+            url = reverse(nama, args=[self.objek_sekali_pakai(nama)])
+        else:
+            url = reverse(nama, args=self.argumen_route(nama))
+        klien = self.klien(peran)
+        # Cache per proses (pasien, peran) dikosongkan agar setiap pengukuran setara
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(klien, metode)(url, self.parameter_route(nama))
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertIn(response.status_code, (200, 302, 404), f'{nama}: status {response.status_code}')
+        return len(ctx.captured_queries)
+
+    def hitung_semua(self):
+        return {nama: self.hitung_query(nama) for nama in ANGGARAN}
+
+    def test_semua_route_terdaftar(self):
+        route = {p.name for p in core_urls.urlpatterns}
+        self.assertEqual(route - set(ANGGARAN), set(), 'Route baru harus diberi anggaran query')
+        self.assertEqual(set(ANGGARAN) - route, set())
+
+    def test_jumlah_query_tetap_saat_data_bertambah(self):
+        kecil = self.hitung_semua()
+        self.perbesar_data()
+        besar = self.hitung_semua()
+        for nama, (_, _, anggaran) in ANGGARAN.items():
+            with self.subTest(route=nama):
+                self.assertEqual(besar[nama], kecil[nama], f'{nama}: query tumbuh {kecil[nama]} -> {besar[nama]}')
+                self.assertLessEqual(besar[nama], anggaran, f'{nama}: {besar[nama]} query melebihi anggaran {anggaran}')
+
+    def hitung_inferensi(self, jumlah_gejala):
+        kode_gejala = list(Gejala.objects.order_by('kodeGejala').values_list('kodeGejala', flat=True))
+        with CaptureQueriesContext(connection) as ctx:
+            jalankan_inferensi(self.pasien.id, kode_gejala[:jumlah_gejala])
+        return len(ctx.captured_queries)
+
+    def test_inferensi_tidak_query_per_gejala(self):
+        sedikit = self.hitung_inferensi(1)
+        banyak = self.hitung_inferensi(15)
+        self.assertEqual(sedikit, banyak)
+        # pasien, gejala, aturan, insert konsultasi & detail, signal ringkasan/statistik (+ savepoint)
+        self.assertLessEqual(banyak, 15)
+
+    def test_post_diagnosa_dan_pengukuran_tidak_tumbuh(self):
+        def post(nama, data):
+            # Dikirim dua kali, yang diukur kedua: baris rollup tanggal itu sudah ada di kedua ukuran data
+            klien = self.klien(PASIEN)
+            klien.post(reverse(nama), data)
+            cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                response = klien.post(reverse(nama), data)
+            self.assertEqual(response.status_code, 302)
+            return len(ctx.captured_queries)
+
+        kode_gejala = list(Gejala.objects.order_by('kodeGejala').values_list('kodeGejala', flat=True))
+        tanggal = [(self.pasien.tanggalLahir + timedelta(days=n)).isoformat() for n in (1000, 1001)]
+        kecil = (
+            post('form_diagnosa', {'gejala': kode_gejala[:2]}),
+            post('input_pengukuran', {'tanggal_ukur': tanggal[0], 'berat_badan': '11', 'tinggi_badan': '85'}),
+        )
+        self.perbesar_data()
+        besar = (
+            post('form_diagnosa', {'gejala': kode_gejala[:12]}),
+            post('input_pengukuran', {'tanggal_ukur': tanggal[1], 'berat_badan': '11.2', 'tinggi_badan': '85.5'}),
+        )
+        self.assertEqual(kecil, besar)
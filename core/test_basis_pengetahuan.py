@@ -0,0 +1,87 @@
+import copy
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .basis_pengetahuan import KesalahanBasisPengetahuan, baca_berkas, muat_basis_pengetahuan
+from .models import Pasien, Gejala, Kondisi, Aturan, Konsultasi, DetailKonsultasi, StatistikTotal
+
+
+class BasisPengetahuanTest(TestCase):
+    def setUp(self):
+        self.data = baca_berkas()
+
+    def test_berkas_bawaan(self):
+        call_command('load_knowledge_base', stdout=StringIO())
+        self.assertEqual(Gejala.objects.count(), 25)
+        self.assertEqual(Kondisi.objects.count(), 6)
+        self.assertEqual(Aturan.objects.count(), 29)
+        self.assertEqual(StatistikTotal.objects.get(nama=StatistikTotal.ATURAN).jumlah, 29)
+
+    def test_idempoten(self):
+        muat_basis_pengetahuan(self.data)
+        ids = set(Aturan.objects.values_list('id', flat=True))
+        # Pemuatan kedua: tidak ada tulis sama sekali selain counter statistik
+        with self.assertNumQueries(9):
+            ringkasan = muat_basis_pengetahuan(self.data)
+        self.assertEqual(ringkasan['aturan'], {'dibuat': 0, 'diubah': 0, 'dihapus': 0})
+        self.assertEqual(ringkasan['gejala'], {'dibuat': 0, 'diubah': 0})
+        self.assertEqual(set(Aturan.objects.values_list('id', flat=True)), ids)
+
+    def test_riwayat_konsultasi_tidak_hilang(self):
+        muat_basis_pengetahuan(self.data)
+        pasien = Pasien.objects.create(namaPengguna="anak1", nama="Anak", jenisKelamin="L", tanggalLahir="2020-01-01")
+        konsultasi = Konsultasi.objects.create(pasien=pasien, hasilKondisi_id='K01')
+        DetailKonsultasi.objects.create(konsultasi=konsultasi, gejala_id='G01')
+
+        data = copy.deepcopy(self.data)
+        data['gejala'] = [g for g in data['gejala'] if g['kode'] not in ('G01', 'G25')]
+        data['aturan'] = [a for a in data['aturan'] if a['kelompok'] not in ('R01', 'R06')]
+        data['aturan'].append({'kelompok': 'R06', 'kondisi': 'K06', 'gejala': ['G21', 'G22']})
+        data['kondisi'][1]['nama'] = 'Gizi Buruk (Berat)'
+        ringkasan = muat_basis_pengetahuan(data, hapus_tidak_terpakai=True)
+
+        self.assertEqual(ringkasan['kondisi']['diubah'], 1)
+        self.assertEqual(ringkasan['aturan']['dihapus'], 4)
+        # G01 dipakai riwayat: dipertahankan; G25 tidak dipakai: dihapus
+        self.assertEqual(ringkasan['gejala']['dipertahankan'], 1)
+        self.assertTrue(Gejala.objects.filter(pk='G01').exists())
+        self.assertFalse(Gejala.objects.filter(pk='G25').exists())
+        self.assertEqual(DetailKonsultasi.objects.count(), 1)
+        self.assertEqual(Kondisi.objects.get(pk='K02').namaKondisi, 'Gizi Buruk (Berat)')
+        self.assertEqual(StatistikTotal.objects.get(nama=StatistikTotal.ATURAN).jumlah, Aturan.objects.count())
+
+    def test_referensi_tidak_dikenal_tidak_menulis_apa_pun(self):
+        data = copy.deepcopy(self.data)
+        data['aturan'].append({'kelompok': 'R99', 'kondisi': 'K01', 'gejala': ['G99']})
+        with self.assertRaises(KesalahanBasisPengetahuan):
+            muat_basis_pengetahuan(data)
+        self.assertEqual(Gejala.objects.count(), 0)
+
+    def test_struktur_salah_dilaporkan_per_entri(self):
+        for ubah, pesan in (
+            (lambda d: d['gejala'][2].pop('kode'), 'gejala ke-3: "kode" wajib diisi teks'),
+            (lambda d: d['kondisi'].append('K07'), 'kondisi ke-7: entri harus berupa objek'),
+            (lambda d: d['aturan'][0].update(gejala='G01'), 'aturan ke-1: "gejala" harus berupa list kode gejala'),
+            (lambda d: d['kondisi'][0].update(solusi=None), 'kondisi ke-1: "solusi" harus berupa teks'),
+        ):
+            data = copy.deepcopy(self.data)
+            ubah(data)
+            with self.subTest(pesan=pesan), self.assertRaisesMessage(KesalahanBasisPengetahuan, pesan):
+                muat_basis_pengetahuan(data)
+
+    def test_sepuluh_ribu_aturan(self):
+        data = copy.deepcopy(self.data)
+        data['gejala'] += [{'kode': f'X{i:04d}', 'nama': f'Gejala {i}'} for i in range(2000)]
+        data['aturan'] += [
+            {'kelompok': f'B{i:04d}', 'kondisi': 'K01', 'gejala': [f'X{(i * 5 + j) % 2000:04d}' for j in range(5)]}
+            for i in range(2000)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            ringkasan = muat_basis_pengetahuan(data)
+        self.assertEqual(ringkasan['aturan']['dibuat'], 10029)
+        # Ditulis per batch, bukan satu INSERT/SELECT per aturan
+        self.assertLess(len(queries), 100)
@@ -0,0 +1,94 @@
+from django.contrib.auth.models import User, Group
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Gejala, Kondisi, Aturan, Pasien, VersiBasisPengetahuan
+from .versi_kb import PK_VERSI, penanda_kb
+
+
+class FragmenKbTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.kondisi = Kondisi.objects.create(kodeKondisi="K01", namaKondisi="Stunting", deskripsi="-", solusi="-")
+        for i in range(1, 4):
+            Gejala.objects.create(kodeGejala=f"G0{i}", namaGejala=f"Gejala {i}")
+        Aturan.objects.create(kondisi=self.kondisi, gejala_id="G01", kodeKelompokAturan="R01")
+
+        self.pasien = Client()
+        pasien = Pasien.objects.create(nama="Budi", namaPengguna="budi", kataSandi="x", jenisKelamin="L", tanggalLahir="2022-01-01")
+        sesi = self.pasien.session
+        sesi['pasien_id'] = pasien.id
+        sesi.save()
+
+        self.pakar = Client()
+        user = User.objects.create_user(username='pakar', password='password123', is_staff=True)
+        user.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+        self.pakar.login(username='pakar', password='password123')
+
+    def query_kb(self, klien, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = klien.get(url)
+        self.assertEqual(response.status_code, 200)
+        tabel = ('core_gejala', 'core_kondisi', 'core_aturan')
+        self.assertEqual(sum('core_versibasispengetahuan' in q['sql'] for q in ctx.captured_queries), 1)
+        return response, [q['sql'] for q in ctx.captured_queries if any(t in q['sql'] for t in tabel)]
+
+    def test_form_diagnosa_tanpa_query_kb_saat_fragmen_ada(self):
+        url = reverse('form_diagnosa')
+        pertama, query = self.query_kb(self.pasien, url)
+        self.assertTrue(query)
+        kedua, query = self.query_kb(self.pasien, url)
+        self.assertEqual(query, [])
+        self.assertContains(kedua, 'Gejala 3')
+        # Token CSRF di luar fragmen tetap per request
+        self.assertContains(kedua, 'csrfmiddlewaretoken')
+
+    def test_daftar_pakar_tanpa_query_kb_saat_fragmen_ada(self):
+        for nama in ('list_gejala_pakar', 'list_kondisi_pakar', 'list_rules_pakar'):
+            with self.subTest(route=nama):
+                self.query_kb(self.pakar, reverse(nama))
+                _, query = self.query_kb(self.pakar, reverse(nama))
+                self.assertEqual(query, [])
+
+    def test_perubahan_kb_membuang_fragmen(self):
+        url = reverse('form_diagnosa')
+        self.query_kb(self.pasien, url)
+        Gejala.objects.filter(kodeGejala="G02").first().delete()
+        Gejala.objects.create(kodeGejala="G09", namaGejala="Gejala baru")
+        response, query = self.query_kb(self.pasien, url)
+        self.assertTrue(query)
+        self.assertContains(response, 'Gejala baru')
+        self.assertNotContains(response, 'Gejala 2')
+
+    def test_perubahan_aturan_membuang_fragmen_aturan(self):
+        url = reverse('list_rules_pakar')
+        self.query_kb(self.pakar, url)
+        Aturan.objects.create(kondisi=self.kondisi, gejala_id="G03", kodeKelompokAturan="R07")
+        response, _ = self.query_kb(self.pakar, url)
+        self.assertContains(response, 'R07')
+
+    def test_pencarian_punya_fragmen_sendiri(self):
+        url = reverse('list_gejala_pakar')
+        self.query_kb(self.pakar, url)
+        response, _ = self.query_kb(self.pakar, url + '?q=Gejala 2')
+        self.assertContains(response, 'Gejala 2')
+        self.assertNotContains(response, 'Gejala 1<')
+
+    def test_penanda_berubah_saat_kb_berubah(self):
+        awal = penanda_kb()
+        Gejala.objects.create(kodeGejala="G08", namaGejala="Gejala 8")
+        self.assertNotEqual(penanda_kb(), awal)
+
+    def test_perubahan_dari_proses_lain_langsung_terlihat(self):
+        # Worker lain menaikkan versi di database; cache proses ini tidak dibuang oleh siapa pun
+        url = reverse('form_diagnosa')
+        self.query_kb(self.pasien, url)
+        Gejala.objects.bulk_create([Gejala(kodeGejala="G07", namaGejala="Gejala dari worker lain")])
+        VersiBasisPengetahuan.objects.filter(pk=PK_VERSI).update(versi=F('versi') + 1, diperbarui=timezone.now())
+        response, _ = self.query_kb(self.pasien, url)
+        self.assertContains(response, 'Gejala dari worker lain')
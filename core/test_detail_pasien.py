@@ -0,0 +1,61 @@
+from django.contrib.auth.models import User, Group
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Pasien, Konsultasi, DetailKonsultasi, Gejala, Kondisi
+from .views import KONSULTASI_PER_HALAMAN
+
+
+class DetailPasienPakarTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        pakar = User.objects.create_user(username='pakar', password='password123', is_staff=True)
+        pakar.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+        self.client.login(username='pakar', password='password123')
+        self.pasien = Pasien.objects.create(
+            namaPengguna="testpasien", nama="Test Pasien", jenisKelamin="L", tanggalLahir="2020-01-01"
+        )
+        self.kondisi = Kondisi.objects.create(
+            kodeKondisi="K01", namaKondisi="Stunting", deskripsi="-", solusi="-"
+        )
+        self.gejala = [
+            Gejala.objects.create(kodeGejala=f"G0{i}", namaGejala=f"Gejala {i}") for i in range(1, 4)
+        ]
+
+    def buat_konsultasi(self, jumlah):
+        for _ in range(jumlah):
+            konsultasi = Konsultasi.objects.create(pasien=self.pasien, hasilKondisi=self.kondisi)
+            for gejala in self.gejala:
+                DetailKonsultasi.objects.create(konsultasi=konsultasi, gejala=gejala)
+
+    def hitung_query(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_jumlah_query_tidak_bertambah_dengan_riwayat(self):
+        url = reverse('detail_pasien_pakar', args=[self.pasien.id])
+        self.buat_konsultasi(2)
+        sedikit, _ = self.hitung_query(url)
+        self.buat_konsultasi(40)
+        banyak, response = self.hitung_query(url)
+        self.assertEqual(sedikit, banyak)
+        self.assertEqual(len(response.context['konsultasi_list']), KONSULTASI_PER_HALAMAN)
+        self.assertContains(response, 'G03', count=KONSULTASI_PER_HALAMAN)
+
+    def test_fragmen_memuat_konsultasi_lebih_lama(self):
+        self.buat_konsultasi(KONSULTASI_PER_HALAMAN + 3)
+        response = self.client.get(reverse('detail_pasien_pakar', args=[self.pasien.id]))
+        page = response.context['page']
+        self.assertTrue(page.has_next)
+        fragmen = self.client.get(
+            reverse('fragmen_konsultasi_pakar', args=[self.pasien.id]) + page.next_query
+        )
+        self.assertEqual(len(fragmen.context['konsultasi_list']), 3)
+        self.assertFalse(fragmen.context['page'].has_next)
+        self.assertNotContains(fragmen, 'Muat konsultasi lebih lama')
+        semua = [k.id for k in page] + [k.id for k in fragmen.context['konsultasi_list']]
+        self.assertEqual(sorted(semua), sorted(Konsultasi.objects.values_list('id', flat=True)))
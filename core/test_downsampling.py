@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.test import TestCase, SimpleTestCase, Client
+from django.urls import reverse
+
+from .downsampling import lttb, pilih_titik_grafik
+from .models import Pasien, PengukuranFisik
+
+
+def buat_seri(jumlah, fungsi):
+    awal = date(2020, 1, 1)
+    return [
+        {'tgl': (awal + timedelta(days=30 * i)).isoformat(), 'score': fungsi(i)}
+        for i in range(jumlah)
+    ]
+
+
+class LttbTest(SimpleTestCase):
+    def test_jumlah_titik_dan_ujung(self):
+        x = np.arange(1000, dtype=float)
+        y = np.sin(x / 50)
+        indeks = lttb(x, y, 100)
+        self.assertEqual(len(indeks), 100)
+        self.assertEqual(indeks[0], 0)
+        self.assertEqual(indeks[-1], 999)
+        self.assertTrue(np.all(np.diff(indeks) > 0))
+
+    def test_puncak_dipertahankan(self):
+        y = np.zeros(500)
+        y[250] = 10.0
+        indeks = lttb(np.arange(500, dtype=float), y, 20)
+        self.assertIn(250, indeks)
+
+    def test_seri_pendek_tidak_diubah(self):
+        self.assertEqual(list(lttb([1, 2, 3], [0, 1, 0], 10)), [0, 1, 2])
+
+
+class PilihTitikGrafikTest(SimpleTestCase):
+    def test_titik_klinis_selalu_ada(self):
+        seri = buat_seri(300, lambda i: -2.5 if i in (17, 150, 233) else 0.5 * np.sin(i / 7))
+        hasil = pilih_titik_grafik(seri, 40)
+        self.assertLessEqual(len(hasil), 40)
+        tanggal = {titik['tgl'] for titik in hasil}
+        for i in (0, 17, 150, 233, 299):
+            self.assertIn(seri[i]['tgl'], tanggal)
+
+    def test_score_kosong_dibuang(self):
+        seri = buat_seri(5, lambda i: None if i == 2 else 0.0)
+        self.assertEqual(len(pilih_titik_grafik(seri, 100)), 4)
+
+
+class DataGrafikDownsamplingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.pasien = Pasien(
+            namaPengguna="testuser", nama="Test User", jenisKelamin="L", tanggalLahir="2015-01-01"
+        )
+        self.pasien.set_password("testpassword")
+        self.pasien.save()
+        self.client.post(reverse('login_pasien'), {
+            'nama_pengguna': 'testuser',
+            'kata_sandi': 'testpassword'
+        })
+        PengukuranFisik.objects.bulk_create([
+            PengukuranFisik(
+                pasien=self.pasien, tanggalUkur=date(2015, 1, 1) + timedelta(days=7 * i),
+                beratBadan=10, tinggiBadan=80, skor_Z_BB_U=0.1 * (i % 10), skor_Z_TB_U=-0.01 * i
+            )
+            for i in range(300)
+        ])
+        self.url = reverse('data_grafik_riwayat', args=[self.pasien.id])
+
+    def test_target_titik(self):
+        data = self.client.get(self.url, {'titik': 60}).json()
+        self.assertEqual(data['jumlah_pengukuran'], 300)
+        self.assertLessEqual(len(data['bb_u']), 60)
+        # TB/U turun di bawah -2 setelah titik ke-200: semua titik itu tetap dikirim
+        self.assertEqual(len([t for t in data['tb_u'] if t['score'] <= -2]), 100)
+
+    def test_tanpa_target_seri_utuh(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual(len(data['tb_u']), 300)
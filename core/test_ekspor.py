@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+from datetime import date, datetime, time
+
+from django.contrib.auth.models import User, Group
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .ekspor import stream_ekspor
+from .models import Pasien, Gejala, Kondisi, Konsultasi, DetailKonsultasi, PengukuranFisik
+from .ringkasan import hitung_ulang_ringkasan
+
+
+class EksporTest(TestCase):
+    def setUp(self):
+        self.pasien = Pasien.objects.create(
+            namaPengguna="anak1", nama="Anak Satu", jenisKelamin="L", tanggalLahir=date(2020, 1, 15)
+        )
+        self.k01 = Kondisi.objects.create(kodeKondisi="K01", namaKondisi="Stunting", deskripsi="-", solusi="-")
+        self.k02 = Kondisi.objects.create(kodeKondisi="K02", namaKondisi="Normal", deskripsi="-", solusi="-")
+        for kode in ("G01", "G02", "G03"):
+            Gejala.objects.create(kodeGejala=kode, namaGejala=kode)
+        self.konsultasi = []
+        for kondisi, gejala in ((self.k01, ["G01", "G02"]), (None, []), (self.k02, ["G03"])):
+            k = Konsultasi.objects.create(pasien=self.pasien, hasilKondisi=kondisi)
+            for kode in gejala:
+                DetailKonsultasi.objects.create(konsultasi=k, gejala_id=kode)
+            self.konsultasi.append(k)
+        for i, tgl in enumerate((date(2021, 1, 1), date(2021, 2, 1), date(2021, 3, 1))):
+            PengukuranFisik.objects.create(
+                pasien=self.pasien, tanggalUkur=tgl, beratBadan=9 + i, tinggiBadan=75 + i, skor_Z_BB_U=-1.5
+            )
+        hitung_ulang_ringkasan()
+
+    def test_csv_pengukuran_dengan_filter_tanggal(self):
+        teks = ''.join(stream_ekspor('pengukuran', 'csv', dari=date(2021, 2, 1)))
+        baris = list(csv.DictReader(io.StringIO(teks)))
+        self.assertEqual([b['tanggal_ukur'] for b in baris], ['2021-03-01', '2021-02-01'])
+        self.assertEqual(baris[0]['nama_pengguna'], 'anak1')
+        self.assertEqual(baris[0]['zscore_bb_u'], '-1.5')
+        self.assertEqual(baris[0]['lingkar_kepala'], '')
+
+    def test_header_dikirim_lebih_dulu(self):
+        potongan = stream_ekspor('pengukuran', 'csv', chunk_size=2)
+        self.assertTrue(next(potongan).startswith('id,nama_pengguna'))
+        # Tiga baris dengan chunk 2: dua potongan data
+        self.assertEqual(len(list(potongan)), 2)
+
+    def test_jsonl_konsultasi_menggabungkan_gejala(self):
+        # chunk kecil memaksa kedua stream berjalan lintas beberapa fetch
+        teks = ''.join(stream_ekspor('konsultasi', 'jsonl', chunk_size=1))
+        baris = [json.loads(b) for b in teks.splitlines()]
+        self.assertEqual([b['id'] for b in baris], [k.id for k in self.konsultasi])
+        self.assertEqual([b['gejala'] for b in baris], [['G01', 'G02'], [], ['G03']])
+        self.assertEqual(baris[0]['kode_kondisi'], 'K01')
+        self.assertIsNone(baris[1]['kode_kondisi'])
+
+    def test_filter_diagnosa(self):
+        teks = ''.join(stream_ekspor('konsultasi', 'csv', kondisi='K02'))
+        baris = list(csv.DictReader(io.StringIO(teks)))
+        self.assertEqual(len(baris), 1)
+        self.assertEqual(baris[0]['gejala'], 'G03')
+        # Pengukuran difilter menurut diagnosa terakhir pasien
+        self.assertEqual(len(list(csv.DictReader(io.StringIO(''.join(stream_ekspor('pengukuran', 'csv', kondisi='K02')))))), 3)
+        self.assertEqual(len(list(csv.DictReader(io.StringIO(''.join(stream_ekspor('pengukuran', 'csv', kondisi='K01')))))), 0)
+
+    @override_settings(TIME_ZONE='Asia/Jakarta')
+    def test_filter_tanggal_konsultasi_mengikuti_zona_waktu_lokal(self):
+        for k, (tanggal, jam) in zip(self.konsultasi, (
+            (date(2021, 1, 31), time(23, 59)), (date(2021, 2, 1), time(0, 0)), (date(2021, 2, 2), time(0, 0)),
+        )):
+            Konsultasi.objects.filter(id=k.id).update(tanggalKonsultasi=timezone.make_aware(datetime.combine(tanggal, jam)))
+        teks = ''.join(stream_ekspor('konsultasi', 'jsonl', dari=date(2021, 2, 1), sampai=date(2021, 2, 1)))
+        self.assertEqual([json.loads(b)['id'] for b in teks.splitlines()], [self.konsultasi[1].id])
+
+    def test_management_command(self):
+        keluaran = io.StringIO()
+        call_command('ekspor_data', 'konsultasi', '--format', 'jsonl', stdout=keluaran)
+        baris = [json.loads(b) for b in keluaran.getvalue().splitlines()]
+        self.assertEqual(len(baris), 3)
+
+
+class EksporViewTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        pakar = User.objects.create_user(username='pakar', password='password123', is_staff=True)
+        pakar.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+        pasien = Pasien.objects.create(
+            namaPengguna="anak1", nama="Anak Satu", jenisKelamin="L", tanggalLahir=date(2020, 1, 15)
+        )
+        PengukuranFisik.objects.create(pasien=pasien, tanggalUkur=date(2021, 1, 1), beratBadan=9, tinggiBadan=75)
+        self.url = reverse('ekspor_data_pakar', args=['pengukuran', 'csv'])
+        self.client.login(username='pakar', password='password123')
+
+    def test_streaming_response(self):
+        response = self.client.get(self.url, {'dari': '2020-12-01'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="pengukuran_dari-2020-12-01.csv"', response['Content-Disposition'])
+        isi = b''.join(response.streaming_content).decode()
+        self.assertEqual(len(isi.strip().splitlines()), 2)
+
+    def test_format_tidak_dikenal(self):
+        response = self.client.get(reverse('ekspor_data_pakar', args=['pengukuran', 'xlsx']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_bukan_pakar_ditolak(self):
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,102 @@
+import json
+from datetime import date
+
+from django.contrib.auth.models import User, Group
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Pasien, PengukuranFisik
+from .referensi import VERSI_REFERENSI, hitung_kurva, parameter_referensi
+
+
+class DataGrafikRiwayatTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.pasien = Pasien(
+            namaPengguna="testuser", nama="Test User", jenisKelamin="L", tanggalLahir="2020-01-01"
+        )
+        self.pasien.set_password("testpassword")
+        self.pasien.save()
+        self.client.post(reverse('login_pasien'), {
+            'nama_pengguna': 'testuser',
+            'kata_sandi': 'testpassword'
+        })
+        self.ukur(date(2021, 1, 1), -1.5)
+        self.url = reverse('data_grafik_riwayat', args=[self.pasien.id])
+
+    def ukur(self, tanggal, z_tb_u):
+        return PengukuranFisik.objects.create(
+            pasien=self.pasien, tanggalUkur=tanggal, beratBadan=10, tinggiBadan=80,
+            skor_Z_BB_U=0.5, skor_Z_TB_U=z_tb_u
+        )
+
+    def test_data_seri(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['tb_u'], [{'tgl': '2021-01-01', 'score': -1.5, 'umur': 12, 'nilai': 80.0}])
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_304_tanpa_membaca_pengukuran(self):
+        etag = self.client.get(self.url)['ETag']
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        tabel = ' '.join(q['sql'] for q in ctx.captured_queries)
+        self.assertIn('core_pasienringkasan', tabel)
+        self.assertNotIn('core_pengukuranfisik', tabel)
+
+    def test_etag_berubah_saat_pengukuran_berubah(self):
+        etag = self.client.get(self.url)['ETag']
+        pengukuran = self.ukur(date(2021, 2, 1), -2.5)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        etag = self.client.get(self.url)['ETag']
+        # Edit tanpa mengubah jumlah pengukuran tetap mengganti validator
+        pengukuran.skor_Z_TB_U = -3.1
+        pengukuran.save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_pasien_lain_ditolak(self):
+        lain = Pasien.objects.create(
+            namaPengguna="lain", nama="Pasien Lain", jenisKelamin="P", tanggalLahir="2020-01-01"
+        )
+        response = self.client.get(reverse('data_grafik_riwayat', args=[lain.id]))
+        self.assertEqual(response.status_code, 403)
+
+    def test_pasien_tidak_dikenal_404(self):
+        pakar = User.objects.create_user(username='pakar', password='password123', is_staff=True)
+        pakar.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+        klien = Client()
+        klien.login(username='pakar', password='password123')
+        response = klien.get(reverse('data_grafik_riwayat', args=[99999]))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {'error': 'Pasien tidak ditemukan'})
+        # Pasien yang ada tetap dilayani untuk pakar
+        self.assertEqual(klien.get(self.url).status_code, 200)
+
+
+class KurvaReferensiTest(TestCase):
+    def test_berkas_berversi_dengan_cache_immutable(self):
+        url = reverse('kurva_referensi', args=[VERSI_REFERENSI, 'L', 'tb_u'])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+        kurva = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(kurva, hitung_kurva('L', 'tb_u'))
+
+    def test_versi_lama_tidak_dilayani(self):
+        url = reverse('kurva_referensi', args=['0', 'L', 'tb_u'])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_kurva_sesuai_rumus_zscore(self):
+        kurva = hitung_kurva('P', 'bb_u')
+        for umur in (0, 24, 36, 60):
+            median, sd = parameter_referensi(umur, 'P')['bb_u']
+            self.assertAlmostEqual(kurva['sd']['0'][umur], median, places=2)
+            self.assertAlmostEqual(kurva['sd']['-2'][umur], median - 2 * sd, places=2)
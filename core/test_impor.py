@@ -0,0 +1,215 @@
+import io
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User, Group
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from .akun import hash_kata_sandi
+from .impor import KesalahanFormatImpor, impor_pasien_csv, impor_pengukuran_csv
+from .models import Pasien, PasienRingkasan, PengukuranFisik, Notifikasi, StatistikHarian, StatistikTotal
+from .utils import hitung_dan_simpan_zscore
+
+HEADER = 'nama_pengguna,tanggal_ukur,berat_badan,tinggi_badan,lingkar_kepala\n'
+
+
+class ImporPengukuranTest(TestCase):
+    def setUp(self):
+        self.pasien = Pasien.objects.create(
+            namaPengguna="anak1", nama="Anak Satu", jenisKelamin="L", tanggalLahir=date(2020, 1, 15)
+        )
+        Pasien.objects.create(
+            namaPengguna="anak2", nama="Anak Dua", jenisKelamin="P", tanggalLahir=date(2021, 6, 1)
+        )
+
+    def impor(self, isi, **kwargs):
+        return impor_pengukuran_csv(io.StringIO(isi), **kwargs)
+
+    def test_baris_valid_tersimpan_dengan_zscore(self):
+        laporan = self.impor(HEADER + 'anak1,2021-03-01,9.5,75,45\nanak2,2022-01-10,8.1,70,\n')
+        self.assertEqual(laporan['berhasil'], 2)
+        self.assertEqual(laporan['gagal'], [])
+
+        # Z-Score bulk sama dengan perhitungan per baris
+        impor = PengukuranFisik.objects.get(pasien=self.pasien)
+        pembanding = PengukuranFisik.objects.create(
+            pasien=self.pasien, tanggalUkur=date(2021, 3, 2), beratBadan=9.5, tinggiBadan=75
+        )
+        hitung_dan_simpan_zscore(pembanding.id)
+        pembanding.refresh_from_db()
+        self.assertEqual(impor.skor_Z_BB_U, pembanding.skor_Z_BB_U)
+        self.assertEqual(impor.skor_Z_TB_U, pembanding.skor_Z_TB_U)
+
+    def test_laporan_per_baris(self):
+        besok = (date.today() + timedelta(days=1)).isoformat()
+        laporan = self.impor(
+            HEADER
+            + 'anak1,2021-03-01,9.5,75,\n'      # 2: valid
+            + 'tidakada,2021-03-01,9.5,75,\n'   # 3: pasien tidak ada
+            + 'anak1,2019-12-01,3,50,\n'        # 4: sebelum lahir
+            + f'anak1,{besok},9,75,\n'          # 5: masa depan
+            + 'anak1,01/03/2021,9,75,\n'        # 6: format tanggal
+            + 'anak1,2021-04-01,abc,75,\n'      # 7: bukan angka
+            + 'anak1,2021-03-01,9.6,76,\n'      # 8: duplikat tanggal
+        )
+        self.assertEqual(laporan['berhasil'], 1)
+        self.assertEqual([g['baris'] for g in laporan['gagal']], [3, 4, 5, 6, 7, 8])
+        self.assertEqual(laporan['gagal'][0]['pesan'], 'pasien tidak ditemukan')
+        self.assertIn('sebelum tanggal lahir', laporan['gagal'][1]['pesan'])
+
+    def test_chunk_dan_data_turunan(self):
+        baris = ''.join(
+            f'anak1,{(date(2020, 2, 1) + timedelta(days=7 * i)).isoformat()},{5 + i * 0.05:.2f},{55 + i * 0.2:.1f},\n'
+            for i in range(25)
+        )
+        laporan = self.impor(HEADER + baris, ukuran_chunk=10)
+        self.assertEqual(laporan['berhasil'], 25)
+        ringkasan = PasienRingkasan.objects.get(pasien=self.pasien)
+        self.assertEqual(ringkasan.jumlahPengukuran, 25)
+        self.assertEqual(ringkasan.tanggalUkurTerakhir, date(2020, 2, 1) + timedelta(days=7 * 24))
+        self.assertEqual(
+            sum(StatistikHarian.objects.filter(jenis=StatistikHarian.JENIS_PENGUKURAN).values_list('jumlah', flat=True)),
+            25
+        )
+        # Satu jadwal pengukuran ulang per pasien
+        self.assertEqual(Notifikasi.objects.filter(pasien=self.pasien).count(), 1)
+
+    def test_header_tidak_lengkap(self):
+        with self.assertRaises(KesalahanFormatImpor):
+            self.impor('nama_pengguna,berat_badan\nanak1,9\n')
+
+    def test_berkas_rusak_di_tengah(self):
+        # Berkas didekode per blok: byte rusak di akhir berkas baru terbaca setelah beberapa chunk
+        baris = ''.join(
+            f'anak1,{(date(2020, 2, 1) + timedelta(days=i)).isoformat()},9.5,75,\n' for i in range(600)
+        )
+        isi = (HEADER + baris).encode() + b'anak2,2022-01-10,8\xff1,70,\n'
+        laporan = impor_pengukuran_csv(
+            io.TextIOWrapper(io.BytesIO(isi), encoding='utf-8', newline=''), ukuran_chunk=50
+        )
+        self.assertGreater(laporan['berhasil'], 0)
+        self.assertLess(laporan['berhasil'], 600)
+        self.assertEqual(laporan['berhasil'], PengukuranFisik.objects.count())
+        # Semua baris sebelum posisi berhenti tersimpan, termasuk chunk yang belum penuh
+        self.assertEqual(laporan['berhenti_di_baris'], laporan['berhasil'] + 2)
+        self.assertIn('UTF-8', laporan['pesan_berhenti'])
+
+
+class ImporPengukuranViewTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        pakar = User.objects.create_user(username='pakar', password='password123', is_staff=True)
+        pakar.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+        self.client.login(username='pakar', password='password123')
+        Pasien.objects.create(
+            namaPengguna="anak1", nama="Anak Satu", jenisKelamin="L", tanggalLahir=date(2020, 1, 15)
+        )
+
+    def test_unggah_csv(self):
+        berkas = SimpleUploadedFile(
+            'posyandu.csv', ('﻿' + 'Nama_Pengguna;Tanggal_Ukur;Berat_Badan;Tinggi_Badan\nanak1;2021-03-01;9,5;75\n').encode()
+        )
+        response = self.client.post(reverse('impor_pengukuran_pakar'), {'berkas': berkas, 'delimiter': ';'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['laporan']['berhasil'], 1)
+        self.assertEqual(PengukuranFisik.objects.get().beratBadan, 9.5)
+
+    def test_berkas_rusak_di_tengah_dilaporkan(self):
+        baris = ''.join(
+            f'anak1,{(date(2020, 2, 1) + timedelta(days=i)).isoformat()},9.5,75\n' for i in range(600)
+        )
+        isi = ('nama_pengguna,tanggal_ukur,berat_badan,tinggi_badan\n' + baris).encode() + b'anak1,2022\xff\n'
+        response = self.client.post(
+            reverse('impor_pengukuran_pakar'), {'berkas': SimpleUploadedFile('posyandu.csv', isi)}
+        )
+        laporan = response.context['laporan']
+        self.assertEqual(laporan['berhasil'], PengukuranFisik.objects.count())
+        self.assertGreater(laporan['berhasil'], 0)
+        self.assertContains(response, f"Pembacaan berhenti di baris {laporan['berhenti_di_baris']}")
+        self.assertContains(response, f"{laporan['berhasil']} pengukuran dari baris sebelumnya sudah tersimpan")
+        self.assertNotContains(response, 'Berkas tidak dapat dibaca')
+
+
+HEADER_PASIEN = 'nama,jenis_kelamin,tanggal_lahir,nama_pengguna,kata_sandi,nama_wali\n'
+
+
+class ImporPasienTest(TestCase):
+    def setUp(self):
+        Pasien.objects.create(
+            namaPengguna="budi200115", nama="Budi Lama", jenisKelamin="L", tanggalLahir=date(2020, 1, 15)
+        )
+
+    def impor(self, isi, **kwargs):
+        return impor_pasien_csv(io.StringIO(isi), **kwargs)
+
+    def test_pendaftaran_massal_dengan_hash_paralel(self):
+        baris = ''.join(f'Anak {i},P,2021-05-{i + 1:02d},anak{i},sandi{i},Ibu {i}\n' for i in range(10))
+        laporan = self.impor(HEADER_PASIEN + baris, proses=2)
+        self.assertEqual(laporan['berhasil'], 10)
+        self.assertEqual(laporan['kredensial'], [])
+        anak3 = Pasien.objects.get(namaPengguna='anak3')
+        self.assertTrue(anak3.check_password('sandi3'))
+        self.assertEqual(anak3.namaWali, 'Ibu 3')
+        # Data turunan yang biasanya diisi signal
+        self.assertEqual(PasienRingkasan.objects.count(), 11)
+        self.assertEqual(StatistikTotal.objects.get(nama=StatistikTotal.PASIEN).jumlah, 11)
+
+    def test_kredensial_otomatis(self):
+        laporan = self.impor(
+            HEADER_PASIEN
+            + 'Budi Santoso,L,2020-01-15,,,\n'   # bentrok dengan budi200115 di database
+            + 'Budi Hartono,Laki-laki,2020-01-15,,,\n'
+            + 'Siti,P,2021-02-02,siti01,,\n'
+        )
+        self.assertEqual(laporan['berhasil'], 3)
+        kredensial = {k['nama']: k for k in laporan['kredensial']}
+        self.assertEqual(kredensial['Budi Santoso']['nama_pengguna'], 'budi2001152')
+        self.assertEqual(kredensial['Budi Hartono']['nama_pengguna'], 'budi2001153')
+        siti = Pasien.objects.get(namaPengguna='siti01')
+        self.assertTrue(siti.check_password(kredensial['Siti']['kata_sandi']))
+
+    def test_nama_pengguna_ganda_ditolak(self):
+        laporan = self.impor(
+            HEADER_PASIEN
+            + 'Budi,L,2020-01-15,budi200115,x,\n'
+            + 'Ani,P,2021-01-01,ani,x,\n'
+            + 'Ani Lain,P,2021-01-01,ani,x,\n'
+            + 'Tanpa Kelamin,X,2021-01-01,,,\n'
+        )
+        self.assertEqual(laporan['berhasil'], 1)
+        self.assertEqual(
+            [(g['baris'], g['pesan']) for g in laporan['gagal']],
+            [(2, 'nama pengguna sudah digunakan'), (4, 'nama pengguna sudah digunakan'),
+             (5, 'jenis_kelamin "X" harus L atau P')]
+        )
+
+    def test_nama_terlalu_panjang_ditolak(self):
+        laporan = self.impor(HEADER_PASIEN + f'{"A" * 101},P,2021-01-01,ani,x,\n' + 'Ani,P,2021-01-01,ani2,x,\n')
+        self.assertEqual(laporan['berhasil'], 1)
+        self.assertEqual([(g['baris'], g['pesan']) for g in laporan['gagal']], [(2, 'nama terlalu panjang')])
+
+    def test_nama_pengguna_terpakai_saat_impor(self):
+        def hash_lalu_daftar(sandi, proses=None):
+            # Pendaftaran lain memakai nama pengguna setelah pengecekan keunikan
+            Pasien.objects.create(namaPengguna='ani', nama='Ani Lain', jenisKelamin='P', tanggalLahir=date(2021, 1, 1))
+            return hash_kata_sandi(sandi, proses)
+
+        with mock.patch('core.impor.hash_kata_sandi', hash_lalu_daftar):
+            laporan = self.impor(HEADER_PASIEN + 'Ani,P,2021-01-01,ani,x,\n' + 'Siti,P,2021-02-02,siti,,\n')
+        self.assertEqual(laporan['berhasil'], 1)
+        self.assertEqual([(g['baris'], g['pesan']) for g in laporan['gagal']], [(2, 'nama pengguna sudah digunakan')])
+        self.assertEqual([k['nama_pengguna'] for k in laporan['kredensial']], ['siti'])
+        self.assertEqual(Pasien.objects.get(namaPengguna='ani').nama, 'Ani Lain')
+        self.assertTrue(PasienRingkasan.objects.filter(pasien__namaPengguna='siti').exists())
+
+    def test_unggah_pakar(self):
+        pakar = User.objects.create_user(username='pakar', password='password123', is_staff=True)
+        pakar.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+        self.client.login(username='pakar', password='password123')
+        berkas = SimpleUploadedFile('pasien.csv', (HEADER_PASIEN + 'Ani,P,2021-01-01,,,\n').encode())
+        response = self.client.post(reverse('impor_pasien_pakar'), {'berkas': berkas})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-store', response['Cache-Control'])
+        self.assertContains(response, response.context['laporan']['kredensial'][0]['kata_sandi'])
@@ -0,0 +1,63 @@
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import TestCase, Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .middleware import PasienMiddleware
+from .models import Pasien
+
+
+class PasienMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.pasien = Pasien(
+            namaPengguna="testuser", nama="Test User", jenisKelamin="L", tanggalLahir="2020-01-01"
+        )
+        self.pasien.set_password("testpassword")
+        self.pasien.save()
+        self.client.post(reverse('login_pasien'), {
+            'nama_pengguna': 'testuser',
+            'kata_sandi': 'testpassword'
+        })
+
+    def query_pasien(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [q for q in ctx.captured_queries if 'FROM "core_pasien"' in q['sql']]
+
+    def test_pasien_diambil_sekali_lalu_dari_cache(self):
+        self.assertEqual(len(self.query_pasien(reverse('dashboard_pasien'))), 1)
+        self.assertEqual(len(self.query_pasien(reverse('dashboard_pasien'))), 0)
+        self.assertEqual(len(self.query_pasien(reverse('edit_akun_pasien'))), 0)
+
+    def test_halaman_tanpa_profil_tidak_query_pasien(self):
+        self.assertEqual(len(self.query_pasien(reverse('form_diagnosa'))), 0)
+
+    def test_cache_dibuang_saat_pasien_disimpan(self):
+        self.client.get(reverse('dashboard_pasien'))
+        self.client.post(reverse('edit_akun_pasien'), {'nama': 'Nama Baru'})
+        response = self.client.get(reverse('dashboard_pasien'))
+        self.assertEqual(response.context['pasien'].nama, 'Nama Baru')
+
+    def test_pasien_dihapus_sesi_dibersihkan(self):
+        self.client.get(reverse('dashboard_pasien'))
+        self.pasien.delete()
+        response = self.client.get(reverse('dashboard_pasien'))
+        self.assertRedirects(response, reverse('login_pasien'), fetch_redirect_response=False)
+        self.assertNotIn('pasien_id', self.client.session)
+
+    def test_sesi_tidak_disentuh_bila_pasien_tidak_dipakai(self):
+        def jalankan(view):
+            request = RequestFactory().get('/', HTTP_COOKIE=f'sessionid={self.client.session.session_key}')
+            return SessionMiddleware(PasienMiddleware(view))(request)
+
+        response = jalankan(lambda request: HttpResponse('publik'))
+        self.assertFalse(response.has_header('Vary'))
+        response = jalankan(lambda request: HttpResponse(request.pasien.nama))
+        self.assertEqual(response.content, b'Test User')
+        self.assertIn('Cookie', response['Vary'])
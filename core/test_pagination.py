@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User, Group
+from django.test import TestCase, Client, RequestFactory
+from django.urls import reverse
+
+from .models import Pasien, PengukuranFisik, Gejala
+from .pagination import keyset_paginate
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.pasien = Pasien.objects.create(
+            namaPengguna="testpasien", nama="Test Pasien", jenisKelamin="L", tanggalLahir="2020-01-01"
+        )
+        # Beberapa pengukuran berbagi tanggal yang sama untuk menguji kunci pemutus (id)
+        for i in range(23):
+            PengukuranFisik.objects.create(
+                pasien=self.pasien, tanggalUkur=date(2021, 1, 1) + timedelta(days=i // 3),
+                beratBadan=10, tinggiBadan=80
+            )
+        self.urutan_lengkap = list(
+            PengukuranFisik.objects.order_by('-tanggalUkur', 'id').values_list('id', flat=True)
+        )
+
+    def halaman(self, query=''):
+        request = self.factory.get('/' + query)
+        return keyset_paginate(request, PengukuranFisik.objects.all(), ('-tanggalUkur', 'id'), per_page=5)
+
+    def test_maju_menelusuri_semua_baris_tanpa_duplikat(self):
+        ids = []
+        page = self.halaman()
+        self.assertFalse(page.has_previous)
+        while True:
+            ids.extend(p.id for p in page)
+            if not page.has_next:
+                break
+            page = self.halaman(page.next_query)
+        self.assertEqual(ids, self.urutan_lengkap)
+
+    def test_mundur_kembali_ke_halaman_sebelumnya(self):
+        pertama = self.halaman()
+        kedua = self.halaman(pertama.next_query)
+        ketiga = self.halaman(kedua.next_query)
+        kembali = self.halaman(ketiga.previous_query)
+        self.assertEqual([p.id for p in kembali], [p.id for p in kedua])
+        self.assertTrue(kembali.has_previous)
+        awal = self.halaman(kembali.previous_query)
+        self.assertEqual([p.id for p in awal], [p.id for p in pertama])
+        self.assertFalse(awal.has_previous)
+
+    def test_cursor_rusak_kembali_ke_awal(self):
+        page = self.halaman('?cursor=bukan-cursor')
+        self.assertEqual([p.id for p in page], self.urutan_lengkap[:5])
+
+    def test_nilai_null_pada_kunci_urut(self):
+        for i in range(4):
+            Pasien.objects.create(
+                namaPengguna=f"p{i}", nama=f"Pasien {i}", jenisKelamin="L", tanggalLahir="2020-01-01"
+            )
+        urutan = ('-ringkasan__tanggalUkurTerakhir', 'id')
+        qs = Pasien.objects.select_related('ringkasan')
+        ids = []
+        request = self.factory.get('/')
+        while True:
+            page = keyset_paginate(request, qs, urutan, per_page=2)
+            ids.extend(p.id for p in page)
+            if not page.has_next:
+                break
+            request = self.factory.get('/' + page.next_query)
+        self.assertEqual(ids, list(qs.order_by(*urutan).values_list('id', flat=True)))
+
+
+class DaftarPakarPaginasiTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        pakar = User.objects.create_user(username='pakar', password='password123', is_staff=True)
+        pakar.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+        self.client.login(username='pakar', password='password123')
+        for i in range(60):
+            Gejala.objects.create(kodeGejala=f"G{i:03d}", namaGejala=f"Gejala {i}")
+
+    def test_daftar_gejala_dipaginasi(self):
+        response = self.client.get(reverse('list_gejala_pakar'))
+        self.assertEqual(len(response.context['gejala_list']), 50)
+        self.assertTrue(response.context['page'].has_next)
+        response = self.client.get(reverse('list_gejala_pakar') + response.context['page'].next_query)
+        self.assertEqual([g.kodeGejala for g in response.context['gejala_list']], [f"G{i:03d}" for i in range(50, 60)])
+
+    def test_filter_server_side(self):
+        response = self.client.get(reverse('list_gejala_pakar'), {'q': 'G05'})
+        self.assertEqual([g.kodeGejala for g in response.context['gejala_list']], [f"G05{i}" for i in range(10)])
+
+    def test_daftar_pengukuran_filter_tanggal(self):
+        pasien = Pasien.objects.create(
+            namaPengguna="x", nama="Anak", jenisKelamin="L", tanggalLahir="2020-01-01"
+        )
+        PengukuranFisik.objects.create(pasien=pasien, tanggalUkur=date(2021, 1, 1), beratBadan=10, tinggiBadan=80)
+        PengukuranFisik.objects.create(pasien=pasien, tanggalUkur=date(2022, 1, 1), beratBadan=11, tinggiBadan=85)
+        response = self.client.get(reverse('list_pengukuran_pakar'), {'dari': '2021-06-01'})
+        self.assertEqual([p.tanggalUkur for p in response.context['pengukuran_list']], [date(2022, 1, 1)])
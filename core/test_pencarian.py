@@ -0,0 +1,126 @@
+from django.contrib.auth.models import User, Group
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from .models import Pasien
+from .pencarian import cari_pasien, ekspresi_match, filter_pasien, fts_tersedia
+
+
+def buat_pasien(nama, nama_pengguna, wali=None):
+    return Pasien.objects.create(
+        nama=nama, namaPengguna=nama_pengguna, kataSandi='x', jenisKelamin='L',
+        tanggalLahir='2022-01-01', namaWali=wali,
+    )
+
+
+class PencarianPasienTest(TestCase):
+    def setUp(self):
+        self.budi = buat_pasien('Budi Santoso', 'budi01', wali='Siti Aminah')
+        self.bunga = buat_pasien('Bunga Citra', 'bunga')
+        self.ani = buat_pasien('Ani Yudhoyono', 'ani_y', wali='Budiman')
+
+    def id_hasil(self, teks):
+        return {p['id'] for p in cari_pasien(teks)}
+
+    def test_fts_terpasang_oleh_migrasi(self):
+        self.assertTrue(fts_tersedia())
+
+    def test_awalan_kata_di_semua_kolom(self):
+        self.assertEqual(self.id_hasil('bu'), {self.budi.id, self.bunga.id, self.ani.id})
+        self.assertEqual(self.id_hasil('bud'), {self.budi.id, self.ani.id})
+        self.assertEqual(self.id_hasil('santo'), {self.budi.id})
+        self.assertEqual(self.id_hasil('BUNGA01'), set())
+
+    def test_semua_kata_harus_cocok(self):
+        self.assertEqual(self.id_hasil('budi sit'), {self.budi.id})
+
+    def test_karakter_operator_tidak_merusak_kueri(self):
+        self.assertEqual(self.id_hasil('"ani* (yud-'), {self.ani.id})
+        self.assertEqual(cari_pasien('*'), [])
+        self.assertIsNone(ekspresi_match('b'))
+
+    def test_trigger_menjaga_indeks(self):
+        self.bunga.nama = 'Mawar Sari'
+        self.bunga.save()
+        self.assertEqual(self.id_hasil('bunga'), {self.bunga.id})  # nama pengguna masih 'bunga'
+        self.assertEqual(self.id_hasil('mawar'), {self.bunga.id})
+        self.assertEqual(self.id_hasil('citra'), set())
+        Pasien.objects.filter(id=self.ani.id).update(namaWali='Joko')
+        self.assertEqual(self.id_hasil('budiman'), set())
+        self.budi.delete()
+        self.assertEqual(self.id_hasil('santoso'), set())
+        Pasien.objects.bulk_create([Pasien(
+            nama='Citra Lestari', namaPengguna='citra', kataSandi='x', jenisKelamin='P', tanggalLahir='2021-05-05',
+        )])
+        self.assertEqual(len(cari_pasien('lestari')), 1)
+
+    def test_batas_hasil(self):
+        for i in range(15):
+            buat_pasien(f'Dewi {i}', f'dewi{i}')
+        self.assertEqual(len(cari_pasien('dewi')), 10)
+        self.assertEqual(len(cari_pasien('dewi', batas=3)), 3)
+
+    def test_filter_queryset(self):
+        hasil = filter_pasien(Pasien.objects.order_by('nama'), 'bud')
+        self.assertEqual(list(hasil), [self.ani, self.budi])
+
+    def test_filter_kata_kunci_pendek_memakai_awalan_nama(self):
+        hasil = filter_pasien(Pasien.objects.order_by('nama'), 'b')
+        self.assertEqual(list(hasil), [self.budi, self.bunga])
+        self.assertEqual(cari_pasien('b'), [])
+
+
+class CariPasienViewTest(TestCase):
+    def setUp(self):
+        self.budi = buat_pasien('Budi Santoso', 'budi01')
+        self.client = Client()
+        pakar = User.objects.create_user(username='pakar', password='password123', is_staff=True)
+        pakar.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+
+    def test_hanya_pakar(self):
+        response = self.client.get(reverse('cari_pasien_pakar'), {'q': 'bud'})
+        self.assertEqual(response.status_code, 302)
+
+    def test_hasil_json(self):
+        self.client.login(username='pakar', password='password123')
+        response = self.client.get(reverse('cari_pasien_pakar'), {'q': 'bud'})
+        self.assertEqual(response.json(), {'hasil': [
+            {'id': self.budi.id, 'label': 'Budi Santoso (budi01)', 'tanggalLahir': '2022-01-01'},
+        ]})
+
+    def test_daftar_pasien_memakai_pencarian(self):
+        self.client.login(username='pakar', password='password123')
+        response = self.client.get(reverse('list_patients_pakar'), {'q': 'santo'})
+        self.assertContains(response, 'Budi Santoso')
+
+
+class PemilihPasienPengukuranTest(TestCase):
+    def setUp(self):
+        self.budi = buat_pasien('Budi Santoso', 'budi01')
+        buat_pasien('Bunga Citra', 'bunga')
+        self.client = Client()
+        pakar = User.objects.create_user(username='pakar', password='password123', is_staff=True)
+        pakar.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+        self.client.login(username='pakar', password='password123')
+
+    def test_form_tidak_memuat_daftar_pasien(self):
+        response = self.client.get(reverse('create_pengukuran_pakar'))
+        self.assertContains(response, reverse('cari_pasien_pakar'))
+        self.assertNotContains(response, 'Budi Santoso')
+        self.assertNotContains(response, 'Bunga Citra')
+
+    def test_validasi_gagal_hanya_merender_pasien_terpilih(self):
+        response = self.client.post(reverse('create_pengukuran_pakar'), {
+            'pasien': self.budi.id, 'tanggal_ukur': '2999-01-01', 'berat_badan': '10', 'tinggi_badan': '80',
+        })
+        self.assertContains(response, 'tidak boleh di masa depan')
+        self.assertContains(response, f'name="pasien" id="pasien" value="{self.budi.id}"')
+        self.assertContains(response, 'Budi Santoso (budi01)')
+        self.assertNotContains(response, 'Bunga Citra')
+
+    def test_pasien_tidak_valid_tidak_dirender(self):
+        response = self.client.post(reverse('create_pengukuran_pakar'), {
+            'pasien': 'abc', 'tanggal_ukur': '2024-01-01', 'berat_badan': '10', 'tinggi_badan': '80',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'name="pasien" id="pasien">')
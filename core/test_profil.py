@@ -0,0 +1,84 @@
+import json
+
+from django.contrib.auth.models import User, Group
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from .models import Pasien, PengukuranFisik
+from .profil import BufferProfil, PencatatQuery, buffer_profil
+
+
+class BufferProfilTest(TestCase):
+    def test_buffer_terbatas_dan_urut_terburuk(self):
+        buffer = BufferProfil(kapasitas=3)
+        for i in range(5):
+            buffer.tambah({'view': 'v', 'durasi_ms': i, 'jumlah_query': 10 - i, 'durasi_sql_ms': 0,
+                           'query_duplikat': 0, 'query_serupa': 0})
+        self.assertEqual([c['durasi_ms'] for c in buffer.semua()], [2, 3, 4])
+        self.assertEqual([c['durasi_ms'] for c in buffer.terburuk('jumlah_query')], [2, 3, 4])
+        self.assertEqual([c['durasi_ms'] for c in buffer.terburuk('tidak_dikenal', batas=1)], [4])
+
+    def test_pencatat_membedakan_duplikat_dan_serupa(self):
+        pencatat = PencatatQuery()
+        eksekusi = lambda sql, params, many, context: None
+        for params in [(1,), (1,), (2,), (3,)]:
+            pencatat(eksekusi, 'SELECT * FROM t WHERE id = %s', params, False, {})
+        pencatat(eksekusi, 'SELECT 1', None, False, {})
+        ringkasan = pencatat.ringkasan()
+        self.assertEqual(ringkasan['jumlah_query'], 5)
+        self.assertEqual(ringkasan['query_duplikat'], 1)
+        self.assertEqual(ringkasan['query_serupa'], 3)
+        self.assertEqual(ringkasan['pola_serupa'], [{'sql': 'SELECT * FROM t WHERE id = %s', 'jumlah': 4}])
+
+
+@override_settings(PROFIL_REQUEST=True)
+class ProfilRequestMiddlewareTest(TestCase):
+    def setUp(self):
+        buffer_profil.kosongkan()
+        self.pakar = User.objects.create_user(username='pakar', password='rahasia123', is_staff=True)
+        self.pakar.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+        self.client = Client()
+        self.client.login(username='pakar', password='rahasia123')
+        self.pasien = Pasien.objects.create(
+            namaPengguna='anak1', nama='Anak Satu', jenisKelamin='L', tanggalLahir='2021-01-01'
+        )
+        PengukuranFisik.objects.create(pasien=self.pasien, tanggalUkur='2022-01-01', beratBadan=9, tinggiBadan=75)
+
+    def test_request_tercatat_dengan_jumlah_query(self):
+        response = self.client.get(reverse('detail_pasien_pakar', args=[self.pasien.id]))
+        self.assertEqual(response.status_code, 200)
+        catatan = buffer_profil.semua()
+        self.assertEqual(len(catatan), 1)
+        self.assertEqual(catatan[0]['view'], 'detail_pasien_pakar')
+        self.assertEqual(catatan[0]['status'], 200)
+        self.assertGreater(catatan[0]['jumlah_query'], 0)
+        self.assertGreaterEqual(catatan[0]['durasi_ms'], catatan[0]['durasi_sql_ms'])
+
+    def test_halaman_diagnostik_dan_ekspor_json(self):
+        self.client.get(reverse('list_patients_pakar'))
+        response = self.client.get(reverse('diagnostik_profil_pakar'), {'urut': 'jumlah_query'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'list_patients_pakar')
+
+        response = self.client.get(reverse('diagnostik_profil_json'))
+        data = json.loads(response.content)
+        self.assertTrue(data['profil_aktif'])
+        self.assertEqual(
+            {c['view'] for c in data['request']}, {'list_patients_pakar', 'diagnostik_profil_pakar'}
+        )
+
+        self.client.post(reverse('diagnostik_profil_pakar'))
+        # Hanya request sesudah pengosongan (redirect-nya sendiri) yang tersisa
+        self.assertEqual([c['view'] for c in buffer_profil.semua()], ['diagnostik_profil_pakar'])
+
+    def test_halaman_diagnostik_khusus_pakar(self):
+        self.client.logout()
+        response = self.client.get(reverse('diagnostik_profil_json'))
+        self.assertEqual(response.status_code, 302)
+
+
+class ProfilNonaktifTest(TestCase):
+    def test_middleware_tidak_mencatat_bila_nonaktif(self):
+        buffer_profil.kosongkan()
+        Client().get(reverse('home'))
+        self.assertEqual(buffer_profil.semua(), [])
@@ -0,0 +1,100 @@
+import unittest
+from datetime import date, timedelta
+
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Pasien, Konsultasi, Gejala, Kondisi, Aturan, PengukuranFisik, Notifikasi
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN hanya untuk SQLite')
+class QueryPlanTest(TestCase):
+    """
+    Memastikan setiap queryset utama di core.views memakai indeks,
+    bukan full table scan atau pengurutan dengan temp B-tree.
+    """
+
+    def setUp(self):
+        self.pasien = Pasien.objects.create(
+            namaPengguna="testpasien",
+            nama="Test Pasien",
+            jenisKelamin="L",
+            tanggalLahir="2020-01-01"
+        )
+        self.kondisi = Kondisi.objects.create(
+            kodeKondisi="K01", namaKondisi="Stunting", deskripsi="-", solusi="-"
+        )
+        self.gejala = Gejala.objects.create(kodeGejala="G01", namaGejala="Tinggi badan sangat pendek")
+        Aturan.objects.create(kondisi=self.kondisi, gejala=self.gejala, kodeKelompokAturan="R01")
+        Konsultasi.objects.create(pasien=self.pasien, hasilKondisi=self.kondisi)
+        PengukuranFisik.objects.create(
+            pasien=self.pasien, tanggalUkur=date(2021, 1, 1), beratBadan=10, tinggiBadan=80
+        )
+        Notifikasi.objects.create(
+            pasien=self.pasien, judul="Jadwal", pesan="-",
+            jadwalNotifikasi=timezone.now() + timedelta(days=30)
+        )
+
+    def explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertUsesIndex(self, queryset):
+        plan = self.explain(queryset)
+        for detail in plan:
+            if detail.startswith('SCAN') and 'USING' not in detail:
+                self.fail(f'Full table scan: {detail}\nPlan: {plan}')
+            if 'TEMP B-TREE FOR ORDER BY' in detail:
+                self.fail(f'Pengurutan tanpa indeks: {detail}\nPlan: {plan}')
+
+    def test_pengukuran_per_pasien(self):
+        # input_pengukuran: 5 pengukuran terakhir
+        self.assertUsesIndex(PengukuranFisik.objects.filter(pasien=self.pasien).order_by('-tanggalUkur')[:5])
+        # tampilkan_grafik_riwayat: seluruh riwayat urut tanggal
+        self.assertUsesIndex(PengukuranFisik.objects.filter(pasien_id=self.pasien.id).order_by('tanggalUkur'))
+
+    def test_daftar_pengukuran_pakar(self):
+        self.assertUsesIndex(PengukuranFisik.objects.select_related('pasien').order_by('-tanggalUkur', 'id'))
+        # Halaman berikutnya pada paginasi keyset
+        self.assertUsesIndex(
+            PengukuranFisik.objects.select_related('pasien')
+            .filter(Q(tanggalUkur__lt=date(2021, 1, 1)) | Q(tanggalUkur=date(2021, 1, 1), id__gt=1))
+            .order_by('-tanggalUkur', 'id')[:51]
+        )
+
+    def test_konsultasi_per_pasien(self):
+        self.assertUsesIndex(Konsultasi.objects.filter(pasien=self.pasien).order_by('-tanggalKonsultasi'))
+
+    def test_daftar_pasien_pakar(self):
+        self.assertUsesIndex(Pasien.objects.all().order_by('nama', 'id'))
+        self.assertUsesIndex(
+            Pasien.objects.filter(Q(nama__gt='Test') | Q(nama='Test', id__gt=1)).order_by('nama', 'id')[:51]
+        )
+
+    def test_filter_awalan_nama_pasien(self):
+        # list_patients_pakar (kata kunci pendek) dan list_pengukuran_pakar ?q=
+        for queryset in (
+            Pasien.objects.filter(nama__istartswith='te'),
+            PengukuranFisik.objects.select_related('pasien').filter(pasien__nama__istartswith='te'),
+        ):
+            plan = self.explain(queryset)
+            self.assertTrue(any('pasien_nama_ci_idx' in detail for detail in plan), plan)
+
+    def test_aturan_per_kelompok(self):
+        # list_rules_pakar
+        self.assertUsesIndex(Aturan.objects.select_related('kondisi', 'gejala').order_by('kodeKelompokAturan'))
+        # show_rule_detail
+        self.assertUsesIndex(
+            Aturan.objects.filter(kondisi=self.kondisi).select_related('gejala').order_by('kodeKelompokAturan')
+        )
+
+    def test_notifikasi_jatuh_tempo(self):
+        self.assertUsesIndex(
+            Notifikasi.objects.filter(sudahTerkirim=False, jadwalNotifikasi__lte=timezone.now())
+            .order_by('jadwalNotifikasi')
+        )
+        self.assertUsesIndex(Notifikasi.objects.filter(pasien=self.pasien))
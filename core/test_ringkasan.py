@@ -0,0 +1,119 @@
+from datetime import date
+
+from django.contrib.auth.models import User, Group
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from .models import Pasien, PasienRingkasan, PengukuranFisik, Konsultasi, Kondisi
+from .ringkasan import hitung_ulang_ringkasan
+
+
+class PasienRingkasanTest(TestCase):
+    def setUp(self):
+        self.pasien = Pasien.objects.create(
+            namaPengguna="testpasien",
+            nama="Test Pasien",
+            jenisKelamin="L",
+            tanggalLahir="2020-01-01"
+        )
+        self.kondisi = Kondisi.objects.create(
+            kodeKondisi="K01", namaKondisi="Stunting", deskripsi="-", solusi="-"
+        )
+
+    def ringkasan(self, pasien=None):
+        return PasienRingkasan.objects.get(pasien=pasien or self.pasien)
+
+    def ukur(self, tanggal, z_tb_u, pasien=None):
+        return PengukuranFisik.objects.create(
+            pasien=pasien or self.pasien, tanggalUkur=tanggal,
+            beratBadan=10, tinggiBadan=80, skor_Z_BB_U=0, skor_Z_TB_U=z_tb_u
+        )
+
+    def test_ringkasan_dibuat_bersama_pasien(self):
+        ringkasan = self.ringkasan()
+        self.assertEqual(ringkasan.jumlahPengukuran, 0)
+        self.assertEqual(ringkasan.statusPertumbuhan, PasienRingkasan.STATUS_BELUM_DIUKUR)
+
+    def test_pengukuran_terakhir_dan_jumlah(self):
+        self.ukur(date(2021, 3, 1), -3.5)
+        self.ukur(date(2021, 1, 1), 0.5)  # lebih lama, tidak menggeser data terakhir
+        ringkasan = self.ringkasan()
+        self.assertEqual(ringkasan.jumlahPengukuran, 2)
+        self.assertEqual(ringkasan.tanggalUkurTerakhir, date(2021, 3, 1))
+        self.assertEqual(float(ringkasan.skor_Z_TB_U), -3.5)
+        self.assertEqual(ringkasan.statusPertumbuhan, PasienRingkasan.STATUS_STUNTING)
+
+    def test_hapus_pengukuran_terakhir(self):
+        self.ukur(date(2021, 1, 1), -2.5)
+        terbaru = self.ukur(date(2021, 3, 1), -3.5)
+        terbaru.delete()
+        ringkasan = self.ringkasan()
+        self.assertEqual(ringkasan.jumlahPengukuran, 1)
+        self.assertEqual(ringkasan.tanggalUkurTerakhir, date(2021, 1, 1))
+        self.assertEqual(ringkasan.statusPertumbuhan, PasienRingkasan.STATUS_RISIKO)
+
+    def test_pindah_pengukuran_ke_pasien_lain(self):
+        lain = Pasien.objects.create(
+            namaPengguna="lain", nama="Pasien Lain", jenisKelamin="P", tanggalLahir="2020-01-01"
+        )
+        pengukuran = self.ukur(date(2021, 1, 1), 1.0)
+        pengukuran.pasien = lain
+        pengukuran.save()
+        self.assertEqual(self.ringkasan().jumlahPengukuran, 0)
+        self.assertEqual(self.ringkasan(lain).jumlahPengukuran, 1)
+        self.assertEqual(self.ringkasan(lain).statusPertumbuhan, PasienRingkasan.STATUS_NORMAL)
+
+    def test_diagnosa_terakhir(self):
+        konsultasi = Konsultasi.objects.create(pasien=self.pasien)
+        konsultasi.hasilKondisi = self.kondisi
+        konsultasi.save()
+        self.assertEqual(self.ringkasan().hasilKondisiTerakhir, self.kondisi)
+        konsultasi.delete()
+        self.assertIsNone(self.ringkasan().hasilKondisiTerakhir)
+
+    def test_hapus_pasien_beserta_riwayat(self):
+        self.ukur(date(2021, 1, 1), 1.0)
+        Konsultasi.objects.create(pasien=self.pasien, hasilKondisi=self.kondisi)
+        self.pasien.delete()
+        self.assertFalse(PasienRingkasan.objects.exists())
+
+    def test_hitung_ulang_massal(self):
+        self.ukur(date(2021, 1, 1), -2.5)
+        self.ukur(date(2021, 2, 1), -3.2)
+        PasienRingkasan.objects.all().delete()
+        self.assertEqual(hitung_ulang_ringkasan(), 1)
+        ringkasan = self.ringkasan()
+        self.assertEqual(ringkasan.jumlahPengukuran, 2)
+        self.assertEqual(ringkasan.statusPertumbuhan, PasienRingkasan.STATUS_STUNTING)
+
+
+class DaftarPasienStatusTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        pakar = User.objects.create_user(username='pakar', password='password123', is_staff=True)
+        pakar.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+        self.client.login(username='pakar', password='password123')
+
+        self.stunting = Pasien.objects.create(
+            namaPengguna="a", nama="Anak Stunting", jenisKelamin="L", tanggalLahir="2020-01-01"
+        )
+        self.normal = Pasien.objects.create(
+            namaPengguna="b", nama="Anak Normal", jenisKelamin="P", tanggalLahir="2020-01-01"
+        )
+        PengukuranFisik.objects.create(
+            pasien=self.stunting, tanggalUkur=date(2021, 1, 1), beratBadan=8, tinggiBadan=70, skor_Z_TB_U=-3.1
+        )
+        PengukuranFisik.objects.create(
+            pasien=self.normal, tanggalUkur=date(2021, 1, 1), beratBadan=10, tinggiBadan=80, skor_Z_TB_U=0.2
+        )
+
+    def test_filter_status(self):
+        response = self.client.get(reverse('list_patients_pakar'), {'status': 'stunting'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Anak Stunting")
+        self.assertNotContains(response, "Anak Normal")
+
+    def test_urut_zscore(self):
+        Pasien.objects.create(namaPengguna="c", nama="Belum Diukur", jenisKelamin="L", tanggalLahir="2022-01-01")
+        response = self.client.get(reverse('list_patients_pakar'), {'urut': 'zscore'})
+        self.assertEqual(list(response.context['pasien_list']), [self.stunting, self.normal])
@@ -0,0 +1,45 @@
+from django.contrib.auth.models import User, Group
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .roles import GRUP_PAKAR, is_pakar, peran_pengguna
+
+
+class PeranPenggunaTest(TestCase):
+    def setUp(self):
+        self.grup = Group.objects.create(name=GRUP_PAKAR)
+        self.pakar = User.objects.create_user(username='pakar', password='password123', is_staff=True)
+        self.pakar.groups.add(self.grup)
+
+    def test_peran_dimemo_pada_objek_user(self):
+        user = User.objects.get(pk=self.pakar.pk)
+        with self.assertNumQueries(1):
+            for _ in range(5):
+                self.assertTrue(is_pakar(user))
+        self.assertEqual(peran_pengguna(user), frozenset([GRUP_PAKAR]))
+
+    def test_cache_dibuang_saat_grup_berubah(self):
+        user = User.objects.get(pk=self.pakar.pk)
+        self.assertTrue(is_pakar(user))
+        user.groups.remove(self.grup)
+        self.assertFalse(is_pakar(user))
+
+    def test_superuser_dan_non_staf_bukan_pakar(self):
+        admin = User.objects.create_superuser(username='admin', password='password123')
+        admin.groups.add(self.grup)
+        self.assertFalse(is_pakar(admin))
+        self.pakar.is_staff = False
+        self.assertFalse(is_pakar(self.pakar))
+
+    def test_query_grup_di_halaman_admin(self):
+        client = Client()
+        client.login(username='pakar', password='password123')
+        for url in (reverse('admin:index'), reverse('admin:core_gejala_changelist')):
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            # Query izin ModelBackend (auth_permission) tidak dihitung
+            query_grup = [q for q in ctx.captured_queries if 'SELECT "auth_group"."name"' in q['sql']]
+            self.assertEqual(len(query_grup), 1, url)
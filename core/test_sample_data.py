@@ -0,0 +1,96 @@
+from io import StringIO
+import json
+
+from django.core.management import call_command
+from django.db.models import Count, Sum
+from django.test import TestCase
+from django.utils import timezone
+
+from .basis_pengetahuan import baca_berkas, muat_basis_pengetahuan
+from .models import (
+    Pasien, PasienRingkasan, PengukuranFisik, Konsultasi, DetailKonsultasi, Notifikasi, Aturan,
+    StatistikTotal, StatistikHarian,
+)
+from .sample_data import buat_populasi
+from .utils import hitung_dan_simpan_zscore
+
+
+class GeneratorPopulasiTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        muat_basis_pengetahuan(baca_berkas())
+        cls.hasil = buat_populasi(60, seed=7, chunk_size=25)
+
+    def test_jumlah_baris_sesuai_laporan(self):
+        self.assertEqual(self.hasil['pasien'], 60)
+        self.assertEqual(Pasien.objects.count(), 60)
+        self.assertEqual(PengukuranFisik.objects.count(), self.hasil['pengukuran'])
+        self.assertEqual(Konsultasi.objects.count(), self.hasil['konsultasi'])
+        self.assertEqual(DetailKonsultasi.objects.count(), self.hasil['detail_konsultasi'])
+        self.assertEqual(Notifikasi.objects.count(), self.hasil['notifikasi'])
+        self.assertGreater(self.hasil['pengukuran'], 60)
+        self.assertGreater(self.hasil['konsultasi'], 0)
+
+    def test_semua_pasien_berbagi_satu_hash(self):
+        hashes = set(Pasien.objects.values_list('kataSandi', flat=True))
+        self.assertEqual(len(hashes), 1)
+        pasien = Pasien.objects.first()
+        self.assertTrue(pasien.check_password('sampel123'))
+
+    def test_tidak_ada_tanggal_di_masa_depan_atau_sebelum_lahir(self):
+        hari_ini = timezone.localdate()
+        for tanggal_ukur, tanggal_lahir in PengukuranFisik.objects.values_list('tanggalUkur', 'pasien__tanggalLahir'):
+            self.assertLessEqual(tanggal_ukur, hari_ini)
+            self.assertGreaterEqual(tanggal_ukur, tanggal_lahir)
+        self.assertFalse(Konsultasi.objects.filter(tanggalKonsultasi__gt=timezone.now()).exists())
+
+    def test_zscore_konsisten_dengan_perhitungan_per_baris(self):
+        for pengukuran in PengukuranFisik.objects.order_by('id')[:20]:
+            tersimpan = (pengukuran.skor_Z_BB_U, pengukuran.skor_Z_TB_U)
+            hitung_dan_simpan_zscore(pengukuran.id)
+            pengukuran.refresh_from_db()
+            self.assertEqual(tersimpan, (pengukuran.skor_Z_BB_U, pengukuran.skor_Z_TB_U))
+
+    def test_detail_konsultasi_mengikuti_aturan_kondisi(self):
+        for konsultasi in Konsultasi.objects.exclude(hasilKondisi=None).prefetch_related('detailkonsultasi_set')[:20]:
+            gejala = {d.gejala_id for d in konsultasi.detailkonsultasi_set.all()}
+            aturan = set(Aturan.objects.filter(kondisi=konsultasi.hasilKondisi_id).values_list('gejala_id', flat=True))
+            self.assertTrue(gejala)
+            self.assertLessEqual(gejala, aturan)
+
+    def test_ringkasan_dan_statistik_dihitung_ulang(self):
+        self.assertEqual(PasienRingkasan.objects.count(), 60)
+        self.assertEqual(
+            PasienRingkasan.objects.aggregate(n=Sum('jumlahPengukuran'))['n'], self.hasil['pengukuran']
+        )
+        self.assertEqual(StatistikTotal.objects.get(nama=StatistikTotal.PASIEN).jumlah, 60)
+        self.assertEqual(StatistikTotal.objects.get(nama=StatistikTotal.KONSULTASI).jumlah, self.hasil['konsultasi'])
+        self.assertEqual(
+            StatistikHarian.objects.filter(jenis=StatistikHarian.JENIS_PENGUKURAN).aggregate(n=Sum('jumlah'))['n'],
+            self.hasil['pengukuran'],
+        )
+
+    def test_seed_sama_menghasilkan_populasi_sama(self):
+        awal = list(Pasien.objects.order_by('id').values_list('jenisKelamin', 'tanggalLahir'))
+        buat_populasi(60, seed=7, chunk_size=25)
+        ulang = list(Pasien.objects.order_by('id').values_list('jenisKelamin', 'tanggalLahir')[60:])
+        self.assertEqual(awal, ulang)
+        # Nama pengguna dilanjutkan, tidak bentrok dengan populasi sebelumnya
+        self.assertEqual(Pasien.objects.values('namaPengguna').annotate(n=Count('id')).filter(n__gt=1).count(), 0)
+
+    def test_nomor_dilanjutkan_dari_akhiran_terbesar(self):
+        # Pasien sampel di tengah dihapus: jumlahnya tidak lagi sama dengan nomor terakhir
+        Pasien.objects.filter(namaPengguna__in=['sampel0000003', 'sampel0000010']).delete()
+        Pasien.objects.create(namaPengguna='sampelku', nama='Bukan sampel', jenisKelamin='L', tanggalLahir='2022-01-01')
+        buat_populasi(2, seed=1, konsultasi=False, notifikasi=False)
+        self.assertEqual(Pasien.objects.filter(namaPengguna__in=['sampel0000060', 'sampel0000061']).count(), 2)
+
+
+class PerintahBuatDataSampelTest(TestCase):
+    def test_perintah_mencetak_laporan_json(self):
+        keluaran = StringIO()
+        call_command('buat_data_sampel', pasien=5, seed=1, tanpa_konsultasi=True, stdout=keluaran)
+        hasil = json.loads(keluaran.getvalue())
+        self.assertEqual(hasil['pasien'], 5)
+        self.assertEqual(hasil['konsultasi'], 0)
+        self.assertEqual(Pasien.objects.count(), 5)
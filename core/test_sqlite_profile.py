@@ -0,0 +1,67 @@
+import unittest
+
+from django.db import connection, OperationalError
+from django.test import TestCase, TransactionTestCase
+
+from .management.commands.benchmark_sqlite import jalankan_stress
+from .utils import retry_on_db_lock
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Profil khusus SQLite')
+class SQLiteProfileTest(TestCase):
+    def pragma(self, nama):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {nama}')
+            return cursor.fetchone()[0]
+
+    def test_pragma_dipasang_pada_koneksi(self):
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('synchronous'), 1)  # 1 = NORMAL
+        self.assertEqual(self.pragma('cache_size'), -65536)
+        self.assertEqual(self.pragma('foreign_keys'), 1)
+
+    def test_transaksi_immediate(self):
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+
+class RetryOnDbLockTest(TransactionTestCase):
+    def test_retry_sampai_berhasil(self):
+        panggilan = []
+
+        @retry_on_db_lock(attempts=3, backoff=0)
+        def tulis():
+            panggilan.append(1)
+            if len(panggilan) < 3:
+                raise OperationalError('database is locked')
+            return 'ok'
+
+        self.assertEqual(tulis(), 'ok')
+        self.assertEqual(len(panggilan), 3)
+
+    def test_batas_retry(self):
+        @retry_on_db_lock(attempts=2, backoff=0)
+        def tulis():
+            raise OperationalError('database is locked')
+
+        with self.assertRaises(OperationalError):
+            tulis()
+
+    def test_error_lain_tidak_diulang(self):
+        panggilan = []
+
+        @retry_on_db_lock(attempts=3, backoff=0)
+        def tulis():
+            panggilan.append(1)
+            raise OperationalError('no such table: x')
+
+        with self.assertRaises(OperationalError):
+            tulis()
+        self.assertEqual(len(panggilan), 1)
+
+
+class SQLiteStressTest(unittest.TestCase):
+    def test_profil_produksi_tanpa_error_kunci(self):
+        # Beban kecil agar cepat; bandingkan profil lengkap via `manage.py benchmark_sqlite`
+        hasil = jalankan_stress('produksi', jumlah_thread=4, transaksi_per_thread=25)
+        self.assertEqual(hasil['berhasil'], 100)
+        self.assertEqual(hasil['gagal'], 0)
@@ -0,0 +1,134 @@
+import json
+import os
+import tempfile
+from datetime import date
+
+from django.contrib.auth.models import User, Group
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import (
+    Pasien, Konsultasi, Gejala, Kondisi, Aturan, PengukuranFisik,
+    StatistikTotal, StatistikHarian,
+)
+from .statistik import hitung_ulang_statistik, statistik_dashboard
+
+
+class StatistikDashboardTest(TestCase):
+    def setUp(self):
+        self.pasien = Pasien.objects.create(
+            namaPengguna="testpasien", nama="Test Pasien", jenisKelamin="L", tanggalLahir="2020-01-01"
+        )
+        self.kondisi = Kondisi.objects.create(
+            kodeKondisi="K01", namaKondisi="Stunting", deskripsi="-", solusi="-"
+        )
+        self.gejala = Gejala.objects.create(kodeGejala="G01", namaGejala="Tinggi badan sangat pendek")
+        Aturan.objects.create(kondisi=self.kondisi, gejala=self.gejala, kodeKelompokAturan="R01")
+
+    def total(self, nama):
+        return StatistikTotal.objects.get(nama=nama).jumlah
+
+    def harian(self, jenis, tanggal, kondisi=None):
+        baris = StatistikHarian.objects.filter(tanggal=tanggal, jenis=jenis, kondisi=kondisi).first()
+        return baris.jumlah if baris else 0
+
+    def assertSamaDenganHitungUlang(self):
+        total = dict(StatistikTotal.objects.values_list('nama', 'jumlah'))
+        harian = sorted(
+            (b.tanggal, b.jenis, b.kondisi_id, b.jumlah)
+            for b in StatistikHarian.objects.exclude(jumlah=0)
+        )
+        hitung_ulang_statistik()
+        self.assertEqual(total, dict(StatistikTotal.objects.values_list('nama', 'jumlah')))
+        self.assertEqual(harian, sorted(
+            (b.tanggal, b.jenis, b.kondisi_id, b.jumlah) for b in StatistikHarian.objects.all()
+        ))
+
+    def test_counter_dibuat_dan_dihapus(self):
+        self.assertEqual(self.total(StatistikTotal.PASIEN), 1)
+        self.assertEqual(self.total(StatistikTotal.ATURAN), 1)
+        Konsultasi.objects.create(pasien=self.pasien)
+        self.assertEqual(self.total(StatistikTotal.KONSULTASI), 1)
+        # Hapus pasien ikut menghapus konsultasinya (cascade)
+        self.pasien.delete()
+        self.assertEqual(self.total(StatistikTotal.PASIEN), 0)
+        self.assertEqual(self.total(StatistikTotal.KONSULTASI), 0)
+        self.assertSamaDenganHitungUlang()
+
+    def test_loaddata_tidak_mengubah_counter(self):
+        # Fixture memuat tabel statistik apa adanya; signal tidak boleh menambah lagi
+        fixture = [
+            {'model': 'core.gejala', 'pk': 'G02', 'fields': {'namaGejala': 'Gejala fixture'}},
+            {'model': 'core.pengukuranfisik', 'pk': 900, 'fields': {
+                'pasien': self.pasien.pk, 'tanggalUkur': '2021-01-01', 'beratBadan': '10.00', 'tinggiBadan': '80.00',
+            }},
+        ]
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as berkas:
+            json.dump(fixture, berkas)
+        self.addCleanup(os.unlink, berkas.name)
+        call_command('loaddata', berkas.name, verbosity=0)
+        self.assertEqual(self.total(StatistikTotal.GEJALA), 1)
+        self.assertEqual(self.harian(StatistikHarian.JENIS_PENGUKURAN, date(2021, 1, 1)), 0)
+
+    def test_rollup_konsultasi_mengikuti_hasil_diagnosa(self):
+        hari_ini = timezone.localdate()
+        konsultasi = Konsultasi.objects.create(pasien=self.pasien)
+        self.assertEqual(self.harian(StatistikHarian.JENIS_KONSULTASI, hari_ini), 1)
+        # Hasil diagnosa diisi setelah inferensi
+        konsultasi.hasilKondisi = self.kondisi
+        konsultasi.save()
+        self.assertEqual(self.harian(StatistikHarian.JENIS_KONSULTASI, hari_ini), 0)
+        self.assertEqual(self.harian(StatistikHarian.JENIS_KONSULTASI, hari_ini, self.kondisi), 1)
+        self.assertSamaDenganHitungUlang()
+
+    def test_hapus_kondisi_memindahkan_rollup(self):
+        Konsultasi.objects.create(pasien=self.pasien, hasilKondisi=self.kondisi)
+        self.kondisi.delete()
+        self.assertEqual(self.harian(StatistikHarian.JENIS_KONSULTASI, timezone.localdate()), 1)
+        self.assertEqual(self.total(StatistikTotal.ATURAN), 0)
+        self.assertSamaDenganHitungUlang()
+
+    def test_rollup_pengukuran_per_tanggal_ukur(self):
+        pengukuran = PengukuranFisik.objects.create(
+            pasien=self.pasien, tanggalUkur=date(2021, 1, 1), beratBadan=10, tinggiBadan=80
+        )
+        PengukuranFisik.objects.create(
+            pasien=self.pasien, tanggalUkur=date(2021, 1, 1), beratBadan=11, tinggiBadan=81
+        )
+        self.assertEqual(self.harian(StatistikHarian.JENIS_PENGUKURAN, date(2021, 1, 1)), 2)
+        pengukuran.tanggalUkur = date(2021, 2, 1)
+        pengukuran.save()
+        self.assertEqual(self.harian(StatistikHarian.JENIS_PENGUKURAN, date(2021, 1, 1)), 1)
+        self.assertEqual(self.harian(StatistikHarian.JENIS_PENGUKURAN, date(2021, 2, 1)), 1)
+        PengukuranFisik.objects.get(pk=pengukuran.pk).delete()
+        self.assertEqual(self.harian(StatistikHarian.JENIS_PENGUKURAN, date(2021, 2, 1)), 0)
+        self.assertSamaDenganHitungUlang()
+
+    def test_tren_dashboard(self):
+        Konsultasi.objects.create(pasien=self.pasien, hasilKondisi=self.kondisi)
+        PengukuranFisik.objects.create(
+            pasien=self.pasien, tanggalUkur=timezone.localdate(), beratBadan=10, tinggiBadan=80
+        )
+        with self.assertNumQueries(2):
+            statistik = statistik_dashboard(hari=7)
+        tren = statistik['tren']
+        self.assertEqual(len(tren['label']), 7)
+        self.assertEqual(tren['label'][-1], timezone.localdate().isoformat())
+        self.assertEqual(tren['pengukuran'][-1], 1)
+        self.assertEqual(tren['konsultasi'], [{'label': 'K01 - Stunting', 'data': [0] * 6 + [1]}])
+
+    def test_dashboard_tidak_menghitung_tabel_mentah(self):
+        client = Client()
+        pakar = User.objects.create_user(username='pakar', password='password123', is_staff=True)
+        pakar.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+        client.login(username='pakar', password='password123')
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(reverse('dashboard_pakar'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_pasien'], 1)
+        self.assertEqual(response.context['total_aturan'], 1)
+        self.assertFalse([q['sql'] for q in ctx.captured_queries if 'COUNT(' in q['sql']])
@@ -0,0 +1,74 @@
+from io import StringIO
+
+from django.contrib.auth.models import User, Group
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase
+
+from .basis_pengetahuan import baca_berkas, muat_basis_pengetahuan
+from .models import Konsultasi, PengukuranFisik
+from .sample_data import buat_populasi
+from .uji_beban import KesalahanUjiBeban, jalankan_uji_beban, ringkas_catatan
+
+
+class RingkasCatatanTest(TestCase):
+    def test_persentil_dan_tingkat_error_per_endpoint(self):
+        catatan = [('form_diagnosa', i / 1000, 200, None) for i in range(1, 101)]
+        catatan += [('login_pasien', 0.05, 500, 'OperationalError: database is locked')]
+        laporan = ringkas_catatan(catatan, durasi_total=2.0)
+
+        diagnosa = laporan['endpoint']['form_diagnosa']
+        self.assertEqual(diagnosa['permintaan'], 100)
+        self.assertEqual(diagnosa['error'], 0)
+        self.assertAlmostEqual(diagnosa['p50_ms'], 50.5, places=1)
+        self.assertAlmostEqual(diagnosa['p99_ms'], 99.0, places=1)
+        self.assertEqual(diagnosa['throughput_per_detik'], 50.0)
+        self.assertEqual(laporan['endpoint']['login_pasien']['tingkat_error'], 1.0)
+        self.assertEqual(laporan['total']['error'], 1)
+        self.assertEqual(laporan['error_teratas'], {'OperationalError: database is locked': 1})
+
+
+class UjiBebanTest(TransactionTestCase):
+    # Pengguna virtual berjalan di thread dengan koneksi sendiri: data harus sudah di-commit
+
+    def setUp(self):
+        muat_basis_pengetahuan(baca_berkas())
+        buat_populasi(4, seed=3, konsultasi=False, notifikasi=False)
+        pakar = User.objects.create_user('pakar', password='rahasia123', is_staff=True)
+        pakar.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+
+    def test_skenario_berjalan_tanpa_error(self):
+        konsultasi_awal = Konsultasi.objects.count()
+        pengukuran_awal = PengukuranFisik.objects.count()
+        endpoint = set()
+        # Satu pengguna per skenario: database uji in-memory (shared cache) mengunci per
+        # tabel, berbeda dengan berkas SQLite WAL yang diukur di produksi
+        for skenario in ('pasien_diagnosa', 'pasien_pengukuran', 'pakar'):
+            laporan = jalankan_uji_beban(
+                [skenario], jumlah_pengguna=1, iterasi=2, pakar=('pakar', 'rahasia123'), seed=1,
+            )
+            self.assertEqual(laporan['total']['error'], 0, laporan['error_teratas'])
+            endpoint |= set(laporan['endpoint'])
+            if skenario == 'pasien_diagnosa':
+                self.assertEqual(laporan['endpoint']['tampilkan_hasil_diagnosa']['permintaan'], 2)
+        self.assertEqual(
+            endpoint,
+            {'login_pasien', 'dashboard_pasien', 'form_diagnosa', 'tampilkan_hasil_diagnosa',
+             'input_pengukuran', 'tampilkan_grafik_riwayat', 'data_grafik_riwayat',
+             'login_pakar', 'dashboard_pakar', 'list_patients_pakar', 'detail_pasien_pakar',
+             'list_pengukuran_pakar'},
+        )
+        self.assertEqual(Konsultasi.objects.count(), konsultasi_awal + 2)
+        self.assertEqual(PengukuranFisik.objects.count(), pengukuran_awal + 2)
+
+    def test_sandi_pakar_salah_dicatat_tanpa_menghentikan_uji(self):
+        laporan = jalankan_uji_beban(['pakar'], jumlah_pengguna=1, iterasi=1, pakar=('pakar', 'salah'))
+        # Login gagal dirender ulang (200), langkah berikutnya dilewati
+        self.assertEqual(list(laporan['endpoint']), ['login_pakar'])
+
+    def test_perintah_gagal_tanpa_akun_sampel(self):
+        with self.assertRaises(KesalahanUjiBeban):
+            jalankan_uji_beban(['tidak_ada'])
+        call_command('flush', verbosity=0, interactive=False)
+        with self.assertRaises(CommandError):
+            call_command('uji_beban', pengguna=1, iterasi=1, stdout=StringIO())
@@ -0,0 +1,118 @@
+from django.contrib.auth.models import User, Group
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Gejala, Kondisi, Aturan, StatistikTotal
+from .versi_kb import naikkan_versi_kb, perubahan_kb, versi_kb
+
+
+class VersiKbTest(TestCase):
+    def test_signal_menaikkan_versi(self):
+        awal = versi_kb()
+        Gejala.objects.create(kodeGejala="G01", namaGejala="Tinggi badan sangat pendek")
+        self.assertEqual(versi_kb(), awal + 1)
+
+    def test_perubahan_kb_satu_kenaikan(self):
+        awal = versi_kb()
+        with perubahan_kb():
+            for i in range(5):
+                Gejala.objects.create(kodeGejala=f"G{i:02d}", namaGejala="-")
+            with perubahan_kb():
+                naikkan_versi_kb()
+            # Belum naik selama blok berjalan
+            self.assertEqual(versi_kb(), awal)
+        self.assertEqual(versi_kb(), awal + 1)
+
+    def test_perubahan_kb_gagal_tidak_menaikkan(self):
+        awal = versi_kb()
+        with self.assertRaises(RuntimeError):
+            with perubahan_kb():
+                Gejala.objects.create(kodeGejala="G01", namaGejala="-")
+                raise RuntimeError
+        self.assertEqual(versi_kb(), awal)
+        self.assertFalse(Gejala.objects.exists())
+
+
+class EditAturanTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        pakar = User.objects.create_user(username='pakar', password='password123', is_staff=True)
+        pakar.groups.add(Group.objects.create(name='Pakar Diagnosa'))
+        self.client.login(username='pakar', password='password123')
+        self.kondisi = Kondisi.objects.create(kodeKondisi="K01", namaKondisi="Stunting", deskripsi="-", solusi="-")
+        for i in range(1, 5):
+            Gejala.objects.create(kodeGejala=f"G0{i}", namaGejala=f"Gejala {i}")
+        self.a1 = Aturan.objects.create(kondisi=self.kondisi, gejala_id="G01", kodeKelompokAturan="R01")
+        self.a2 = Aturan.objects.create(kondisi=self.kondisi, gejala_id="G02", kodeKelompokAturan="R01")
+        self.url = reverse('edit_rule_pakar', args=['K01'])
+
+    def test_hanya_aturan_berubah_yang_ditulis(self):
+        awal = versi_kb()
+        response = self.client.post(self.url, {
+            'rule_group_0': '1', 'kode_kelompok_0': 'R01', 'gejala_0': ['G01', 'G03'],
+            'rule_group_1': '1', 'kode_kelompok_1': 'R02', 'gejala_1': ['G04'],
+        })
+        self.assertRedirects(response, reverse('list_rules_pakar'))
+        aturan = set(Aturan.objects.values_list('gejala_id', 'kodeKelompokAturan'))
+        self.assertEqual(aturan, {('G01', 'R01'), ('G03', 'R01'), ('G04', 'R02')})
+        # Aturan yang tidak berubah tetap baris yang sama
+        self.assertTrue(Aturan.objects.filter(pk=self.a1.pk).exists())
+        self.assertEqual(versi_kb(), awal + 1)
+        self.assertEqual(StatistikTotal.objects.get(nama=StatistikTotal.ATURAN).jumlah, 3)
+
+    def test_simpan_tanpa_perubahan_tidak_menaikkan_versi(self):
+        awal = versi_kb()
+        self.client.post(self.url, {'rule_group_0': '1', 'kode_kelompok_0': 'R01', 'gejala_0': ['G01', 'G02']})
+        self.assertEqual(versi_kb(), awal)
+
+    def test_gejala_tidak_dikenal_tidak_menghapus_aturan(self):
+        awal = versi_kb()
+        response = self.client.post(self.url, {'rule_group_0': '1', 'kode_kelompok_0': 'R01', 'gejala_0': ['G99']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Aturan.objects.count(), 2)
+        self.assertEqual(versi_kb(), awal)
+
+    def test_buat_kelompok_aturan(self):
+        awal = versi_kb()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('create_rule_group'), {
+                'kondisi': 'K01', 'kode_kelompok': 'R03', 'gejala': ['G01', 'G02', 'G03', 'G04'],
+            })
+        self.assertEqual(response.status_code, 302)
+        sql = [q['sql'] for q in queries.captured_queries]
+        # Satu lookup gejala dan satu INSERT untuk seluruh kelompok
+        self.assertEqual(sum(s.startswith('INSERT INTO "core_aturan"') for s in sql), 1)
+        self.assertEqual(sum('FROM "core_gejala"' in s for s in sql), 1)
+        self.assertEqual(Aturan.objects.filter(kodeKelompokAturan='R03').count(), 4)
+        self.assertEqual(versi_kb(), awal + 1)
+
+    def test_kode_kelompok_ganda_ditolak(self):
+        awal = versi_kb()
+        response = self.client.post(reverse('create_rule_group'), {
+            'kondisi': 'K01', 'kode_kelompok': 'R01', 'gejala': ['G03'],
+        })
+        self.assertContains(response, 'Kode kelompok R01 sudah digunakan')
+        self.assertFalse(Aturan.objects.filter(gejala_id='G03').exists())
+        self.assertEqual(versi_kb(), awal)
+
+    def test_indeks_kelompok_tidak_valid_diabaikan(self):
+        response = self.client.post(self.url, {
+            'rule_group_0': '1', 'kode_kelompok_0': 'R01', 'gejala_0': ['G01', 'G02'],
+            'rule_group_x': '1',
+        })
+        self.assertRedirects(response, reverse('list_rules_pakar'))
+        self.assertEqual(Aturan.objects.count(), 2)
+
+    def test_kode_kelompok_kondisi_lain_ditolak_saat_edit(self):
+        Kondisi.objects.create(kodeKondisi="K02", namaKondisi="Gizi Buruk", deskripsi="-", solusi="-")
+        url = reverse('edit_rule_pakar', args=['K02'])
+        # Kondisi tanpa aturan: form mengusulkan kode yang belum dipakai
+        self.assertEqual(self.client.get(url).context['kode_kelompok_baru'], 'R02')
+        awal = versi_kb()
+        response = self.client.post(url, {'rule_group_0': '1', 'kode_kelompok_0': 'R01', 'gejala_0': ['G03']})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Kode kelompok R01 sudah digunakan')
+        self.assertFalse(Aturan.objects.filter(kondisi_id='K02').exists())
+        self.assertEqual(versi_kb(), awal)
@@ -0,0 +1,266 @@
+"""
+Uji beban in-process untuk alur pasien dan pakar.
+
+Setiap pengguna virtual adalah satu thread dengan django.test.Client dan
+koneksi database sendiri, yang menjalankan skenario berulang kali terhadap
+URL asli di core/urls.py (seluruh middleware, sesi, template dan backend
+SQLite produksi ikut terukur). Latensi dicatat per endpoint (nama URL), lalu
+diringkas menjadi p50/p95/p99, throughput dan tingkat error.
+
+Database yang dipakai adalah database di settings, jadi jalankan terhadap
+salinan yang sudah diisi `python manage.py buat_data_sampel`: pasien diambil
+dari akun sampel (lihat core/sample_data.py) dan skenario menulis konsultasi
+serta pengukuran baru.
+
+Skenario:
+    pasien_diagnosa   login -> dashboard -> form diagnosa -> kirim gejala -> hasil
+    pasien_pengukuran login -> form pengukuran -> simpan -> grafik -> data grafik
+    pakar             login -> dashboard -> daftar pasien -> detail pasien -> daftar pengukuran
+"""
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.db import connections
+from django.test import Client
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from .models import Gejala, Pasien
+from .sample_data import KATA_SANDI_SAMPEL, PREFIX_NAMA_PENGGUNA
+
+# Host yang diizinkan ALLOWED_HOSTS (Client bawaan memakai 'testserver')
+HOST_UJI = 'localhost'
+
+# Batas jumlah akun pasien sampel yang dibagi ke pengguna virtual
+MAKS_PASIEN = 1000
+
+
+class KesalahanUjiBeban(ValueError):
+    """Konfigurasi uji beban tidak dapat dijalankan (mis. tidak ada akun sampel)"""
+
+
+class KlienTerukur:
+    """
+    Client Django yang mencatat (endpoint, durasi, status, error) setiap permintaan
+
+    Status >= 400 dan exception di view dihitung sebagai error. Exception tidak
+    dilempar ulang (raise_request_exception=False) agar satu kegagalan, mis.
+    "database is locked", tidak menghentikan pengguna virtual.
+    """
+
+    def __init__(self, catatan):
+        self.client = Client(HTTP_HOST=HOST_UJI, raise_request_exception=False)
+        self.catatan = catatan
+
+    def _kirim(self, metode, path, data=None):
+        endpoint = resolve(path.split('?')[0]).url_name
+        mulai = time.perf_counter()
+        error = None
+        try:
+            response = getattr(self.client, metode)(path, data)
+            status = response.status_code
+            # exc_info diisi lewat signal global; saat beberapa thread gagal bersamaan
+            # pesannya bisa tertukar antar pengguna virtual, jumlah error tetap benar
+            if getattr(response, 'exc_info', None):
+                exc = response.exc_info[1]
+                error = f'{type(exc).__name__}: {exc}'
+            elif status >= 400:
+                error = f'HTTP {status}'
+        except Exception as e:  # kegagalan di luar view (middleware/klien)
+            response, status, error = None, 0, f'{type(e).__name__}: {e}'
+        self.catatan.append((endpoint, time.perf_counter() - mulai, status, error))
+        return response
+
+    def get(self, path, data=None):
+        return self._kirim('get', path, data)
+
+    def post(self, path, data=None):
+        return self._kirim('post', path, data)
+
+
+def _lokasi(response):
+    # Tujuan redirect, atau None bila permintaan gagal / bukan redirect
+    if response is None or response.status_code not in (301, 302):
+        return None
+    return response['Location']
+
+
+def _login_pasien(klien, pasien):
+    return _lokasi(klien.post(reverse('login_pasien'), {
+        'nama_pengguna': pasien['namaPengguna'], 'kata_sandi': pasien['kataSandi'],
+    })) is not None
+
+
+def skenario_pasien_diagnosa(klien, konteks, rng):
+    pasien = konteks['pasien']
+    if not _login_pasien(klien, pasien):
+        return
+    klien.get(reverse('dashboard_pasien'))
+    klien.get(reverse('form_diagnosa'))
+    gejala = rng.sample(konteks['gejala'], min(len(konteks['gejala']), rng.randint(2, 5)))
+    hasil = _lokasi(klien.post(reverse('form_diagnosa'), {'gejala': gejala}))
+    if hasil:
+        klien.get(hasil)
+
+
+def skenario_pasien_pengukuran(klien, konteks, rng):
+    pasien = konteks['pasien']
+    if not _login_pasien(klien, pasien):
+        return
+    klien.get(reverse('input_pengukuran'))
+    klien.post(reverse('input_pengukuran'), {
+        'tanggal_ukur': timezone.localdate().isoformat(),
+        'berat_badan': f'{rng.uniform(7, 18):.2f}',
+        'tinggi_badan': f'{rng.uniform(65, 110):.1f}',
+    })
+    klien.get(reverse('tampilkan_grafik_riwayat', args=[pasien['id']]))
+    klien.get(reverse('data_grafik_riwayat', args=[pasien['id']]))
+
+
+def skenario_pakar(klien, konteks, rng):
+    pakar = konteks['pakar']
+    if _lokasi(klien.post(reverse('login_pakar'), pakar)) is None:
+        return
+    klien.get(reverse('dashboard_pakar'))
+    klien.get(reverse('list_patients_pakar'))
+    klien.get(reverse('detail_pasien_pakar', args=[konteks['pasien']['id']]))
+    klien.get(reverse('list_pengukuran_pakar'))
+
+
+SKENARIO = {
+    'pasien_diagnosa': skenario_pasien_diagnosa,
+    'pasien_pengukuran': skenario_pasien_pengukuran,
+    'pakar': skenario_pakar,
+}
+
+
+def _persentil_ms(durasi):
+    p50, p95, p99 = np.percentile(durasi, [50, 95, 99]) * 1000
+    return {'p50_ms': round(p50, 1), 'p95_ms': round(p95, 1), 'p99_ms': round(p99, 1),
+            'maks_ms': round(max(durasi) * 1000, 1)}
+
+
+def ringkas_catatan(catatan, durasi_total):
+    """
+    Ringkas catatan permintaan per endpoint
+
+    Args:
+        catatan: List (endpoint, durasi_detik, status, error)
+        durasi_total: Durasi seluruh uji (detik) untuk throughput
+
+    Returns:
+        Dict laporan total, per endpoint dan daftar error terbanyak
+    """
+    per_endpoint = defaultdict(list)
+    error_endpoint = Counter()
+    jenis_error = Counter()
+    for endpoint, durasi, _, error in catatan:
+        per_endpoint[endpoint].append(durasi)
+        if error:
+            error_endpoint[endpoint] += 1
+            jenis_error[error[:200]] += 1
+
+    def statistik(durasi, error):
+        return {
+            'permintaan': len(durasi),
+            'error': error,
+            'tingkat_error': round(error / len(durasi), 4),
+            'throughput_per_detik': round(len(durasi) / durasi_total, 1) if durasi_total else 0.0,
+            **_persentil_ms(durasi),
+        }
+
+    semua = [durasi for _, durasi, _, _ in catatan]
+    return {
+        'total': statistik(semua, sum(error_endpoint.values())) if semua else {'permintaan': 0},
+        'endpoint': {
+            endpoint: statistik(durasi, error_endpoint[endpoint])
+            for endpoint, durasi in sorted(per_endpoint.items())
+        },
+        'error_teratas': dict(jenis_error.most_common(10)),
+    }
+
+
+def _siapkan_konteks(skenario, pakar, jumlah_pengguna, rng):
+    pasien = list(
+        Pasien.objects.filter(namaPengguna__startswith=PREFIX_NAMA_PENGGUNA)
+        .order_by('id').values('id', 'namaPengguna')[:MAKS_PASIEN]
+    )
+    if not pasien:
+        raise KesalahanUjiBeban(
+            'Tidak ada akun pasien sampel; jalankan `python manage.py buat_data_sampel` dahulu'
+        )
+    if 'pakar' in skenario and not pakar:
+        raise KesalahanUjiBeban('Skenario pakar membutuhkan nama pengguna dan kata sandi akun pakar')
+    gejala = list(Gejala.objects.values_list('kodeGejala', flat=True))
+    if 'pasien_diagnosa' in skenario and not gejala:
+        raise KesalahanUjiBeban('Basis pengetahuan kosong; jalankan `python manage.py load_knowledge_base` dahulu')
+
+    rng.shuffle(pasien)
+    return [
+        {
+            'pasien': {**pasien[i % len(pasien)], 'kataSandi': KATA_SANDI_SAMPEL},
+            'pakar': {'username': pakar[0], 'password': pakar[1]} if pakar else None,
+            'gejala': gejala,
+        }
+        for i in range(jumlah_pengguna)
+    ]
+
+
+def jalankan_uji_beban(skenario, jumlah_pengguna=8, iterasi=10, pakar=None, seed=None, jeda=0.0):
+    """
+    Jalankan skenario dari banyak pengguna virtual bersamaan
+
+    Pengguna virtual ke-i menjalankan skenario[i % len(skenario)] sebanyak
+    `iterasi` kali, masing-masing dengan sesi baru (login ulang).
+
+    Args:
+        skenario: List nama skenario (kunci SKENARIO)
+        jumlah_pengguna: Jumlah thread pengguna virtual
+        iterasi: Pengulangan skenario per pengguna
+        pakar: Tuple (username, password) akun pakar untuk skenario 'pakar'
+        seed: Seed acak (pemilihan pasien dan gejala)
+        jeda: Jeda berpikir antar iterasi (detik)
+
+    Returns:
+        Dict laporan (lihat ringkas_catatan) plus konfigurasi uji
+    """
+    tidak_dikenal = set(skenario) - set(SKENARIO)
+    if tidak_dikenal:
+        raise KesalahanUjiBeban(f"Skenario tidak dikenal: {', '.join(sorted(tidak_dikenal))}")
+    rng = random.Random(seed)
+    konteks = _siapkan_konteks(skenario, pakar, jumlah_pengguna, rng)
+    seed_pengguna = [rng.random() for _ in range(jumlah_pengguna)]
+    catatan = []
+    kunci = threading.Lock()
+
+    def pengguna_virtual(nomor):
+        lokal = []
+        rng_lokal = random.Random(seed_pengguna[nomor])
+        jalankan = SKENARIO[skenario[nomor % len(skenario)]]
+        try:
+            for _ in range(iterasi):
+                jalankan(KlienTerukur(lokal), konteks[nomor], rng_lokal)
+                if jeda:
+                    time.sleep(jeda)
+        finally:
+            # Koneksi database milik thread ini
+            connections.close_all()
+            with kunci:
+                catatan.extend(lokal)
+
+    mulai = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jumlah_pengguna) as pool:
+        list(pool.map(pengguna_virtual, range(jumlah_pengguna)))
+    durasi = time.perf_counter() - mulai
+
+    return {
+        'skenario': list(skenario),
+        'pengguna': jumlah_pengguna,
+        'iterasi': iterasi,
+        'durasi_detik': round(durasi, 3),
+        **ringkas_catatan(catatan, durasi),
+    }
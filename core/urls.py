@@ -24,16 +24,24 @@ urlpatterns = [
     
     # Paths for anthropometric data and notifications
     path('grafik/<int:pasien_id>/', views.tampilkan_grafik_riwayat, name='tampilkan_grafik_riwayat'),
+    path('grafik/<int:pasien_id>/data/', views.data_grafik_riwayat, name='data_grafik_riwayat'),
+    path('grafik/referensi/v<str:versi>/<str:jenis_kelamin>-<str:indikator>.json', views.kurva_referensi, name='kurva_referensi'),
     
     # Expert/Admin paths
     path('pakar/dashboard/', views.dashboard_pakar, name='dashboard_pakar'),
     path('pakar/help/', views.pakar_help, name='pakar_help'),
     path('pakar/rules/create/', views.create_rule_group, name='create_rule_group'),
     path('pakar/patients/', views.list_patients_pakar, name='list_patients_pakar'),
+    path('pakar/patients/cari/', views.cari_pasien_pakar, name='cari_pasien_pakar'),
     path('pakar/patients/<int:pasien_id>/', views.detail_pasien_pakar, name='detail_pasien_pakar'),
+    path('pakar/patients/<int:pasien_id>/konsultasi/', views.fragmen_konsultasi_pakar, name='fragmen_konsultasi_pakar'),
     path('pakar/patients/create/', views.create_pasien_pakar, name='create_pasien_pakar'),
+    path('pakar/patients/impor/', views.impor_pasien_pakar, name='impor_pasien_pakar'),
     path('pakar/patients/<int:pasien_id>/edit/', views.edit_pasien_pakar, name='edit_pasien_pakar'),
     path('pakar/patients/<int:pasien_id>/delete/', views.delete_pasien_pakar, name='delete_pasien_pakar'),
+    path('pakar/ekspor/<str:jenis>.<str:format>', views.ekspor_data_pakar, name='ekspor_data_pakar'),
+    path('pakar/diagnostik/', views.diagnostik_profil_pakar, name='diagnostik_profil_pakar'),
+    path('pakar/diagnostik/profil.json', views.diagnostik_profil_json, name='diagnostik_profil_json'),
     path('pakar/rules/', views.list_rules_pakar, name='list_rules_pakar'),
     path('pakar/rules/<str:pk>/detail/', views.show_rule_detail, name='show_rule_detail'),
     path('pakar/rules/<str:pk>/edit/', views.edit_rule_pakar, name='edit_rule_pakar'),
@@ -42,6 +50,7 @@ urlpatterns = [
     # Pengukuran (Measurement) management paths
     path('pakar/pengukuran/', views.list_pengukuran_pakar, name='list_pengukuran_pakar'),
     path('pakar/pengukuran/create/', views.create_pengukuran_pakar, name='create_pengukuran_pakar'),
+    path('pakar/pengukuran/impor/', views.impor_pengukuran_pakar, name='impor_pengukuran_pakar'),
     path('pakar/pengukuran/<int:pk>/edit/', views.edit_pengukuran_pakar, name='edit_pengukuran_pakar'),
     path('pakar/pengukuran/<int:pk>/delete/', views.delete_pengukuran_pakar, name='delete_pengukuran_pakar'),
     
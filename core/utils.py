@@ -1,6 +1,38 @@
 import random
+import time
+from functools import wraps
 from datetime import timedelta, date
+from django.db import transaction, OperationalError
 from .models import Pasien, PengukuranFisik, Notifikasi
+from .referensi import parameter_referensi, umur_bulan as hitung_umur_bulan
+
+
+def retry_on_db_lock(attempts=3, backoff=0.1):
+    """
+    Dekorator untuk menjalankan fungsi tulis dalam satu transaksi dan
+    mengulanginya bila SQLite menolak dengan "database is locked"
+
+    Args:
+        attempts: Jumlah maksimal percobaan
+        backoff: Jeda dasar (detik) antar percobaan, bertambah linear
+
+    Catatan: Pengulangan hanya dilakukan bila fungsi dipanggil di luar
+    transaksi lain, karena transaksi luar yang gagal tidak bisa diulang dari sini.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            for percobaan in range(1, attempts + 1):
+                bersarang = transaction.get_connection().in_atomic_block
+                try:
+                    with transaction.atomic():
+                        return func(*args, **kwargs)
+                except OperationalError as e:
+                    if 'locked' not in str(e) or bersarang or percobaan == attempts:
+                        raise
+                    time.sleep(backoff * percobaan)
+        return wrapper
+    return decorator
 
 def hitung_dan_simpan_zscore(pengukuran_id):
     """
@@ -30,7 +62,7 @@ def hitung_dan_simpan_zscore(pengukuran_id):
         raise ValueError(f"Data pengukuran tidak valid: {str(e)}")
     
     # Hitung Usia Anak dalam bulan (umur_bulan) dari tanggalLahir Pasien dan tanggalUkur
-    umur_bulan = (tanggal_ukur.year - tanggal_lahir.year) * 12 + (tanggal_ukur.month - tanggal_lahir.month)
+    umur_bulan = hitung_umur_bulan(tanggal_lahir, tanggal_ukur)
     
     # Validasi umur (harus positif dan masuk akal)
     if umur_bulan < 0:
@@ -49,22 +81,11 @@ def hitung_dan_simpan_zscore(pengukuran_id):
     # Berdasarkan umur_bulan dan jenisKelamin, kita akan mendapatkan:
     # median_berat, sd_berat, median_tinggi, sd_tinggi
     
-    # Untuk simulasi, kita gunakan nilai acak namun realistis berdasarkan umur
-    if umur_bulan <= 24:  # Bayi 0-24 bulan
-        median_berat = 0.5 * umur_bulan + 3.0
-        sd_berat = 0.2 * umur_bulan + 0.5
-        median_tinggi = 2.0 * umur_bulan + 45.0
-        sd_tinggi = 0.3 * umur_bulan + 1.0
-    elif umur_bulan <= 60:  # Balita 2-5 tahun
-        median_berat = 0.2 * umur_bulan + 7.0
-        sd_berat = 0.15 * umur_bulan + 0.8
-        median_tinggi = 1.5 * umur_bulan + 65.0
-        sd_tinggi = 0.2 * umur_bulan + 1.2
-    else:  # Anak > 5 tahun
-        median_berat = 0.15 * umur_bulan + 10.0
-        sd_berat = 0.1 * umur_bulan + 1.0
-        median_tinggi = 1.2 * umur_bulan + 80.0
-        sd_tinggi = 0.15 * umur_bulan + 1.5
+    # Untuk simulasi, kita gunakan nilai realistis berdasarkan umur (core/referensi.py;
+    # rumus yang sama dipakai untuk kurva SD pada grafik)
+    referensi = parameter_referensi(umur_bulan, jenis_kelamin)
+    median_berat, sd_berat = referensi['bb_u']
+    median_tinggi, sd_tinggi = referensi['tb_u']
     
     # Hitung Z-Score menggunakan rumus: (nilai - median) / SD
     try:
@@ -85,6 +106,27 @@ def hitung_dan_simpan_zscore(pengukuran_id):
     return pengukuran
 
 
+@retry_on_db_lock()
+def simpan_pengukuran_pasien(pengukuran_data):
+    """
+    Fungsi untuk menyimpan pengukuran baru beserta Z-Score dan jadwal
+    notifikasi berikutnya dalam satu transaksi tulis
+
+    Args:
+        pengukuran_data: Dict field PengukuranFisik (wajib berisi 'pasien')
+
+    Returns:
+        Objek PengukuranFisik yang telah diupdate dengan Z-Score
+
+    Raises:
+        ValueError: Jika Z-Score tidak dapat dihitung (transaksi dibatalkan)
+    """
+    pengukuran = PengukuranFisik.objects.create(**pengukuran_data)
+    pengukuran = hitung_dan_simpan_zscore(pengukuran.id)
+    buat_jadwal_notifikasi(pengukuran.pasien_id, pengukuran.tanggalUkur)
+    return pengukuran
+
+
 def buat_jadwal_notifikasi(pasien_id, tanggal_pengukuran_terakhir):
     """
     Fungsi untuk membuat jadwal notifikasi pengukuran ulang
@@ -0,0 +1,109 @@
+"""
+Versi basis pengetahuan (Gejala, Kondisi, Aturan).
+
+Satu angka di VersiBasisPengetahuan (pk=1) yang naik setiap kali basis
+pengetahuan berubah, dipakai sebagai bagian kunci cache yang bergantung pada
+aturan (versi lama otomatis tidak terpakai lagi, tanpa perlu menghapus cache).
+
+Signal menaikkan versi untuk perubahan satu objek (admin, CRUD gejala/kondisi).
+Perubahan banyak baris sekaligus dibungkus perubahan_kb(): satu transaksi,
+kenaikan dari signal ditunda, dan versi dinaikkan SEKALI di akhir blok.
+
+Fragmen template yang hanya bergantung pada basis pengetahuan (checklist
+gejala, tabel gejala/kondisi/aturan) di-cache dengan penanda_kb() sebagai
+bagian kuncinya. Penanda dibaca dari baris versi pada setiap request (satu
+lookup primary key, bukan query basis pengetahuan), tidak disimpan di cache:
+cache bawaan adalah LocMem per proses, sehingga penanda yang di-cache di satu
+worker tidak ikut berganti saat pakar mengubah data lewat worker lain.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import VersiBasisPengetahuan
+
+# Pk satu-satunya baris versi
+PK_VERSI = 1
+
+FRAGMEN_KB_TIMEOUT = getattr(settings, 'FRAGMEN_KB_TIMEOUT', 24 * 60 * 60)
+
+_lokal = threading.local()
+
+
+def versi_kb():
+    """Versi basis pengetahuan saat ini (0 bila baris versi belum ada)"""
+    return VersiBasisPengetahuan.objects.filter(pk=PK_VERSI).values_list('versi', flat=True).first() or 0
+
+
+def penanda_kb():
+    """
+    Penanda basis pengetahuan untuk kunci cache fragmen (satu query pk)
+
+    Berisi versi dan waktu kenaikannya: versi yang naik di transaksi yang
+    kemudian di-rollback bisa dipakai ulang oleh kenaikan berikutnya, waktunya
+    tidak, sehingga fragmen dari data yang batal tidak pernah tertukar.
+    """
+    baris = VersiBasisPengetahuan.objects.filter(pk=PK_VERSI).values_list('versi', 'diperbarui').first()
+    return f'{baris[0]}.{int(baris[1].timestamp() * 1_000_000)}' if baris else '0'
+
+
+def konteks_fragmen_kb(simpan=True):
+    """
+    Variabel template untuk {% cache fragmen_kb_timeout '<nama>' penanda_kb ... %}
+
+    Args:
+        simpan: False untuk render yang isinya bukan daftar lengkap (mis. halaman
+            daftar dengan pesan error): fragmen dirender tanpa dibaca/disimpan ke cache
+    """
+    if not simpan:
+        return {'penanda_kb': None, 'fragmen_kb_timeout': 0}
+    return {'penanda_kb': penanda_kb(), 'fragmen_kb_timeout': FRAGMEN_KB_TIMEOUT}
+
+
+def naikkan_versi_kb():
+    """
+    Naikkan versi basis pengetahuan
+
+    Di dalam blok perubahan_kb() hanya ditandai; kenaikan dilakukan sekali
+    saat blok selesai.
+    """
+    if getattr(_lokal, 'kedalaman', 0):
+        _lokal.berubah = True
+        return
+    with transaction.atomic():
+        # update() tidak mengisi auto_now, waktu kenaikan bagian dari penanda_kb()
+        if not VersiBasisPengetahuan.objects.filter(pk=PK_VERSI).update(
+            versi=F('versi') + 1, diperbarui=timezone.now()
+        ):
+            VersiBasisPengetahuan.objects.get_or_create(pk=PK_VERSI, defaults={'versi': 2})
+
+
+@contextmanager
+def perubahan_kb():
+    """
+    Blok perubahan basis pengetahuan: atomik dengan satu kenaikan versi
+
+    Contoh:
+        with perubahan_kb():
+            Aturan.objects.filter(...).delete()
+            Aturan.objects.bulk_create([...])
+            naikkan_versi_kb()  # bulk_create tidak memicu signal
+    """
+    kedalaman = getattr(_lokal, 'kedalaman', 0)
+    if kedalaman == 0:
+        _lokal.berubah = False
+    _lokal.kedalaman = kedalaman + 1
+    try:
+        with transaction.atomic():
+            yield
+            if kedalaman == 0:
+                # Dilepas sebelum kenaikan agar naikkan_versi_kb benar-benar menulis
+                _lokal.kedalaman = 0
+                if _lokal.berubah:
+                    naikkan_versi_kb()
+    finally:
+        _lokal.kedalaman = kedalaman
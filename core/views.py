@@ -1,24 +1,54 @@
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.http import JsonResponse
-from .models import Pasien, Konsultasi, DetailKonsultasi, Gejala, Kondisi, Aturan, PengukuranFisik, Notifikasi
-from django.db.models import Count
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
+from django.utils.functional import SimpleLazyObject
+from .models import Pasien, Konsultasi, DetailKonsultasi, Gejala, Kondisi, Aturan, PengukuranFisik, Notifikasi, PasienRingkasan, StatistikTotal
+from django.db.models import Prefetch, Q
 from collections import defaultdict
+import io
 import random
 from datetime import date, timedelta
-from .utils import hitung_dan_simpan_zscore, buat_jadwal_notifikasi
+from .basis_pengetahuan import (
+    KesalahanBasisPengetahuan, kode_kelompok_berikutnya, sinkron_aturan_kondisi, tambah_kelompok_aturan,
+)
+from .downsampling import pilih_titik_grafik
+from .ekspor import FORMAT_EKSPOR, JENIS_EKSPOR, nama_berkas_ekspor, stream_ekspor
+from .impor import (
+    KOLOM_OPSIONAL, KOLOM_PASIEN_OPSIONAL, KOLOM_PASIEN_WAJIB, KOLOM_WAJIB, KesalahanFormatImpor,
+    impor_pasien_csv, impor_pengukuran_csv,
+)
+from .middleware import pasien_id_sesi, pasien_required
+from .pagination import keyset_paginate
+from .pencarian import cari_pasien, filter_pasien
+from .profil import URUTAN_PROFIL, buffer_profil
+from .referensi import INDIKATOR, JENIS_KELAMIN, VERSI_REFERENSI, path_berkas_kurva, umur_bulan
+from .roles import GRUP_PAKAR, is_pakar, peran_pengguna
+from .statistik import statistik_dashboard, tunda_total
+from .utils import hitung_dan_simpan_zscore, retry_on_db_lock, simpan_pengukuran_pasien
+from .versi_kb import konteks_fragmen_kb, perubahan_kb
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth import authenticate, login, logout
 from django.forms import modelformset_factory, ModelForm
 from django import forms
 
+# Helper function to parse an optional YYYY-MM-DD filter value
+def _parse_tanggal(nilai):
+    try:
+        return date.fromisoformat(nilai) if nilai else None
+    except ValueError:
+        return None
+
 # Helper function to check if user is staff
 def is_staff(user):
     return user.is_staff
 
 # Helper function to check if user is an expert (staff but not superuser with Pakar Diagnosa group)
 def is_expert(user):
-    return user.is_staff and not user.is_superuser and user.groups.filter(name='Pakar Diagnosa').exists()
+    # Peran dimemo pada objek user (core.roles), jadi hanya satu query grup per request
+    return is_pakar(user)
 
 # Index view - redirect authenticated users to appropriate dashboard
 def home(request):
@@ -36,6 +66,7 @@ def home(request):
 # Create your views here.
 
 # PROMPT #1: Mesin Inferensi Forward Chaining Inti
+@retry_on_db_lock()
 def jalankan_inferensi(pasien_id, kode_gejala_input):
     """
     Implementasi Mesin Inferensi menggunakan metode Forward Chaining (Rantai Maju)
@@ -48,92 +79,56 @@ def jalankan_inferensi(pasien_id, kode_gejala_input):
         Objek Konsultasi yang berisi hasil diagnosa
     """
     
-    # Langkah 1: Inisiasi dan Pencatatan Konsultasi
-    try:
-        pasien = Pasien.objects.get(id=pasien_id)
-    except Pasien.DoesNotExist:
+    # Langkah 1: Validasi pasien dan gejala input
+    # Jumlah query tetap berapa pun jumlah gejala/aturan (tanpa query per gejala atau per kondisi)
+    if not Pasien.objects.filter(id=pasien_id).exists():
         raise ValueError("Pasien tidak ditemukan")
     
-    # Buat objek Konsultasi baru
-    konsultasi = Konsultasi.objects.create(pasien=pasien)
-    
-    # Catat semua kode_gejala_input ke dalam DetailKonsultasi
-    for kode_gejala in kode_gejala_input:
-        try:
-            gejala = Gejala.objects.get(kodeGejala=kode_gejala)
-            DetailKonsultasi.objects.create(konsultasi=konsultasi, gejala=gejala)
-        except Gejala.DoesNotExist:
-            # Lewati gejala yang tidak ditemukan
-            continue
+    # Gejala yang tidak ditemukan dilewati; gejala ganda dicatat sekali
+    kode_gejala_input = list(dict.fromkeys(kode_gejala_input))
+    gejala_valid = set(Gejala.objects.filter(kodeGejala__in=kode_gejala_input).values_list('kodeGejala', flat=True))
     
     # Inisialisasi Working Memory (WM) dengan kode_gejala_input
     working_memory = set(kode_gejala_input)
     
     # Langkah 2: Logika Forward Chaining (Pencocokan Aturan AND)
-    # Ambil semua objek Aturan dari database
-    semua_aturan = Aturan.objects.select_related('kondisi', 'gejala').all()
+    # Ambil semua aturan sebagai tuple kode (kondisi, kelompok, gejala): tanpa membuat objek model
+    semua_aturan = Aturan.objects.order_by('id').values_list('kondisi_id', 'kodeKelompokAturan', 'gejala_id')
     
-    # Kelompokkan aturan berdasarkan pasangan kondisi dan kodeKelompokAturan
-    aturan_kelompok = defaultdict(list)
-    for aturan in semua_aturan:
-        key = (aturan.kondisi.kodeKondisi, aturan.kodeKelompokAturan)
-        aturan_kelompok[key].append(aturan)
-    
-    # Ulangi setiap kelompok aturan yang teridentifikasi
-    diagnosis_ditemukan = False
-    hasil_kondisi = None
+    # Kelompokkan gejala aturan berdasarkan pasangan kondisi dan kodeKelompokAturan
+    aturan_kelompok = defaultdict(set)
+    for kode_kondisi, kode_kelompok, kode_gejala in semua_aturan:
+        aturan_kelompok[(kode_kondisi, kode_kelompok)].add(kode_gejala)
     
     # Variabel untuk menyimpan diagnosis terbaik berdasarkan persentase kecocokan
-    diagnosis_terbaik = None
+    hasil_kondisi_id = None
+    diagnosis_terbaik_id = None
     persentase_tertinggi = 0
-    diagnosis_parsial = False
     
-    for (kode_kondisi, kode_kelompok), aturan_list in aturan_kelompok.items():
-        if diagnosis_ditemukan:
+    for (kode_kondisi, kode_kelompok), gejala_dibutuhkan in aturan_kelompok.items():
+        # Jika semua gejala cocok (100%), aktivasi (firing) kelompok aturan ini dan hentikan
+        # forward chaining karena tujuan (diagnosis) telah tercapai.
+        # kondisi_id adalah foreign key, jadi kondisinya pasti ada (tanpa Kondisi.objects.get)
+        if gejala_dibutuhkan.issubset(working_memory):
+            hasil_kondisi_id = kode_kondisi
             break
-            
-        # Hitung jumlah total gejala yang dibutuhkan oleh kelompok aturan tersebut
-        total_gejala_dibutuhkan = len(aturan_list)
-        
-        # Periksa apakah SEMUA gejala yang dibutuhkan ada dalam Working Memory saat ini
-        gejala_dibutuhkan = set(aturan.gejala.kodeGejala for aturan in aturan_list)
-        gejala_cocok = gejala_dibutuhkan.intersection(working_memory)
         
-        # Jika semua gejala cocok (100%), gunakan diagnosis ini
-        if gejala_dibutuhkan.issubset(working_memory):
-            # Aktivasi (Firing): Jika suatu kelompok aturan terpenuhi (match 100%)
-            # Ambil kodeKondisi hasil
-            try:
-                hasil_kondisi = Kondisi.objects.get(kodeKondisi=kode_kondisi)
-                
-                # Set hasilKondisi pada objek Konsultasi yang sedang berjalan
-                konsultasi.hasilKondisi = hasil_kondisi
-                
-                # Hentikan proses looping dan forward chaining karena tujuan (diagnosis) telah tercapai
-                diagnosis_ditemukan = True
-                break
-            except Kondisi.DoesNotExist:
-                # Jika kondisi tidak ditemukan, lanjutkan ke kelompok aturan berikutnya
-                continue
-        else:
-            # Hitung persentase kecocokan untuk diagnosis terbaik jika tidak ada yang 100%
-            if total_gejala_dibutuhkan > 0:
-                persentase_cocok = len(gejala_cocok) / total_gejala_dibutuhkan
-                if persentase_cocok > persentase_tertinggi:
-                    persentase_tertinggi = persentase_cocok
-                    try:
-                        diagnosis_terbaik = Kondisi.objects.get(kodeKondisi=kode_kondisi)
-                    except Kondisi.DoesNotExist:
-                        pass
+        # Hitung persentase kecocokan untuk diagnosis terbaik jika tidak ada yang 100%
+        persentase_cocok = len(gejala_dibutuhkan & working_memory) / len(gejala_dibutuhkan)
+        if persentase_cocok > persentase_tertinggi:
+            persentase_tertinggi = persentase_cocok
+            diagnosis_terbaik_id = kode_kondisi
     
     # Jika tidak ada diagnosis yang cocok 100%, gunakan diagnosis dengan persentase tertinggi
-    if not diagnosis_ditemukan and diagnosis_terbaik:
-        konsultasi.hasilKondisi = diagnosis_terbaik
-        diagnosis_parsial = True
+    if hasil_kondisi_id is None:
+        hasil_kondisi_id = diagnosis_terbaik_id
     
-    # Output dan Penyimpanan
-    # Simpan (.save()) objek Konsultasi yang sudah diisi hasilKondisi
-    konsultasi.save()
+    # Output dan Penyimpanan: konsultasi disimpan sekali dengan hasilnya, detail gejala sekaligus
+    konsultasi = Konsultasi.objects.create(pasien_id=pasien_id, hasilKondisi_id=hasil_kondisi_id)
+    DetailKonsultasi.objects.bulk_create([
+        DetailKonsultasi(konsultasi=konsultasi, gejala_id=kode_gejala)
+        for kode_gejala in kode_gejala_input if kode_gejala in gejala_valid
+    ])
     
     # Kembalikan objek Konsultasi yang berisi hasil diagnosa
     return konsultasi
@@ -149,9 +144,10 @@ def form_diagnosa(request):
         return redirect('login_pasien')
     
     if request.method == 'GET':
-        # Metode GET: Ambil dan tampilkan semua objek Gejala untuk ditampilkan dalam formulir HTML
+        # Metode GET: Ambil dan tampilkan semua objek Gejala untuk ditampilkan dalam formulir HTML.
+        # Queryset baru dievaluasi bila fragmen checklist belum ada di cache
         gejala_list = Gejala.objects.all()
-        return render(request, 'diagnosa_form.html', {'gejala_list': gejala_list})
+        return render(request, 'diagnosa_form.html', {'gejala_list': gejala_list, **konteks_fragmen_kb()})
     
     elif request.method == 'POST':
         # Metode POST: Proses input dari form
@@ -306,57 +302,37 @@ def logout_pakar(request):
     return redirect('login_pakar')
 
 
+@pasien_required
 def dashboard_pasien(request):
     """
     View untuk dashboard Pasien
     """
-    # Pastikan pengguna sudah login (cek pasien_id di sesi)
-    if 'pasien_id' not in request.session:
-        return redirect('login_pasien')
-    
-    # Ambil data Pasien yang sedang login
-    pasien_id = request.session.get('pasien_id')
-    try:
-        pasien = Pasien.objects.get(id=pasien_id)
-    except Pasien.DoesNotExist:
-        # Jika pasien tidak ditemukan, hapus sesi dan arahkan ke login
-        request.session.flush()
-        return redirect('login_pasien')
-    
+    # Login dicek oleh pasien_required; request.pasien dipasang oleh
+    # PasienMiddleware dan diambil dari cache bila ada
     # Tampilkan ucapan selamat datang dan tautan ke fungsi diagnostik
     context = {
-        'pasien': pasien
+        'pasien': request.pasien
     }
     
     return render(request, 'dashboard_pasien.html', context)
 
 
+@pasien_required
 def edit_akun_pasien(request):
     """
     View untuk mengelola dan memperbarui informasi pribadi Pasien
     """
-    # Pastikan pengguna sudah login (cek pasien_id di sesi)
-    if 'pasien_id' not in request.session:
-        return redirect('login_pasien')
-    
-    # Ambil data Pasien yang sedang login
-    pasien_id = request.session.get('pasien_id')
-    try:
-        pasien = Pasien.objects.get(id=pasien_id)
-    except Pasien.DoesNotExist:
-        # Jika pasien tidak ditemukan, hapus sesi dan arahkan ke login
-        request.session.flush()
-        return redirect('login_pasien')
-    
     if request.method == 'GET':
         # Metode GET: Tampilkan formulir yang sudah terisi dengan data Pasien saat ini
         context = {
-            'pasien': pasien
+            'pasien': request.pasien
         }
         return render(request, 'edit_akun_pasien.html', context)
     
     elif request.method == 'POST':
         # Metode POST: Proses pembaruan data Pasien
+        # Ambil ulang dari database (bukan salinan cache) sebelum disimpan
+        pasien = get_object_or_404(Pasien, id=pasien_id_sesi(request))
         nama = request.POST.get('nama')
         nama_wali = request.POST.get('nama_wali')
         nomor_telepon = request.POST.get('nomor_telepon')
@@ -393,21 +369,12 @@ def edit_akun_pasien(request):
 
 
 # PROMPT #5: Data Klinis (Input, Z-Score Akurat, & Grafik)
+@pasien_required
 def input_pengukuran(request):
     """
     View untuk input data pengukuran fisik
     """
-    # Pastikan pengguna sudah login
-    if 'pasien_id' not in request.session:
-        return redirect('login_pasien')
-    
-    # Ambil pasien yang sedang login
-    pasien_id = request.session.get('pasien_id')
-    try:
-        pasien = Pasien.objects.get(id=pasien_id)
-    except Pasien.DoesNotExist:
-        request.session.flush()
-        return redirect('login_pasien')
+    pasien = request.pasien
     
     if request.method == 'GET':
         # Metode GET: Tampilkan formulir untuk input tanggalUkur, beratBadan, dan tinggiBadan
@@ -469,26 +436,20 @@ def input_pengukuran(request):
             if imunisasi:
                 pengukuran_data['imunisasi'] = imunisasi
             
-            pengukuran = PengukuranFisik.objects.create(**pengukuran_data)
-            
-            # Segera panggil hitung_dan_simpan_zscore(pengukuran_id) pada objek baru tersebut
+            # Simpan pengukuran, hitung Z-score, dan jadwalkan notifikasi berikutnya
+            # dalam satu transaksi (BEGIN IMMEDIATE dengan retry bila database terkunci)
             try:
-                hitung_dan_simpan_zscore(pengukuran.id)
+                simpan_pengukuran_pasien(pengukuran_data)
             except ValueError as e:
-                # Jika ada error dalam perhitungan Z-score, hapus pengukuran dan tampilkan error
-                pengukuran.delete()
+                # Jika ada error dalam perhitungan Z-score, transaksi dibatalkan dan tampilkan error
                 pengukuran_list = PengukuranFisik.objects.filter(pasien=pasien).order_by('-tanggalUkur')[:5]
                 return render(request, 'input_pengukuran.html', {
                     'error': f'Error dalam perhitungan Z-score: {str(e)}',
                     'pengukuran_list': pengukuran_list
                 })
             
-            # Panggil buat_jadwal_notifikasi(pasien_id, tanggal_pengukuran_terakhir) 
-            # untuk menjadwalkan pengukuran berikutnya
-            buat_jadwal_notifikasi(pasien_id, pengukuran.tanggalUkur)
-            
             # Redirect ke dashboard atau halaman grafik
-            return redirect('tampilkan_grafik_riwayat', pasien_id=pasien_id)
+            return redirect('tampilkan_grafik_riwayat', pasien_id=pasien.id)
             
         except ValueError as e:
             pengukuran_list = PengukuranFisik.objects.filter(pasien=pasien).order_by('-tanggalUkur')[:5]
@@ -506,7 +467,8 @@ def input_pengukuran(request):
 
 def tampilkan_grafik_riwayat(request, pasien_id):
     """
-    View untuk menampilkan grafik riwayat pengukuran fisik
+    View untuk menampilkan grafik riwayat pengukuran fisik.
+    Data seri diambil oleh halaman dari data_grafik_riwayat (JSON, bisa di-cache browser).
     
     Args:
         pasien_id: ID pasien
@@ -514,33 +476,133 @@ def tampilkan_grafik_riwayat(request, pasien_id):
     # Pastikan pengguna sudah login
     if 'pasien_id' not in request.session:
         return redirect('login_pasien')
-        
-    # Ambil semua data PengukuranFisik untuk pasien_id yang diurutkan berdasarkan tanggal
-    pengukuran_list = PengukuranFisik.objects.filter(pasien_id=pasien_id).order_by('tanggalUkur')
     
-    # Ubah data menjadi format JSON yang optimal untuk client-side rendering
+    context = {
+        'pasien_id': pasien_id,
+        'versi_referensi': VERSI_REFERENSI,
+    }
+    
+    return render(request, 'grafik_riwayat.html', context)
+
+
+# Batas target titik downsampling data grafik (?titik=N)
+TITIK_GRAFIK_MIN = 10
+TITIK_GRAFIK_MAKS = 2000
+
+
+def _validator_grafik(request, pasien_id):
+    """
+    Validator cache data grafik: jumlah pengukuran dan waktu perubahan terakhir,
+    dibaca dari PasienRingkasan (satu query PK, tanpa membaca baris PengukuranFisik).
+    Dimemo pada request karena dipakai oleh etag_func dan last_modified_func.
+
+    Returns:
+        Tuple (etag, last_modified), atau (None, None) bila ringkasan belum ada
+    """
+    if not hasattr(request, '_validator_grafik'):
+        ringkasan = (
+            PasienRingkasan.objects.filter(pasien_id=pasien_id)
+            .values('jumlahPengukuran', 'pengukuranDiperbarui', 'diperbarui')
+            .first()
+        )
+        if ringkasan is None:
+            request._validator_grafik = (None, None)
+        else:
+            waktu = ringkasan['pengukuranDiperbarui'] or ringkasan['diperbarui']
+            etag = f"grafik-{pasien_id}-{ringkasan['jumlahPengukuran']}-{waktu.timestamp():.6f}"
+            request._validator_grafik = (etag, waktu)
+    return request._validator_grafik
+
+
+def seri_grafik_zscore(pasien_id):
+    """
+    Seri Z-Score BB/U dan TB/U seorang pasien, urut tanggal ukur.
+    Setiap titik juga membawa umur (bulan) dan nilai mentah (kg/cm) untuk kurva referensi.
+
+    Returns:
+        Dict {'jenis_kelamin', 'bb_u': [{'tgl', 'score', 'umur', 'nilai'}, ...], 'tb_u': [...]}
+    """
+    pasien = Pasien.objects.values('jenisKelamin', 'tanggalLahir').get(id=pasien_id)
+    baris = (
+        PengukuranFisik.objects.filter(pasien_id=pasien_id)
+        .order_by('tanggalUkur')
+        .values_list('tanggalUkur', 'beratBadan', 'tinggiBadan', 'skor_Z_BB_U', 'skor_Z_TB_U')
+    )
     data_bb_u = []
     data_tb_u = []
-    
-    for pengukuran in pengukuran_list:
+    for tanggal_ukur, berat, tinggi, z_bb_u, z_tb_u in baris:
+        tgl = tanggal_ukur.strftime('%Y-%m-%d')
+        umur = umur_bulan(pasien['tanggalLahir'], tanggal_ukur)
         data_bb_u.append({
-            'tgl': pengukuran.tanggalUkur.strftime('%Y-%m-%d'),
-            'score': float(pengukuran.skor_Z_BB_U) if pengukuran.skor_Z_BB_U is not None else None
+            'tgl': tgl, 'score': float(z_bb_u) if z_bb_u is not None else None,
+            'umur': umur, 'nilai': float(berat),
         })
-        
         data_tb_u.append({
-            'tgl': pengukuran.tanggalUkur.strftime('%Y-%m-%d'),
-            'score': float(pengukuran.skor_Z_TB_U) if pengukuran.skor_Z_TB_U is not None else None
+            'tgl': tgl, 'score': float(z_tb_u) if z_tb_u is not None else None,
+            'umur': umur, 'nilai': float(tinggi),
         })
+    return {'jenis_kelamin': pasien['jenisKelamin'], 'bb_u': data_bb_u, 'tb_u': data_tb_u}
+
+
+@condition(
+    etag_func=lambda request, pasien_id: _validator_grafik(request, pasien_id)[0],
+    last_modified_func=lambda request, pasien_id: _validator_grafik(request, pasien_id)[1],
+)
+def _respon_data_grafik(request, pasien_id):
+    data = seri_grafik_zscore(pasien_id)
+    data['jumlah_pengukuran'] = len(data['bb_u'])
+    titik = _parse_titik_grafik(request.GET.get('titik'))
+    if titik is not None:
+        # Downsampling LTTB: payload dan waktu render tetap terbatas untuk riwayat panjang
+        data['bb_u'] = pilih_titik_grafik(data['bb_u'], titik)
+        data['tb_u'] = pilih_titik_grafik(data['tb_u'], titik)
+    data['pasien_id'] = pasien_id
+    return JsonResponse(data)
+
+
+def _parse_titik_grafik(nilai):
+    """Target jumlah titik dari query string ?titik=N (dibatasi), atau None bila tidak diminta"""
+    try:
+        titik = int(nilai)
+    except (TypeError, ValueError):
+        return None
+    return min(max(titik, TITIK_GRAFIK_MIN), TITIK_GRAFIK_MAKS)
+
+
+@require_GET
+@cache_control(private=True, no_cache=True)
+def data_grafik_riwayat(request, pasien_id):
+    """
+    API JSON seri grafik Z-Score dengan respons kondisional.
+    Browser/klien mobile mengirim If-None-Match / If-Modified-Since dan menerima
+    304 Not Modified bila tidak ada pengukuran yang berubah.
+    Parameter opsional ?titik=N membatasi jumlah titik per indikator (LTTB).
     
-    # Kembalikan data untuk rendering grafik di template
-    context = {
-        'data_bb_u': data_bb_u,
-        'data_tb_u': data_tb_u,
-        'pasien_id': pasien_id,
-    }
-    
-    return render(request, 'grafik_riwayat.html', context)
+    Args:
+        pasien_id: ID pasien (hanya pasien itu sendiri atau pakar)
+    """
+    if pasien_id_sesi(request) != pasien_id and not is_expert(request.user):
+        return JsonResponse({'error': 'Tidak diizinkan'}, status=403)
+    # Pasien tanpa ringkasan hampir selalu berarti ID tidak dikenal (pakar boleh meminta ID apa pun);
+    # validator di-cache di request sehingga jalur normal tidak menambah query
+    if _validator_grafik(request, pasien_id)[0] is None and not Pasien.objects.filter(id=pasien_id).exists():
+        return JsonResponse({'error': 'Pasien tidak ditemukan'}, status=404)
+    return _respon_data_grafik(request, pasien_id)
+
+
+@require_GET
+@cache_control(public=True, max_age=60 * 60 * 24 * 365, immutable=True)
+def kurva_referensi(request, versi, jenis_kelamin, indikator):
+    """
+    Kurva referensi -3..+3 SD yang sudah dibangun oleh `manage.py bangun_aset_grafik`.
+    Versi ada di URL sehingga isi berkas tidak pernah berubah (cache immutable 1 tahun).
+    """
+    if versi != VERSI_REFERENSI or jenis_kelamin not in JENIS_KELAMIN or indikator not in INDIKATOR:
+        raise Http404('Kurva referensi tidak ditemukan')
+    path = path_berkas_kurva(jenis_kelamin, indikator, versi)
+    if not path.exists():
+        raise Http404('Kurva referensi belum dibangun')
+    return FileResponse(open(path, 'rb'), content_type='application/json')
 
 
 # Expert/Admin Views
@@ -573,22 +635,13 @@ def create_rule_group(request):
             })
         
         try:
-            # Ambil Kondisi
-            kondisi = Kondisi.objects.get(kodeKondisi=kondisi_id)
-            
-            # Untuk setiap Gejala yang dipilih, buat entri terpisah dalam tabel Aturan
-            for gejala_id in gejala_ids:
-                gejala = Gejala.objects.get(kodeGejala=gejala_id)
-                Aturan.objects.create(
-                    kondisi=kondisi,
-                    gejala=gejala,
-                    kodeKelompokAturan=kode_kelompok
-                )
+            # Satu entri Aturan per Gejala, ditulis sekaligus (bulk) dalam satu transaksi
+            tambah_kelompok_aturan(kondisi_id, kode_kelompok, gejala_ids)
             
             # Redirect ke daftar aturan
             return redirect('list_rules_pakar')
             
-        except Exception as e:
+        except (Kondisi.DoesNotExist, KesalahanBasisPengetahuan) as e:
             return render(request, 'pakar_create_rule.html', {
                 'kondisi_list': kondisi_list,
                 'gejala_list': gejala_list,
@@ -614,17 +667,48 @@ def create_rule_group(request):
     })
 
 
+# Pilihan urutan daftar pasien pakar
+URUTAN_DAFTAR_PASIEN = {
+    'nama': ('nama', 'id'),
+    'tanggal': ('-ringkasan__tanggalUkurTerakhir', 'id'),
+    'zscore': ('ringkasan__skor_Z_TB_U', 'id'),
+}
+
+
 @login_required
 @user_passes_test(is_expert)
 def list_patients_pakar(request):
     """
-    View untuk menampilkan daftar semua Pasien
+    View untuk menampilkan daftar semua Pasien beserta ringkasan pertumbuhan terakhir
     """
-    # Ambil semua pasien
-    pasien_list = Pasien.objects.all().order_by('nama')
+    # Filter status dan urutan dibaca dari tabel ringkasan (PasienRingkasan) yang berindeks
+    status = request.GET.get('status', '')
+    urut = request.GET.get('urut', 'nama')
+    if urut not in URUTAN_DAFTAR_PASIEN:
+        urut = 'nama'
+    
+    q = request.GET.get('q', '').strip()
+    
+    pasien_list = Pasien.objects.select_related('ringkasan', 'ringkasan__hasilKondisiTerakhir')
+    if status in dict(PasienRingkasan.STATUS_CHOICES):
+        pasien_list = pasien_list.filter(ringkasan__statusPertumbuhan=status)
+    if urut == 'zscore':
+        # NULL diurutkan paling awal: pasien tanpa Z-Score tidak termasuk urutan "terendah"
+        pasien_list = pasien_list.filter(ringkasan__skor_Z_TB_U__isnull=False)
+    if q:
+        # Awalan kata pada nama, nama pengguna atau nama wali (indeks FTS, lihat core/pencarian.py)
+        pasien_list = filter_pasien(pasien_list, q)
+    
+    # Paginasi keyset: biaya per halaman konstan seberapa jauh pun halaman yang dibuka
+    page = keyset_paginate(request, pasien_list, URUTAN_DAFTAR_PASIEN[urut])
     
     context = {
-        'pasien_list': pasien_list,
+        'pasien_list': page,
+        'page': page,
+        'q': q,
+        'status_choices': PasienRingkasan.STATUS_CHOICES,
+        'status_terpilih': status,
+        'urut': urut,
         'page_title': 'Daftar Pasien',
         'breadcrumb_items': [
             ('Dashboard', 'dashboard_pakar'),
@@ -635,6 +719,45 @@ def list_patients_pakar(request):
     return render(request, 'pakar_list_patients.html', context)
 
 
+@require_GET
+@login_required
+@user_passes_test(is_expert)
+def cari_pasien_pakar(request):
+    """
+    API JSON autocomplete pasien untuk pemilih pasien di form pakar.
+    Parameter ?q= berisi awalan kata nama, nama pengguna atau nama wali;
+    mengembalikan paling banyak BATAS_AUTOCOMPLETE pasien yang cocok, urut nama
+    (tanpa peringkat relevansi, lihat cari_pasien).
+    """
+    hasil = cari_pasien(request.GET.get('q', ''))
+    return JsonResponse({'hasil': [
+        {
+            'id': p['id'],
+            'label': f"{p['nama']} ({p['namaPengguna']})",
+            'tanggalLahir': p['tanggalLahir'].isoformat(),
+        }
+        for p in hasil
+    ]})
+
+
+URUTAN_KONSULTASI = ('-tanggalKonsultasi', 'id')
+KONSULTASI_PER_HALAMAN = 10
+
+
+def _konsultasi_dengan_gejala(pasien):
+    """
+    Queryset Konsultasi milik pasien beserta hasil diagnosa dan gejalanya.
+    Detail gejala diambil sekali untuk seluruh halaman (prefetch), bukan per konsultasi.
+    """
+    return Konsultasi.objects.filter(pasien=pasien).select_related('hasilKondisi').prefetch_related(
+        Prefetch(
+            'detailkonsultasi_set',
+            queryset=DetailKonsultasi.objects.select_related('gejala').order_by('gejala__kodeGejala'),
+            to_attr='detail_gejala',
+        )
+    )
+
+
 @login_required
 @user_passes_test(is_expert)
 def detail_pasien_pakar(request, pasien_id):
@@ -653,17 +776,34 @@ def detail_pasien_pakar(request, pasien_id):
     # Ambil semua data PengukuranFisik
     pengukuran_list = PengukuranFisik.objects.filter(pasien=pasien).order_by('-tanggalUkur')
     
-    # Ambil riwayat Konsultasi
-    konsultasi_list = Konsultasi.objects.filter(pasien=pasien).order_by('-tanggalKonsultasi')
-    
-    # Untuk setiap konsultasi, ambil detail gejala
-    for konsultasi in konsultasi_list:
-        konsultasi.detail_gejala = DetailKonsultasi.objects.filter(konsultasi=konsultasi).select_related('gejala')
+    # Hanya halaman pertama riwayat Konsultasi; yang lebih lama dimuat lewat fragmen
+    konsultasi_page = keyset_paginate(
+        request, _konsultasi_dengan_gejala(pasien), URUTAN_KONSULTASI, per_page=KONSULTASI_PER_HALAMAN
+    )
     
     return render(request, 'pakar_detail_pasien.html', {
         'pasien': pasien,
         'pengukuran_list': pengukuran_list,
-        'konsultasi_list': konsultasi_list
+        'konsultasi_list': konsultasi_page,
+        'page': konsultasi_page,
+    })
+
+
+@login_required
+@user_passes_test(is_expert)
+def fragmen_konsultasi_pakar(request, pasien_id):
+    """
+    Fragmen HTML (baris tabel) riwayat Konsultasi yang lebih lama,
+    dimuat bertahap dari halaman detail pasien dengan cursor keyset
+    """
+    pasien = get_object_or_404(Pasien, id=pasien_id)
+    konsultasi_page = keyset_paginate(
+        request, _konsultasi_dengan_gejala(pasien), URUTAN_KONSULTASI, per_page=KONSULTASI_PER_HALAMAN
+    )
+    return render(request, 'pakar_konsultasi_rows.html', {
+        'pasien': pasien,
+        'konsultasi_list': konsultasi_page,
+        'page': konsultasi_page,
     })
 
 
@@ -673,17 +813,21 @@ def list_rules_pakar(request):
     """
     View untuk menampilkan daftar semua Aturan yang terstruktur
     """
-    # Ambil semua aturan dan kelompokkan berdasarkan kodeKelompokAturan
-    aturan_list = Aturan.objects.select_related('kondisi', 'gejala').order_by('kodeKelompokAturan')
-    
-    # Kelompokkan aturan berdasarkan kodeKelompokAturan dan kondisi
-    aturan_kelompok = defaultdict(list)
-    for aturan in aturan_list:
-        key = (aturan.kodeKelompokAturan, aturan.kondisi)
-        aturan_kelompok[key].append(aturan)
+    def kelompokkan():
+        # Ambil semua aturan dan kelompokkan berdasarkan kodeKelompokAturan
+        aturan_list = Aturan.objects.select_related('kondisi', 'gejala').order_by('kodeKelompokAturan')
+        
+        # Kelompokkan aturan berdasarkan kodeKelompokAturan dan kondisi
+        aturan_kelompok = defaultdict(list)
+        for aturan in aturan_list:
+            key = (aturan.kodeKelompokAturan, aturan.kondisi)
+            aturan_kelompok[key].append(aturan)
+        return dict(aturan_kelompok)
     
     context = {
-        'aturan_kelompok': dict(aturan_kelompok),
+        # Hanya dihitung bila fragmen tabel aturan belum di-cache
+        'aturan_kelompok': SimpleLazyObject(kelompokkan),
+        **konteks_fragmen_kb(),
         'page_title': 'Daftar Aturan',
         'breadcrumb_items': [
             ('Dashboard', 'dashboard_pakar'),
@@ -705,7 +849,8 @@ def show_rule_detail(request, pk):
         kondisi = Kondisi.objects.get(kodeKondisi=pk)
     except Kondisi.DoesNotExist:
         return render(request, 'pakar_list_rules.html', {
-            'error': 'Aturan tidak ditemukan'
+            'error': 'Aturan tidak ditemukan',
+            **konteks_fragmen_kb(simpan=False),
         })
     
     # Ambil semua aturan yang terkait dengan kondisi ini
@@ -741,6 +886,7 @@ def edit_rule_pakar(request, pk):
     gejala_list = Gejala.objects.all()
     
     # Group aturan by kodeKelompokAturan for easier editing
+    error = None
     rule_groups = {}
     for aturan in aturan_list:
         if aturan.kodeKelompokAturan not in rule_groups:
@@ -750,31 +896,24 @@ def edit_rule_pakar(request, pk):
     if request.method == 'POST':
         # Handle form submission for updating rules
         try:
-            # Clear existing rules for this condition
-            Aturan.objects.filter(kondisi=kondisi).delete()
-            
             # Process submitted rule groups
+            kelompok = defaultdict(set)
             for key, value in request.POST.items():
-                if key.startswith('rule_group_'):
-                    group_index = key.split('_')[2]
+                group_index = key[len('rule_group_'):]
+                if key.startswith('rule_group_') and group_index.isdigit():
                     gejala_ids = request.POST.getlist(f'gejala_{group_index}')
                     kode_kelompok = request.POST.get(f'kode_kelompok_{group_index}', f'R{int(group_index)+1:02d}')
-                    
-                    # Create new rules for each selected gejala
-                    for gejala_id in gejala_ids:
-                        if gejala_id:  # Only if a gejala is selected
-                            gejala = Gejala.objects.get(kodeGejala=gejala_id)
-                            Aturan.objects.create(
-                                kondisi=kondisi,
-                                gejala=gejala,
-                                kodeKelompokAturan=kode_kelompok
-                            )
+                    kelompok[kode_kelompok].update(gejala_ids)
+            
+            # Hanya aturan yang berubah yang dihapus/dibuat, atomik dengan satu kenaikan versi
+            sinkron_aturan_kondisi(kondisi, kelompok)
             
             messages.success(request, f'Aturan untuk Kondisi {kondisi.namaKondisi} berhasil diperbarui.')
             return redirect('list_rules_pakar')
             
-        except Exception as e:
-            messages.error(request, f'Terjadi kesalahan saat memperbarui aturan: {str(e)}')
+        except KesalahanBasisPengetahuan as e:
+            # Ditampilkan di form (seperti create_rule_group), bukan lewat messages yang tidak dirender template ini
+            error = f'Terjadi kesalahan saat memperbarui aturan: {str(e)}'
 
     context = {
         'page_title': f"Edit Aturan: {kondisi.namaKondisi}",
@@ -783,6 +922,9 @@ def edit_rule_pakar(request, pk):
         'aturan_list': aturan_list,
         'rule_groups': rule_groups,
         'gejala_list': gejala_list,
+        # Kondisi tanpa aturan: usulkan kode yang belum dipakai kondisi lain
+        'kode_kelompok_baru': '' if rule_groups else kode_kelompok_berikutnya(),
+        'error': error,
     }
     return render(request, 'pakar_form_rule.html', context)
 
@@ -797,8 +939,9 @@ def delete_rule_pakar(request, pk):
     kondisi = get_object_or_404(Kondisi, pk=pk)
     
     if request.method == 'POST':
-        # Hapus semua aturan yang terkait dengan kondisi ini
-        Aturan.objects.filter(kondisi=kondisi).delete()
+        # Hapus semua aturan yang terkait dengan kondisi ini (satu kenaikan versi)
+        with perubahan_kb(), tunda_total():
+            Aturan.objects.filter(kondisi=kondisi).delete()
         messages.success(request, f'Semua Aturan untuk Kondisi "{kondisi.namaKondisi}" berhasil dihapus.')
         return redirect('list_rules_pakar')
 
@@ -821,19 +964,19 @@ def dashboard_pakar(request):
     """
     View untuk dashboard Pakar - menampilkan statistik sistem
     """
-    # Ambil statistik sistem
-    total_pasien = Pasien.objects.count()
-    total_konsultasi = Konsultasi.objects.count()
-    total_gejala = Gejala.objects.count()
-    total_kondisi = Kondisi.objects.count()
-    total_aturan = Aturan.objects.count()
+    # Statistik dibaca dari counter & rollup harian (core.statistik), bukan COUNT(*)
+    statistik = statistik_dashboard()
+    total = statistik['total']
     
     context = {
-        'total_pasien': total_pasien,
-        'total_konsultasi': total_konsultasi,
-        'total_gejala': total_gejala,
-        'total_kondisi': total_kondisi,
-        'total_aturan': total_aturan,
+        'total_pasien': total[StatistikTotal.PASIEN],
+        'total_konsultasi': total[StatistikTotal.KONSULTASI],
+        'total_gejala': total[StatistikTotal.GEJALA],
+        'total_kondisi': total[StatistikTotal.KONDISI],
+        'total_aturan': total[StatistikTotal.ATURAN],
+        'tren': statistik['tren'],
+        'kondisi_list': Kondisi.objects.order_by('kodeKondisi').values_list('kodeKondisi', 'namaKondisi'),
+        'profil_aktif': settings.PROFIL_REQUEST,
         'page_title': 'Dashboard Pakar',
         # Removed breadcrumb_items to avoid redundancy with page_title
     }
@@ -871,7 +1014,7 @@ def login_pakar(request):
         
         if user is not None:
             # Check if user is staff and belongs to "Pakar Diagnosa" group
-            if user.is_staff and user.groups.filter(name='Pakar Diagnosa').exists():
+            if user.is_staff and GRUP_PAKAR in peran_pengguna(user):
                 login(request, user)
                 # Redirect to pakar patients list
                 return redirect('list_patients_pakar')
@@ -896,10 +1039,20 @@ def list_gejala_pakar(request):
     """
     View untuk menampilkan daftar semua Gejala
     """
-    gejala_list = Gejala.objects.all().order_by('kodeGejala')
+    gejala_list = Gejala.objects.all()
+    q = request.GET.get('q', '').strip()
+    if q:
+        # Memindai tabel (LIKE '%q%'); gejala hanya puluhan baris
+        gejala_list = gejala_list.filter(Q(kodeGejala__istartswith=q) | Q(namaGejala__icontains=q))
+    
+    # Dievaluasi saat template merender tabel, yaitu hanya bila fragmennya belum di-cache
+    page = SimpleLazyObject(lambda: keyset_paginate(request, gejala_list, ('kodeGejala',)))
     
     context = {
-        'gejala_list': gejala_list,
+        'gejala_list': page,
+        'page': page,
+        'q': q,
+        **konteks_fragmen_kb(),
         'page_title': 'Daftar Gejala',
         'breadcrumb_items': [
             ('Dashboard', 'dashboard_pakar'),
@@ -991,7 +1144,8 @@ def edit_gejala_pakar(request, pk):
         gejala = Gejala.objects.get(kodeGejala=pk)
     except Gejala.DoesNotExist:
         return render(request, 'pakar_list_gejala.html', {
-            'error': 'Gejala tidak ditemukan'
+            'error': 'Gejala tidak ditemukan',
+            **konteks_fragmen_kb(simpan=False),
         })
     
     if request.method == 'POST':
@@ -1070,7 +1224,9 @@ def delete_gejala_pakar(request, pk):
     """
     try:
         gejala = Gejala.objects.get(kodeGejala=pk)
-        gejala.delete()
+        # Aturan ikut terhapus (CASCADE): versi KB dan counter ditulis sekali, bukan per aturan
+        with perubahan_kb(), tunda_total():
+            gejala.delete()
     except Gejala.DoesNotExist:
         pass  # Jika tidak ditemukan, abaikan
     
@@ -1083,10 +1239,20 @@ def list_kondisi_pakar(request):
     """
     View untuk menampilkan daftar semua Kondisi
     """
-    kondisi_list = Kondisi.objects.all().order_by('kodeKondisi')
+    kondisi_list = Kondisi.objects.all()
+    q = request.GET.get('q', '').strip()
+    if q:
+        # Memindai tabel (LIKE '%q%'); kondisi hanya beberapa baris
+        kondisi_list = kondisi_list.filter(Q(kodeKondisi__istartswith=q) | Q(namaKondisi__icontains=q))
+    
+    # Dievaluasi saat template merender tabel, yaitu hanya bila fragmennya belum di-cache
+    page = SimpleLazyObject(lambda: keyset_paginate(request, kondisi_list, ('kodeKondisi',)))
     
     context = {
-        'kondisi_list': kondisi_list,
+        'kondisi_list': page,
+        'page': page,
+        'q': q,
+        **konteks_fragmen_kb(),
         'page_title': 'Daftar Kondisi',
         'breadcrumb_items': [
             ('Dashboard', 'dashboard_pakar'),
@@ -1165,7 +1331,8 @@ def edit_kondisi_pakar(request, pk):
         kondisi = Kondisi.objects.get(kodeKondisi=pk)
     except Kondisi.DoesNotExist:
         return render(request, 'pakar_list_kondisi.html', {
-            'error': 'Kondisi tidak ditemukan'
+            'error': 'Kondisi tidak ditemukan',
+            **konteks_fragmen_kb(simpan=False),
         })
     
     if request.method == 'POST':
@@ -1230,7 +1397,9 @@ def delete_kondisi_pakar(request, pk):
     """
     try:
         kondisi = Kondisi.objects.get(kodeKondisi=pk)
-        kondisi.delete()
+        # Aturan ikut terhapus (CASCADE): versi KB dan counter ditulis sekali, bukan per aturan
+        with perubahan_kb(), tunda_total():
+            kondisi.delete()
     except Kondisi.DoesNotExist:
         pass  # Jika tidak ditemukan, abaikan
     
@@ -1321,6 +1490,45 @@ def create_pasien_pakar(request):
     return render(request, 'pakar_form_pasien.html', context)
 
 
+@login_required
+@user_passes_test(is_expert)
+@cache_control(private=True, no_store=True)
+def impor_pasien_pakar(request):
+    """
+    View untuk mendaftarkan banyak pasien sekaligus dari berkas CSV
+    """
+    context = {
+        'kolom_wajib': KOLOM_PASIEN_WAJIB,
+        'kolom_opsional': KOLOM_PASIEN_OPSIONAL,
+        'page_title': 'Impor Pasien (CSV)',
+        'breadcrumb_items': [
+            ('Dashboard', 'dashboard_pakar'),
+            ('Pasien', 'list_patients_pakar'),
+            ('Impor CSV', 'impor_pasien_pakar'),
+        ]
+    }
+    
+    if request.method == 'POST':
+        berkas = request.FILES.get('berkas')
+        if not berkas:
+            context['error'] = 'Pilih berkas CSV yang akan diimpor'
+            return render(request, 'pakar_impor_pasien.html', context)
+        
+        delimiter = ';' if request.POST.get('delimiter') == ';' else ','
+        teks = io.TextIOWrapper(berkas.file, encoding='utf-8-sig', newline='')
+        try:
+            # Hash kata sandi dihitung paralel (process pool), pasien ditulis dengan bulk_create
+            laporan = impor_pasien_csv(teks, delimiter=delimiter)
+        except (KesalahanFormatImpor, UnicodeDecodeError) as e:
+            context['error'] = f'Berkas tidak dapat dibaca: {e}'
+            return render(request, 'pakar_impor_pasien.html', context)
+        
+        context['laporan'] = laporan
+        context['gagal_ditampilkan'] = laporan['gagal'][:200]
+    
+    return render(request, 'pakar_impor_pasien.html', context)
+
+
 @login_required
 @user_passes_test(is_expert)
 def edit_pasien_pakar(request, pasien_id):
@@ -1450,11 +1658,32 @@ def list_pengukuran_pakar(request):
     """
     View untuk menampilkan daftar semua Pengukuran
     """
-    # Ambil semua pengukuran dengan informasi pasien
-    pengukuran_list = PengukuranFisik.objects.select_related('pasien').order_by('-tanggalUkur')
+    # Ambil pengukuran dengan informasi pasien, difilter di sisi server
+    pengukuran_list = PengukuranFisik.objects.select_related('pasien')
+    
+    dari = _parse_tanggal(request.GET.get('dari'))
+    sampai = _parse_tanggal(request.GET.get('sampai'))
+    pasien_id = request.GET.get('pasien', '')
+    q = request.GET.get('q', '').strip()
+    if dari:
+        pengukuran_list = pengukuran_list.filter(tanggalUkur__gte=dari)
+    if sampai:
+        pengukuran_list = pengukuran_list.filter(tanggalUkur__lte=sampai)
+    if pasien_id.isdigit():
+        pengukuran_list = pengukuran_list.filter(pasien_id=pasien_id)
+    if q:
+        # Pasien dicari lewat indeks pasien_nama_ci_idx, pengukurannya lewat indeks pasien_id
+        pengukuran_list = pengukuran_list.filter(pasien__nama__istartswith=q)
+    
+    # Paginasi keyset pada (-tanggalUkur, id) memakai indeks pengukuran_tgl_id_idx
+    page = keyset_paginate(request, pengukuran_list, ('-tanggalUkur', 'id'))
     
     context = {
-        'pengukuran_list': pengukuran_list,
+        'pengukuran_list': page,
+        'page': page,
+        'dari': dari,
+        'sampai': sampai,
+        'q': q,
         'page_title': 'Daftar Pengukuran',
         'breadcrumb_items': [
             ('Dashboard', 'dashboard_pakar'),
@@ -1465,18 +1694,155 @@ def list_pengukuran_pakar(request):
     return render(request, 'pakar_list_pengukuran.html', context)
 
 
+@login_required
+@user_passes_test(is_expert)
+def impor_pengukuran_pakar(request):
+    """
+    View untuk mengunggah lembar CSV pengukuran posyandu (impor massal)
+    """
+    context = {
+        'kolom_wajib': KOLOM_WAJIB,
+        'kolom_opsional': KOLOM_OPSIONAL,
+        'page_title': 'Impor Pengukuran (CSV)',
+        'breadcrumb_items': [
+            ('Dashboard', 'dashboard_pakar'),
+            ('Pengukuran', 'list_pengukuran_pakar'),
+            ('Impor CSV', 'impor_pengukuran_pakar'),
+        ]
+    }
+    
+    if request.method == 'POST':
+        berkas = request.FILES.get('berkas')
+        if not berkas:
+            context['error'] = 'Pilih berkas CSV yang akan diimpor'
+            return render(request, 'pakar_impor_pengukuran.html', context)
+        
+        delimiter = ';' if request.POST.get('delimiter') == ';' else ','
+        # Dibaca streaming dari berkas unggahan (bukan .read() seluruh isi)
+        teks = io.TextIOWrapper(berkas.file, encoding='utf-8-sig', newline='')
+        try:
+            laporan = impor_pengukuran_csv(teks, delimiter=delimiter)
+        except (KesalahanFormatImpor, UnicodeDecodeError) as e:
+            context['error'] = f'Berkas tidak dapat dibaca: {e}'
+            return render(request, 'pakar_impor_pengukuran.html', context)
+        
+        context['laporan'] = laporan
+        context['gagal_ditampilkan'] = laporan['gagal'][:200]
+        if laporan['berhenti_di_baris']:
+            # Chunk sebelum posisi berhenti sudah tersimpan; baris sesudahnya belum diimpor
+            context['error'] = (
+                f"Pembacaan berhenti di baris {laporan['berhenti_di_baris']}: {laporan['pesan_berhenti']}. "
+                f"{laporan['berhasil']} pengukuran dari baris sebelumnya sudah tersimpan; "
+                f"perbaiki berkas lalu impor ulang (pengukuran yang sudah ada akan dilewati)."
+            )
+        if laporan['berhasil']:
+            messages.success(request, f"{laporan['berhasil']} pengukuran berhasil diimpor")
+    
+    return render(request, 'pakar_impor_pengukuran.html', context)
+
+
+@login_required
+@user_passes_test(is_expert)
+@require_GET
+def ekspor_data_pakar(request, jenis, format):
+    """
+    View untuk mengekspor pengukuran atau konsultasi (CSV/JSONL) secara streaming
+    
+    Filter opsional: ?dari=YYYY-MM-DD&sampai=YYYY-MM-DD&kondisi=<kodeKondisi>
+    """
+    if jenis not in JENIS_EKSPOR or format not in FORMAT_EKSPOR:
+        raise Http404("Jenis atau format ekspor tidak dikenal")
+    
+    dari = _parse_tanggal(request.GET.get('dari'))
+    sampai = _parse_tanggal(request.GET.get('sampai'))
+    kondisi = request.GET.get('kondisi', '').strip() or None
+    
+    # Baris dibaca & dikirim per chunk: memori konstan, header langsung terkirim
+    response = StreamingHttpResponse(
+        stream_ekspor(jenis, format, dari=dari, sampai=sampai, kondisi=kondisi),
+        content_type='text/csv; charset=utf-8' if format == 'csv' else 'application/x-ndjson; charset=utf-8',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{nama_berkas_ekspor(jenis, format, dari, sampai)}"'
+    return response
+
+
+# Jumlah request terburuk yang ditampilkan di halaman diagnostik
+BATAS_DIAGNOSTIK = 100
+
+
+@login_required
+@user_passes_test(is_expert)
+def diagnostik_profil_pakar(request):
+    """
+    View diagnostik profil request (core.profil): request terburuk dan agregat per view
+    
+    ?urut= salah satu URUTAN_PROFIL (bawaan durasi_ms). POST mengosongkan buffer.
+    """
+    if request.method == 'POST':
+        buffer_profil.kosongkan()
+        messages.success(request, 'Catatan profil dikosongkan')
+        return redirect('diagnostik_profil_pakar')
+    
+    urut = request.GET.get('urut')
+    if urut not in URUTAN_PROFIL:
+        urut = 'durasi_ms'
+    
+    context = {
+        'profil_aktif': settings.PROFIL_REQUEST,
+        'urut': urut,
+        'urutan_profil': URUTAN_PROFIL,
+        'catatan_list': buffer_profil.terburuk(urut, BATAS_DIAGNOSTIK),
+        'per_view': buffer_profil.per_view(),
+        'jumlah_catatan': len(buffer_profil.semua()),
+        'page_title': 'Diagnostik Performa',
+        'breadcrumb_items': [
+            ('Dashboard', 'dashboard_pakar'),
+            ('Diagnostik', 'diagnostik_profil_pakar'),
+        ]
+    }
+    
+    return render(request, 'pakar_diagnostik.html', context)
+
+
+@login_required
+@user_passes_test(is_expert)
+@require_GET
+def diagnostik_profil_json(request):
+    """
+    Ekspor seluruh isi buffer profil sebagai JSON (urut sesuai ?urut=)
+    """
+    urut = request.GET.get('urut', 'durasi_ms')
+    response = JsonResponse({
+        'profil_aktif': settings.PROFIL_REQUEST,
+        'per_view': buffer_profil.per_view(),
+        'request': buffer_profil.terburuk(urut),
+    })
+    response['Content-Disposition'] = 'attachment; filename="profil_request.json"'
+    return response
+
+
+def _pasien_pilihan(pasien_id):
+    """Pasien yang dipilih di form pakar (untuk dirender ulang), atau None bila ID tidak valid"""
+    try:
+        return Pasien.objects.only('id', 'nama', 'namaPengguna').filter(id=int(pasien_id)).first()
+    except (TypeError, ValueError):
+        return None
+
+
 @login_required
 @user_passes_test(is_expert)
 def create_pengukuran_pakar(request):
     """
     View untuk membuat Pengukuran baru
     """
-    # Ambil daftar pasien untuk dropdown
-    pasien_list = Pasien.objects.all().order_by('nama')
+    # Pemilih pasien memakai API autocomplete (cari_pasien_pakar); hanya pasien yang sudah
+    # dipilih yang dirender ulang saat validasi gagal, diambil dengan satu query bila perlu
+    pasien_terpilih = None
     
     if request.method == 'POST':
         # Terima data dari form
         pasien_id = request.POST.get('pasien')
+        pasien_terpilih = SimpleLazyObject(lambda: _pasien_pilihan(pasien_id))
         tanggal_ukur = request.POST.get('tanggal_ukur')
         berat_badan = request.POST.get('berat_badan')
         tinggi_badan = request.POST.get('tinggi_badan')
@@ -1487,7 +1853,7 @@ def create_pengukuran_pakar(request):
         # Validasi data
         if not all([pasien_id, tanggal_ukur, berat_badan, tinggi_badan]):
             return render(request, 'pakar_form_pengukuran.html', {
-                'pasien_list': pasien_list,
+                'pasien_terpilih': pasien_terpilih,
                 'error': 'Field wajib (pasien, tanggal ukur, berat badan, tinggi badan) harus diisi',
                 'page_title': 'Tambah Pengukuran Baru',
                 'breadcrumb_items': [
@@ -1508,7 +1874,7 @@ def create_pengukuran_pakar(request):
             # Validasi bahwa tanggal tidak di masa depan
             if tanggal_ukur_date > date.today():
                 return render(request, 'pakar_form_pengukuran.html', {
-                    'pasien_list': pasien_list,
+                    'pasien_terpilih': pasien_terpilih,
                     'error': 'Tanggal pengukuran tidak boleh di masa depan',
                     'page_title': 'Tambah Pengukuran Baru',
                     'breadcrumb_items': [
@@ -1521,7 +1887,7 @@ def create_pengukuran_pakar(request):
             # Validasi bahwa tanggal tidak sebelum tanggal lahir pasien
             if tanggal_ukur_date < pasien.tanggalLahir:
                 return render(request, 'pakar_form_pengukuran.html', {
-                    'pasien_list': pasien_list,
+                    'pasien_terpilih': pasien_terpilih,
                     'error': 'Tanggal pengukuran tidak boleh sebelum tanggal lahir pasien',
                     'page_title': 'Tambah Pengukuran Baru',
                     'breadcrumb_items': [
@@ -1556,7 +1922,7 @@ def create_pengukuran_pakar(request):
                 # Jika ada error dalam perhitungan Z-score, hapus pengukuran dan tampilkan error
                 pengukuran.delete()
                 return render(request, 'pakar_form_pengukuran.html', {
-                    'pasien_list': pasien_list,
+                    'pasien_terpilih': pasien_terpilih,
                     'error': f'Error dalam perhitungan Z-score: {str(e)}',
                     'page_title': 'Tambah Pengukuran Baru',
                     'breadcrumb_items': [
@@ -1571,7 +1937,7 @@ def create_pengukuran_pakar(request):
             
         except Pasien.DoesNotExist:
             return render(request, 'pakar_form_pengukuran.html', {
-                'pasien_list': pasien_list,
+                'pasien_terpilih': pasien_terpilih,
                 'error': 'Pasien tidak ditemukan',
                 'page_title': 'Tambah Pengukuran Baru',
                 'breadcrumb_items': [
@@ -1582,7 +1948,7 @@ def create_pengukuran_pakar(request):
             })
         except ValueError as e:
             return render(request, 'pakar_form_pengukuran.html', {
-                'pasien_list': pasien_list,
+                'pasien_terpilih': pasien_terpilih,
                 'error': f'Format tanggal tidak valid: {str(e)}',
                 'page_title': 'Tambah Pengukuran Baru',
                 'breadcrumb_items': [
@@ -1593,7 +1959,7 @@ def create_pengukuran_pakar(request):
             })
         except Exception as e:
             return render(request, 'pakar_form_pengukuran.html', {
-                'pasien_list': pasien_list,
+                'pasien_terpilih': pasien_terpilih,
                 'error': f'Terjadi kesalahan: {str(e)}',
                 'page_title': 'Tambah Pengukuran Baru',
                 'breadcrumb_items': [
@@ -1605,7 +1971,7 @@ def create_pengukuran_pakar(request):
     
     # Metode GET: Tampilkan form
     context = {
-        'pasien_list': pasien_list,
+        'pasien_terpilih': pasien_terpilih,
         'page_title': 'Tambah Pengukuran Baru',
         'breadcrumb_items': [
             ('Dashboard', 'dashboard_pakar'),
@@ -1629,9 +1995,6 @@ def edit_pengukuran_pakar(request, pk):
         messages.error(request, 'Pengukuran tidak ditemukan.')
         return redirect('list_pengukuran_pakar')
     
-    # Ambil daftar pasien untuk dropdown
-    pasien_list = Pasien.objects.all().order_by('nama')
-    
     if request.method == 'POST':
         # Terima data dari form
         pasien_id = request.POST.get('pasien')
@@ -1646,7 +2009,6 @@ def edit_pengukuran_pakar(request, pk):
         if not all([pasien_id, tanggal_ukur, berat_badan, tinggi_badan]):
             return render(request, 'pakar_form_pengukuran.html', {
                 'pengukuran': pengukuran,
-                'pasien_list': pasien_list,
                 'error': 'Field wajib (pasien, tanggal ukur, berat badan, tinggi badan) harus diisi',
                 'page_title': f'Edit Pengukuran: {pengukuran.tanggalUkur}',
                 'breadcrumb_items': [
@@ -1668,7 +2030,6 @@ def edit_pengukuran_pakar(request, pk):
             if tanggal_ukur_date > date.today():
                 return render(request, 'pakar_form_pengukuran.html', {
                     'pengukuran': pengukuran,
-                    'pasien_list': pasien_list,
                     'error': 'Tanggal pengukuran tidak boleh di masa depan',
                     'page_title': f'Edit Pengukuran: {pengukuran.tanggalUkur}',
                     'breadcrumb_items': [
@@ -1682,7 +2043,6 @@ def edit_pengukuran_pakar(request, pk):
             if tanggal_ukur_date < pasien.tanggalLahir:
                 return render(request, 'pakar_form_pengukuran.html', {
                     'pengukuran': pengukuran,
-                    'pasien_list': pasien_list,
                     'error': 'Tanggal pengukuran tidak boleh sebelum tanggal lahir pasien',
                     'page_title': f'Edit Pengukuran: {pengukuran.tanggalUkur}',
                     'breadcrumb_items': [
@@ -1716,7 +2076,6 @@ def edit_pengukuran_pakar(request, pk):
         except Pasien.DoesNotExist:
             return render(request, 'pakar_form_pengukuran.html', {
                 'pengukuran': pengukuran,
-                'pasien_list': pasien_list,
                 'error': 'Pasien tidak ditemukan',
                 'page_title': f'Edit Pengukuran: {pengukuran.tanggalUkur}',
                 'breadcrumb_items': [
@@ -1728,7 +2087,6 @@ def edit_pengukuran_pakar(request, pk):
         except ValueError as e:
             return render(request, 'pakar_form_pengukuran.html', {
                 'pengukuran': pengukuran,
-                'pasien_list': pasien_list,
                 'error': f'Format tanggal tidak valid: {str(e)}',
                 'page_title': f'Edit Pengukuran: {pengukuran.tanggalUkur}',
                 'breadcrumb_items': [
@@ -1740,7 +2098,6 @@ def edit_pengukuran_pakar(request, pk):
         except Exception as e:
             return render(request, 'pakar_form_pengukuran.html', {
                 'pengukuran': pengukuran,
-                'pasien_list': pasien_list,
                 'error': f'Terjadi kesalahan: {str(e)}',
                 'page_title': f'Edit Pengukuran: {pengukuran.tanggalUkur}',
                 'breadcrumb_items': [
@@ -1753,7 +2110,6 @@ def edit_pengukuran_pakar(request, pk):
     # Metode GET: Tampilkan form dengan data pengukuran
     context = {
         'pengukuran': pengukuran,
-        'pasien_list': pasien_list,
         'page_title': f'Edit Pengukuran: {pengukuran.tanggalUkur}',
         'breadcrumb_items': [
             ('Dashboard', 'dashboard_pakar'),